@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
-import json
+import sys
+from pathlib import Path
 
-# Load vault analysis
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+from analysis_store import AnalysisStore
 
-notes_metadata = data.get('notes_metadata', {})
+# Open vault analysis store
+if not Path('vault_analysis.db').exists():
+    print("Error: vault_analysis.db not found. Please run the analyzer first.")
+    sys.exit(1)
+store = AnalysisStore('vault_analysis.db')
 
 # Define the summaries for the last two notes
 final_summaries = {
@@ -24,22 +27,21 @@ final_summaries = {
 # Update the notes
 updated = 0
 for note_id, summary_data in final_summaries.items():
-    if note_id in notes_metadata:
-        notes_metadata[note_id].update(summary_data)
+    if store.get_note(note_id) is not None:
+        store.set_ai(note_id, summary_data["ai_summary"], summary_data["ai_hashtags"], summary_data["ai_keywords"])
         updated += 1
         print(f"✓ Updated: {note_id}")
     else:
         print(f"✗ Not found: {note_id}")
 
-# Save updated data
-with open('vault_analysis.json', 'w') as f:
-    json.dump(data, f, indent=2)
+# Save updated data; only the AI rows of these notes were rewritten
+store.commit()
 
 print(f"\nUpdated {updated} notes with AI summaries")
 
 # Final count
-total_800 = sum(1 for n in notes_metadata if '800_Ressources' in n)
-with_ai = sum(1 for n, d in notes_metadata.items() if '800_Ressources' in n and isinstance(d, dict) and d.get('ai_summary'))
+total_800 = sum(1 for _ in store.iter_notes("note_id LIKE '%800_Ressources%'"))
+with_ai = total_800 - sum(1 for path in store.get_paths_without_summary() if '800_Ressources' in path)
 print(f"\nFinal status:")
 print(f"Total 800_Ressources notes: {total_800}")
 print(f"With AI summaries: {with_ai}")
@@ -13,6 +13,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 import pickle
 
+from note_parser import read_note_text
+
 try:
     import anthropic
 except ImportError:
@@ -106,9 +108,10 @@ Please respond in this JSON format:
             return None
         
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # Read file content (drawings contribute their text, not their JSON)
+            content = read_note_text(str(file_path))
+            if content is None:
+                return None
             
             # Prepare prompt
             prompt = self._prepare_prompt(content, file_path.name)
@@ -162,8 +165,9 @@ Please respond in this JSON format:
                 self.classifications[relative_path].file_hash != current_hash):
                 
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    content = read_note_text(str(file_path))
+                    if content is None:
+                        continue
                     
                     batch.append({
                         "file_path": relative_path,
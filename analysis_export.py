@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Versioned compact export of the analysis: columns per field, notes referenced by row, epoch timestamps"""
+import os
+import sys
+import gzip
+import json
+import lzma
+from datetime import datetime
+from collections import defaultdict
+from typing import IO, Any, Dict, List
+
+from analysis_store import AnalysisStore, graph_node
+from note_parser import empty_linked_content
+from note_table import FIELDS, datetime_to_epoch_us, epoch_us_to_datetime
+
+EXPORT_FORMAT = "obsidian-analysis"
+EXPORT_VERSION = 1
+
+# Fields written as one JSON array each, indexed by row
+NUMBER_FIELDS = ("size", "word_count", "commit_count", "importance_score", "in_degree", "out_degree",
+                 "pagerank", "git_score")
+TIME_FIELDS = ("created", "modified")
+TEXT_FIELDS = ("path", "content_hash", "ai_summary")
+LIST_FIELDS = ("links_out", "tags", "images", "keywords", "auto_hashtags", "ai_hashtags", "ai_keywords")
+# Nested values, null where they hold nothing beyond the defaults
+OBJECT_FIELDS = ("linked_content", "git_stats")
+
+
+def open_export(path: str, mode: str = "r") -> IO:
+    """Open an export file as text, compressed by its suffix: .gz (gzip) or .xz (lzma)"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".xz"):
+        return lzma.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _epoch_us(value: Any) -> int:
+    """Epoch microseconds of a stored datetime string"""
+    if not value:
+        return 0
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    return datetime_to_epoch_us(value)
+
+
+def write_export(store: AnalysisStore, output_file: str, top_n: int = 50) -> None:
+    """Write the store as a compact export; the top-N and orphan lists hold row numbers"""
+    vault_path = store.get_meta("vault_path", "")
+    ids: List[str] = []
+    type_names: List[str] = []
+    types: List[int] = []
+    columns = {field: [] for field in TEXT_FIELDS + NUMBER_FIELDS + TIME_FIELDS + LIST_FIELDS + OBJECT_FIELDS}
+    # Absolute paths are derived from the vault path, only exceptions are written
+    absolute_paths = {}
+
+    for note_id, metadata in store.iter_notes():
+        row = len(ids)
+        ids.append(note_id)
+        if metadata["type"] not in type_names:
+            type_names.append(metadata["type"])
+        types.append(type_names.index(metadata["type"]))
+        if metadata["absolute_path"] != os.path.join(vault_path, metadata["path"]):
+            absolute_paths[str(row)] = metadata["absolute_path"]
+
+        for field in TEXT_FIELDS + NUMBER_FIELDS + LIST_FIELDS:
+            columns[field].append(metadata[field])
+        for field in TIME_FIELDS:
+            columns[field].append(_epoch_us(metadata[field]))
+        linked_content = metadata["linked_content"]
+        columns["linked_content"].append(linked_content if any(linked_content.values()) else None)
+        git_stats = metadata["git_stats"]
+        columns["git_stats"].append(None if git_stats == {"commit_count": metadata["commit_count"]} else git_stats)
+
+    rows = {note_id: row for row, note_id in enumerate(ids)}
+    data = {
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "time_unit": "us",
+        "vault_path": vault_path,
+        "stats": store.get_stats(),
+        "notes": {
+            "ids": ids,
+            "type_names": type_names,
+            "type": types,
+            "absolute_path": absolute_paths,
+            **columns
+        },
+        "important_notes": [rows[note_id] for note_id in store.get_important_note_ids(top_n)],
+        "orphaned_notes": [rows[note_id] for note_id in store.get_orphaned_note_ids()],
+        "hashtags": [[item["hashtag"], item["count"]] for item in store.get_all_hashtags()]
+    }
+
+    # Same directory as the target, so os.replace is an atomic rename
+    temp_file = output_file + ".tmp" + os.path.splitext(output_file)[1]
+    try:
+        with open_export(temp_file, "w") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def expand_export(data: Dict) -> Dict:
+    """
+    Dashboard data from a compact export, in the shape of the old JSON file but with
+    datetime objects instead of date strings
+    """
+    if data.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Unsupported export version {data.get('version')} (expected {EXPORT_VERSION})")
+
+    notes = data["notes"]
+    ids = notes["ids"]
+    rows = {note_id: row for row, note_id in enumerate(ids)}
+    vault_path = data.get("vault_path", "")
+    times = {field: [epoch_us_to_datetime(value) for value in notes[field]] for field in TIME_FIELDS}
+
+    links_in = defaultdict(list)
+    edges = []
+    missing = {}
+    for row, note_id in enumerate(ids):
+        # Edges are the distinct links of each note, in link order
+        for target in dict.fromkeys(notes["links_out"][row]):
+            edges.append({"from": note_id, "to": target})
+            if target in rows:
+                links_in[target].append(note_id)
+            else:
+                missing.setdefault(target, None)
+
+    notes_metadata = {}
+    for row, note_id in enumerate(ids):
+        metadata = {field: notes[field][row] for field in TEXT_FIELDS + NUMBER_FIELDS + LIST_FIELDS}
+        metadata.update({field: times[field][row] for field in TIME_FIELDS})
+        metadata["type"] = notes["type_names"][notes["type"][row]]
+        metadata["absolute_path"] = notes["absolute_path"].get(
+            str(row), os.path.join(vault_path, metadata["path"]))
+        metadata["links_in"] = links_in.get(note_id, [])
+        metadata["linked_content"] = notes["linked_content"][row] or empty_linked_content()
+        metadata["git_stats"] = notes["git_stats"][row] or {"commit_count": metadata["commit_count"]}
+        notes_metadata[note_id] = {field: metadata[field] for field in FIELDS}
+
+    def timeline(field: str) -> List[Dict]:
+        return [{field: times[field][row], "path": notes["path"][row],
+                 "type": notes["type_names"][notes["type"][row]],
+                 "importance_score": notes["importance_score"][row],
+                 "commit_count": notes["commit_count"][row], "git_score": notes["git_score"][row]}
+                for row in sorted(range(len(ids)), key=notes[field].__getitem__)]
+
+    image_usage = defaultdict(list)
+    for row, note_id in enumerate(ids):
+        path = notes["path"][row]
+        for image in notes["images"][row]:
+            image_usage[image.replace("\\", "/")].append({"note_id": note_id, "path": path,
+                                                         "title": path.split("/")[-1]})
+
+    nodes = [graph_node(note_id, notes["path"][row], notes["type_names"][notes["type"][row]],
+                        notes["importance_score"][row]) for row, note_id in enumerate(ids)]
+    nodes.extend(graph_node(target, target, "missing", 0.0) for target in missing)
+
+    return {
+        "stats": data["stats"],
+        "important_notes": [{"id": ids[row], **notes_metadata[ids[row]]} for row in data["important_notes"]],
+        "orphaned_notes": [{"id": ids[row], **notes_metadata[ids[row]]} for row in data["orphaned_notes"]],
+        "timeline": {"created": timeline("created"), "modified": timeline("modified")},
+        "graph": {"nodes": nodes, "edges": edges},
+        "hashtags": [{"hashtag": tag, "count": count} for tag, count in data["hashtags"]],
+        "image_usage": dict(image_usage),
+        "notes_metadata": notes_metadata
+    }
+
+
+def load_analysis_file(path: str) -> Dict:
+    """Dashboard data from a compact export or an old-style JSON file, compressed or not"""
+    with open_export(path) as f:
+        data = json.load(f)
+    if data.get("format") == EXPORT_FORMAT:
+        return expand_export(data)
+    return data
+
+
+def load_json_export(path: str = "vault_analysis.json", store_path: str = "vault_analysis.db") -> Dict:
+    """
+    The single-file analysis for scripts that still read vault_analysis.json. The analyzer only
+    writes it with --export-json, so exit instead of working on a missing or stale copy.
+    """
+    data = load_analysis_file(path) if os.path.exists(path) else None
+    if data is not None and os.path.exists(store_path):
+        with AnalysisStore(store_path) as store:
+            if store.revision() != data.get("revision"):
+                data = None
+    if data is None:
+        print(f"Error: {path} is missing or older than {store_path}.")
+        print(f"The analyzer writes it only on request: python run_analysis.py --analyze-only --export-json {path}")
+        sys.exit(1)
+    return data
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""SQLite store of the vault analysis that dashboards and scripts query and patch row by row"""
+import json
+import sqlite3
+import hashlib
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from json_stream import dump_streaming
+from note_table import FIELDS
+from importance import FEATURES, content_richness, importance_scores, normalize_weights, top_rows
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (
+    note_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    absolute_path TEXT,
+    type TEXT,
+    size INTEGER DEFAULT 0,
+    created TEXT,
+    modified TEXT,
+    word_count INTEGER DEFAULT 0,
+    content_hash TEXT,
+    linked_content TEXT,
+    importance_score REAL DEFAULT 0,
+    in_degree INTEGER DEFAULT 0,
+    out_degree INTEGER DEFAULT 0,
+    pagerank REAL DEFAULT 0,
+    git_score REAL DEFAULT 0,
+    orphan INTEGER DEFAULT 0,
+    list_digest TEXT,
+    content_richness REAL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS notes_path ON notes (path);
+CREATE INDEX IF NOT EXISTS notes_importance ON notes (importance_score);
+CREATE INDEX IF NOT EXISTS notes_created ON notes (created);
+CREATE INDEX IF NOT EXISTS notes_modified ON notes (modified);
+
+CREATE TABLE IF NOT EXISTS links (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_source ON links (source);
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+
+CREATE TABLE IF NOT EXISTS tags (
+    note_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_note ON tags (note_id);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (kind, tag);
+
+CREATE TABLE IF NOT EXISTS images (
+    note_id TEXT NOT NULL,
+    image TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_note ON images (note_id);
+CREATE INDEX IF NOT EXISTS images_image ON images (image);
+
+CREATE TABLE IF NOT EXISTS image_files (
+    path TEXT PRIMARY KEY,
+    absolute_path TEXT,
+    format TEXT,
+    size INTEGER,
+    filename TEXT
+);
+
+CREATE TABLE IF NOT EXISTS git (
+    note_id TEXT PRIMARY KEY,
+    commit_count INTEGER DEFAULT 0,
+    git_stats TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ai (
+    note_id TEXT PRIMARY KEY,
+    summary TEXT DEFAULT '',
+    hashtags TEXT DEFAULT '[]',
+    keywords TEXT DEFAULT '[]'
+);
+"""
+
+# Columns of the notes table that scripts may patch directly
+NOTE_COLUMNS = ("path", "absolute_path", "type", "size", "created", "modified", "word_count",
+                "content_hash", "linked_content", "importance_score", "in_degree", "out_degree",
+                "pagerank", "git_score", "content_richness")
+
+# List fields kept as rows of the tags table, by kind
+TAG_KINDS = ("tags", "keywords", "auto_hashtags")
+
+# Columns of the timeline, important and orphaned sections, as the dashboards read them
+_SCALAR_SELECT = ("SELECT note_id, path, absolute_path, type, size, created, modified, word_count, "
+                  "content_hash, linked_content, importance_score, in_degree, out_degree, pagerank, "
+                  "git_score FROM notes")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _text(value: Any) -> Optional[str]:
+    """Datetimes are stored as the JSON output wrote them"""
+    return None if value is None else str(value)
+
+
+def graph_node(node_id: str, path: str, group: str, importance: float) -> Dict:
+    """vis.js node as the analyzer exports it"""
+    return {"id": node_id, "label": Path(path).stem, "title": f"{path}\nImportance: {importance:.2f}",
+            "value": importance, "group": group}
+
+
+class _NotesMetadata(Mapping):
+    """notes_metadata for dump_streaming, read from the store a page of notes at a time"""
+
+    def __init__(self, store: "AnalysisStore", page_size: int = 400):
+        self.store = store
+        self.page_size = page_size
+
+    def __getitem__(self, note_id: str) -> Dict:
+        metadata = self.store.get_note(note_id)
+        if metadata is None:
+            raise KeyError(note_id)
+        return metadata
+
+    def __iter__(self) -> Iterator[str]:
+        return (note_id for (note_id,) in self.store.connection.execute("SELECT note_id FROM notes ORDER BY rowid"))
+
+    def __len__(self) -> int:
+        return self.store.connection.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        note_ids = list(self)
+        for start in range(0, len(note_ids), self.page_size):
+            page = note_ids[start:start + self.page_size]
+            yield from self.store.iter_notes(f"notes.note_id IN ({','.join('?' * len(page))})", tuple(page))
+
+
+class AnalysisStore:
+    """
+    Analysis results in one SQLite file: a row per note plus link, tag, image, git and AI tables.
+    WAL mode lets a dashboard read while the analyzer writes.
+    """
+
+    def __init__(self, db_path: str = "vault_analysis.db"):
+        self.db_path = str(db_path)
+        # Reruns of a dashboard session may come from another thread, but a store is never used by
+        # two threads at once: concurrent readers each open their own
+        self.connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        # (revision, note ids, feature matrix) that rank_notes scores
+        self._ranking = None
+
+    def _migrate(self) -> None:
+        """Add columns that stores written by older versions lack"""
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(notes)")}
+        if "content_richness" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE notes ADD COLUMN content_richness REAL DEFAULT 0")
+                images = Counter(note_id for (note_id,) in self.connection.execute("SELECT note_id FROM images"))
+                tags = Counter(note_id for (note_id,) in self.connection.execute(
+                    "SELECT note_id FROM tags WHERE kind = 'tags'"))
+                rows = self.connection.execute("SELECT note_id, word_count FROM notes").fetchall()
+                richness = content_richness([word_count or 0 for _, word_count in rows],
+                                            [images[note_id] for note_id, _ in rows],
+                                            [tags[note_id] for note_id, _ in rows])
+                self.connection.executemany("UPDATE notes SET content_richness = ? WHERE note_id = ?",
+                                            zip(richness.tolist(), (note_id for note_id, _ in rows)))
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Meta
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set_meta(self, key: str, value: Any) -> None:
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, _dumps(value)))
+
+    def revision(self) -> int:
+        """Counter bumped by every commit(), for readers that cache what they loaded"""
+        return self.get_meta("revision", 0)
+
+    def commit(self) -> None:
+        """Make the writes so far visible to readers"""
+        self.set_meta("revision", self.revision() + 1)
+        self.connection.commit()
+
+    # Writing
+
+    def save_analysis(self, analyzer, stats: Dict) -> int:
+        """Upsert every note of an analyzer and drop notes it no longer has; returns notes written"""
+        # The store holds every metric, including those no getter asked for yet
+        analyzer.compute()
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS current_notes (note_id TEXT PRIMARY KEY)")
+            self.connection.execute("DELETE FROM current_notes")
+            digests = dict(self.connection.execute("SELECT note_id, list_digest FROM notes"))
+
+            written = 0
+            for note_id, metadata in analyzer.notes_metadata.items():
+                metadata = metadata.to_dict() if hasattr(metadata, "to_dict") else metadata
+                self.upsert_note(note_id, metadata, orphan=note_id in analyzer.orphaned_notes,
+                                 previous_digest=digests.get(note_id, ""))
+                self.connection.execute("INSERT OR IGNORE INTO current_notes VALUES (?)", (note_id,))
+                written += 1
+
+            stale = [row[0] for row in self.connection.execute(
+                "SELECT note_id FROM notes WHERE note_id NOT IN (SELECT note_id FROM current_notes)")]
+            for note_id in stale:
+                self.delete_note(note_id)
+
+            self.set_meta("vault_path", str(analyzer.vault_path))
+            self.set_meta("importance_weights", analyzer.importance_weights)
+            self.set_meta("stats", {**self.get_meta("stats", {}), **stats})
+            self.refresh_hashtags()
+            self.commit()
+        return written
+
+    def upsert_note(self, note_id: str, metadata: Dict, orphan: bool = False,
+                    previous_digest: Optional[str] = None) -> None:
+        """Insert or update one note with its git and AI rows; list rows are only rewritten when they changed"""
+        self.connection.execute(
+            "INSERT INTO notes (note_id, path, absolute_path, type, size, created, modified, word_count, "
+            "content_hash, linked_content, importance_score, in_degree, out_degree, pagerank, git_score, orphan, "
+            "content_richness) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(note_id) DO UPDATE SET path = excluded.path, absolute_path = excluded.absolute_path, "
+            "type = excluded.type, size = excluded.size, created = excluded.created, "
+            "modified = excluded.modified, word_count = excluded.word_count, "
+            "content_hash = excluded.content_hash, linked_content = excluded.linked_content, "
+            "importance_score = excluded.importance_score, in_degree = excluded.in_degree, "
+            "out_degree = excluded.out_degree, pagerank = excluded.pagerank, "
+            "git_score = excluded.git_score, orphan = excluded.orphan, "
+            "content_richness = excluded.content_richness",
+            (note_id, metadata.get("path", ""), metadata.get("absolute_path"), metadata.get("type"),
+             metadata.get("size", 0), _text(metadata.get("created")), _text(metadata.get("modified")),
+             metadata.get("word_count", 0), metadata.get("content_hash"),
+             _dumps(metadata.get("linked_content", {})), metadata.get("importance_score", 0.0),
+             metadata.get("in_degree", 0), metadata.get("out_degree", 0), metadata.get("pagerank", 0.0),
+             metadata.get("git_score", 0.0), int(orphan),
+             float(content_richness(metadata.get("word_count", 0), len(metadata.get("images", [])),
+                                    len(metadata.get("tags", []))))))
+
+        self.set_git(note_id, metadata.get("git_stats", {"commit_count": 0}), metadata.get("commit_count", 0))
+        self.set_ai(note_id, metadata.get("ai_summary", ""), metadata.get("ai_hashtags", []),
+                    metadata.get("ai_keywords", []))
+
+        lists = {field: list(metadata.get(field, [])) for field in ("links_out", "images") + TAG_KINDS}
+        digest = hashlib.md5(_dumps(lists).encode("utf-8")).hexdigest()
+        if previous_digest is None:
+            row = self.connection.execute("SELECT list_digest FROM notes WHERE note_id = ?", (note_id,)).fetchone()
+            previous_digest = row[0] if row else ""
+        if digest == previous_digest:
+            return
+
+        self._delete_lists(note_id)
+        self.connection.executemany("INSERT INTO links (source, target) VALUES (?, ?)",
+                                    ((note_id, target) for target in lists["links_out"]))
+        self.connection.executemany("INSERT INTO images (note_id, image) VALUES (?, ?)",
+                                    ((note_id, image) for image in lists["images"]))
+        self.connection.executemany("INSERT INTO tags (note_id, tag, kind) VALUES (?, ?, ?)",
+                                    ((note_id, tag, kind) for kind in TAG_KINDS for tag in lists[kind]))
+        self.connection.execute("UPDATE notes SET list_digest = ? WHERE note_id = ?", (digest, note_id))
+
+    def delete_note(self, note_id: str) -> None:
+        """Remove a note and all its rows"""
+        self._delete_lists(note_id)
+        for table in ("git", "ai", "notes"):
+            self.connection.execute(f"DELETE FROM {table} WHERE note_id = ?", (note_id,))
+
+    def _delete_lists(self, note_id: str) -> None:
+        self.connection.execute("DELETE FROM links WHERE source = ?", (note_id,))
+        self.connection.execute("DELETE FROM images WHERE note_id = ?", (note_id,))
+        self.connection.execute("DELETE FROM tags WHERE note_id = ?", (note_id,))
+
+    def patch_note(self, note_id: str, **fields: Any) -> bool:
+        """Update some columns of one note; returns False if the note is not in the store"""
+        unknown = set(fields) - set(NOTE_COLUMNS)
+        if unknown:
+            raise KeyError(f"Not a note column: {', '.join(sorted(unknown))}")
+        values = [_dumps(value) if name == "linked_content" else
+                  _text(value) if name in ("created", "modified") else value
+                  for name, value in fields.items()]
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        cursor = self.connection.execute(f"UPDATE notes SET {assignments} WHERE note_id = ?", (*values, note_id))
+        return cursor.rowcount > 0
+
+    def set_git(self, note_id: str, git_stats: Dict, commit_count: Optional[int] = None) -> None:
+        if commit_count is None:
+            commit_count = git_stats.get("commit_count", 0)
+        self.connection.execute(
+            "INSERT INTO git (note_id, commit_count, git_stats) VALUES (?, ?, ?) "
+            "ON CONFLICT(note_id) DO UPDATE SET commit_count = excluded.commit_count, "
+            "git_stats = excluded.git_stats", (note_id, commit_count, _dumps(git_stats)))
+
+    def set_ai(self, note_id: str, summary: str, hashtags: List[str], keywords: List[str]) -> None:
+        self.connection.execute(
+            "INSERT INTO ai (note_id, summary, hashtags, keywords) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(note_id) DO UPDATE SET summary = excluded.summary, "
+            "hashtags = excluded.hashtags, keywords = excluded.keywords",
+            (note_id, summary, _dumps(hashtags), _dumps(keywords)))
+
+    def set_tags(self, note_id: str, kind: str, tags: List[str]) -> None:
+        """Replace one tag list of a note (tags, keywords or auto_hashtags)"""
+        if kind not in TAG_KINDS:
+            raise KeyError(kind)
+        self.connection.execute("DELETE FROM tags WHERE note_id = ? AND kind = ?", (note_id, kind))
+        self.connection.executemany("INSERT INTO tags (note_id, tag, kind) VALUES (?, ?, ?)",
+                                    ((note_id, tag, kind) for tag in tags))
+        # The next save_analysis rewrites this note's lists instead of trusting the digest
+        self.connection.execute("UPDATE notes SET list_digest = '' WHERE note_id = ?", (note_id,))
+
+    def refresh_hashtags(self) -> None:
+        """Recount the hashtag list after auto_hashtags were patched"""
+        self.set_meta("hashtags", self._count_hashtags())
+
+    def replace_image_files(self, image_files: Iterable[Dict]) -> None:
+        """Replace the list of image files found in the vault"""
+        self.connection.execute("DELETE FROM image_files")
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO image_files (path, absolute_path, format, size, filename) "
+            "VALUES (:path, :absolute_path, :format, :size, :filename)", image_files)
+
+    # Notes
+
+    def note_id_for_path(self, path: str) -> Optional[str]:
+        row = self.connection.execute("SELECT note_id FROM notes WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def get_paths_without_summary(self, folder: Optional[str] = None) -> List[str]:
+        """Paths of notes without an AI summary, optionally only below a folder prefix"""
+        query = ("SELECT notes.path FROM notes LEFT JOIN ai ON ai.note_id = notes.note_id "
+                 "WHERE COALESCE(ai.summary, '') = ''")
+        params = ()
+        if folder:
+            query += " AND substr(notes.path, 1, length(?)) = ?"
+            params = (folder, folder)
+        return [path for (path,) in self.connection.execute(query + " ORDER BY notes.rowid", params)]
+
+    def get_note(self, note_id: str) -> Optional[Dict]:
+        """Full metadata of one note, as the JSON output held it"""
+        notes = list(self._notes("WHERE notes.note_id = ?", (note_id,)))
+        return notes[0][1] if notes else None
+
+    def iter_notes(self, where: str = "", params: Tuple = ()) -> Iterator[Tuple[str, Dict]]:
+        """(note_id, metadata) for all notes, or those matching a WHERE clause on notes columns"""
+        return self._notes(f"WHERE {where}" if where else "", params)
+
+    def _notes(self, where: str, params: Tuple, order: str = "ORDER BY notes.rowid",
+               limit: str = "") -> Iterator[Tuple[str, Dict]]:
+        rows = self.connection.execute(f"{_SCALAR_SELECT} {where} {order} {limit}", params).fetchall()
+        if not rows:
+            return
+        lists, extra = self._lists([row[0] for row in rows] if len(rows) < 500 else None)
+        links_out, links_in, images = lists["links_out"], lists["links_in"], lists["images"]
+        tags, keywords, auto_hashtags = lists["tags"], lists["keywords"], lists["auto_hashtags"]
+        for row in rows:
+            note_id = row[0]
+            git_stats, commit_count, summary, ai_hashtags, ai_keywords = extra.get(note_id, (None, 0, "", "[]", "[]"))
+            scalars = dict(zip(("path", "absolute_path", "type", "size", "created", "modified", "word_count",
+                                "content_hash", "linked_content", "importance_score", "in_degree",
+                                "out_degree", "pagerank", "git_score"), row[1:]))
+            scalars["linked_content"] = json.loads(scalars["linked_content"] or "{}")
+            metadata = {
+                **scalars,
+                "links_out": links_out.get(note_id, []),
+                "links_in": links_in.get(note_id, []),
+                "tags": tags.get(note_id, []),
+                "images": images.get(note_id, []),
+                "git_stats": json.loads(git_stats) if git_stats else {"commit_count": commit_count},
+                "commit_count": commit_count,
+                "ai_summary": summary,
+                "ai_hashtags": json.loads(ai_hashtags),
+                "ai_keywords": json.loads(ai_keywords),
+                "keywords": keywords.get(note_id, []),
+                "auto_hashtags": auto_hashtags.get(note_id, [])
+            }
+            yield note_id, {field: metadata[field] for field in FIELDS}
+
+    def _grouped(self, query: str, params: Tuple = ()) -> Dict[str, List]:
+        """Second column of a (key, value) query grouped by the first, in row order"""
+        grouped = defaultdict(list)
+        for key, value in self.connection.execute(query, params):
+            grouped[key].append(value)
+        return grouped
+
+    def get_lists(self, field: str, note_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """note_id -> one list field (links_out, links_in, images, tags, keywords or auto_hashtags)"""
+        where, params = "", ()
+        if note_ids is not None:
+            where, params = f"IN ({', '.join('?' * len(note_ids))})", tuple(note_ids)
+        if field == "links_out":
+            return self._grouped(f"SELECT source, target FROM links {'WHERE source ' + where if where else ''} "
+                                 f"ORDER BY rowid", params)
+        if field == "links_in":
+            if note_ids is None:
+                links_in = defaultdict(list)
+                for source, targets in self.get_lists("links_out").items():
+                    for target in targets:
+                        links_in[target].append(source)
+            else:
+                links_in = self._grouped(f"SELECT target, source FROM links WHERE target {where} ORDER BY rowid", params)
+            # Each linking note once, in the order its first link was stored
+            return {target: list(dict.fromkeys(sources)) for target, sources in links_in.items()}
+        if field == "images":
+            return self._grouped(f"SELECT note_id, image FROM images {'WHERE note_id ' + where if where else ''} "
+                                 f"ORDER BY rowid", params)
+        if field in TAG_KINDS:
+            return self._grouped(f"SELECT note_id, tag FROM tags WHERE kind = ? "
+                                 f"{'AND note_id ' + where if where else ''} ORDER BY rowid", (field, *params))
+        raise KeyError(field)
+
+    def _lists(self, note_ids: Optional[List[str]]) -> Tuple[Dict[str, Dict], Dict[str, Tuple]]:
+        """List fields, and git and AI rows, per note for the given notes or all of them"""
+        lists = {field: self.get_lists(field, note_ids) for field in ("links_out", "links_in", "images") + TAG_KINDS}
+        where, params = "", ()
+        if note_ids is not None:
+            where, params = f"WHERE notes.note_id IN ({', '.join('?' * len(note_ids))})", tuple(note_ids)
+        extra = {row[0]: row[1:] for row in self.connection.execute(
+            "SELECT notes.note_id, git.git_stats, COALESCE(git.commit_count, 0), COALESCE(ai.summary, ''), "
+            "COALESCE(ai.hashtags, '[]'), COALESCE(ai.keywords, '[]') FROM notes "
+            f"LEFT JOIN git ON git.note_id = notes.note_id LEFT JOIN ai ON ai.note_id = notes.note_id {where}",
+            params)}
+        return lists, extra
+
+    # Importance
+
+    def feature_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Note ids in insertion order and their importance features, one row per note"""
+        rows = self.connection.execute(
+            f"SELECT note_id, {', '.join(FEATURES)} FROM notes ORDER BY rowid").fetchall()
+        features = np.array([row[1:] for row in rows], dtype=float).reshape(len(rows), len(FEATURES))
+        return [row[0] for row in rows], features
+
+    def get_importance_weights(self) -> Dict[str, float]:
+        """Weights the stored importance scores were computed with"""
+        return normalize_weights(self.get_meta("importance_weights"))
+
+    def rescore(self, weights: Optional[Dict[str, float]] = None) -> int:
+        """Recompute every importance score from the stored features; returns notes rescored"""
+        weights = normalize_weights(weights)
+        note_ids, features = self.feature_matrix()
+        scores = importance_scores(features, weights)
+        self.connection.executemany("UPDATE notes SET importance_score = ? WHERE note_id = ?",
+                                    zip(scores.tolist(), note_ids))
+        self.set_meta("importance_weights", weights)
+        return len(note_ids)
+
+    def rank_notes(self, weights: Optional[Dict[str, float]] = None, top_n: int = 50) -> List[Dict]:
+        """
+        The top_n notes under other weights with their new scores, without changing the store.
+        Features are read once per revision, so repeated calls only pay for the product
+        """
+        revision = self.revision()
+        if self._ranking is None or self._ranking[0] != revision:
+            self._ranking = (revision, *self.feature_matrix())
+        _, note_ids, features = self._ranking
+        scores = importance_scores(features, weights)
+        rows = top_rows(scores, top_n)
+        selected = [note_ids[row] for row in rows]
+        columns = ("path", "type", "size", "created", "modified", "word_count", "commit_count", "in_degree",
+                   "out_degree", "pagerank", "git_score", "content_richness")
+        notes = {row[0]: dict(zip(columns, row[1:])) for row in self.connection.execute(
+            "SELECT notes.note_id, path, type, size, created, modified, word_count, COALESCE(git.commit_count, 0), "
+            "in_degree, out_degree, pagerank, git_score, content_richness FROM notes "
+            f"LEFT JOIN git ON git.note_id = notes.note_id WHERE notes.note_id IN ({', '.join('?' * len(selected))})",
+            selected)}
+        return [{"id": note_id, **notes[note_id], "importance_score": score}
+                for note_id, score in zip(selected, scores[rows].tolist())]
+
+    # Dashboard sections
+
+    def notes_frame(self):
+        """All notes as a DataFrame, for the analysis tab"""
+        import pandas as pd
+        return pd.DataFrame([{"id": note_id, **metadata} for note_id, metadata in self.iter_notes()])
+
+    def get_stats(self) -> Dict:
+        return self.get_meta("stats", {})
+
+    def get_important_note_ids(self, top_n: int = 50) -> List[str]:
+        """Ids of the highest importance notes, ties in insertion order"""
+        return [note_id for (note_id,) in self.connection.execute(
+            "SELECT note_id FROM notes ORDER BY importance_score DESC, rowid LIMIT ?", (int(top_n),))]
+
+    def get_orphaned_note_ids(self) -> List[str]:
+        return [note_id for (note_id,) in self.connection.execute(
+            "SELECT note_id FROM notes WHERE orphan = 1 ORDER BY rowid")]
+
+    def get_important_notes(self, top_n: int = 50) -> List[Dict]:
+        """Highest importance first, ties in insertion order"""
+        return [{"id": note_id, **metadata} for note_id, metadata in
+                self._notes("", (), order="ORDER BY importance_score DESC, notes.rowid", limit=f"LIMIT {int(top_n)}")]
+
+    def get_orphaned_notes(self) -> List[Dict]:
+        return [{"id": note_id, **metadata} for note_id, metadata in self._notes("WHERE orphan = 1", ())]
+
+    def get_notes_by_hashtag(self, hashtag: str) -> List[Dict]:
+        """Notes with an auto hashtag, most important first"""
+        return [{"id": note_id, **metadata} for note_id, metadata in self._notes(
+            "WHERE type != 'missing' AND note_id IN (SELECT note_id FROM tags WHERE kind = 'auto_hashtags' AND tag = ?)",
+            (hashtag,), order="ORDER BY importance_score DESC, notes.rowid")]
+
+    def get_timeline(self, field: str) -> List[Dict]:
+        if field not in ("created", "modified"):
+            raise KeyError(field)
+        # With the git columns update_vault_with_git.py used to add to the JSON timeline
+        return [{field: value, "path": path, "type": note_type, "importance_score": importance,
+                 "commit_count": commit_count, "git_score": git_score}
+                for value, path, note_type, importance, commit_count, git_score in self.connection.execute(
+                    f"SELECT notes.{field}, notes.path, notes.type, notes.importance_score, "
+                    f"COALESCE(git.commit_count, 0), notes.git_score FROM notes "
+                    f"LEFT JOIN git ON git.note_id = notes.note_id ORDER BY notes.{field}, notes.rowid")]
+
+    def get_all_hashtags(self) -> List[Dict]:
+        return self.get_meta("hashtags", [])
+
+    def _count_hashtags(self) -> List[Dict]:
+        counts = Counter(tag for (tag,) in self.connection.execute(
+            "SELECT tags.tag FROM tags JOIN notes ON notes.note_id = tags.note_id "
+            "WHERE tags.kind = 'auto_hashtags' AND notes.type != 'missing' ORDER BY tags.rowid"))
+        return [{"hashtag": tag, "count": count} for tag, count in counts.most_common()]
+
+    def get_top_folders(self) -> List[str]:
+        """First path component of notes inside a folder"""
+        return [folder for (folder,) in self.connection.execute(
+            "SELECT DISTINCT substr(path, 1, instr(path, '/') - 1) FROM notes WHERE instr(path, '/') > 0")]
+
+    def get_graph_nodes(self) -> List[Dict]:
+        """vis.js nodes for notes and missing link targets"""
+        nodes = [graph_node(note_id, path, note_type, importance)
+                 for note_id, path, note_type, importance in self.connection.execute(
+                     "SELECT note_id, path, type, importance_score FROM notes ORDER BY rowid")]
+        for (target,) in self.connection.execute(
+                "SELECT target FROM links WHERE target NOT IN (SELECT note_id FROM notes) "
+                "GROUP BY target ORDER BY MIN(rowid)"):
+            nodes.append(graph_node(target, target, "missing", 0.0))
+        return nodes
+
+    def get_graph_edges(self) -> List[Dict]:
+        return [{"from": source, "to": target} for source, target in self.connection.execute(
+            "SELECT source, target FROM links GROUP BY source, target ORDER BY MIN(rowid)")]
+
+    def get_image_usage(self) -> Dict[str, List[Dict]]:
+        """image -> notes that embed it"""
+        usage = defaultdict(list)
+        for image, note_id, path in self.connection.execute(
+                "SELECT images.image, notes.note_id, notes.path FROM images "
+                "JOIN notes ON notes.note_id = images.note_id ORDER BY images.rowid"):
+            usage[image.replace("\\", "/")].append({"note_id": note_id, "path": path, "title": path.split("/")[-1]})
+        return dict(usage)
+
+    def get_orphaned_images(self) -> List[Dict]:
+        """Image files no note embeds, largest first"""
+        return [{"path": path, "absolute_path": absolute_path, "format": image_format, "size": size,
+                 "size_mb": round(size / (1024 * 1024), 2), "filename": filename}
+                for path, absolute_path, image_format, size, filename in self.connection.execute(
+                    "SELECT path, absolute_path, format, size, filename FROM image_files "
+                    "WHERE path NOT IN (SELECT replace(image, '\\', '/') FROM images) ORDER BY size DESC")]
+
+    def dashboard_data(self) -> Dict:
+        """The sections of the old JSON file the dashboards show, without the per-note metadata"""
+        # One read transaction, so all sections come from the same revision
+        started = not self.connection.in_transaction
+        if started:
+            self.connection.execute("BEGIN")
+        try:
+            return {
+                "stats": self.get_stats(),
+                "important_notes": self.get_important_notes(50),
+                "orphaned_notes": self.get_orphaned_notes(),
+                "timeline": {
+                    "created": self.get_timeline("created"),
+                    "modified": self.get_timeline("modified")
+                },
+                "graph": {
+                    "nodes": self.get_graph_nodes(),
+                    "edges": self.get_graph_edges()
+                },
+                "hashtags": self.get_all_hashtags(),
+                "image_usage": self.get_image_usage()
+            }
+        finally:
+            if started:
+                self.connection.commit()
+
+    def export_json(self, output_file: str) -> None:
+        """Write the old single-file JSON format, including every note's metadata"""
+        data = self.dashboard_data()
+        # Lets load_json_export tell whether the store changed since
+        data["revision"] = self.revision()
+        # Written a page of notes at a time instead of building every note's dict first
+        data["notes_metadata"] = _NotesMetadata(self)
+        with open(output_file, "w") as f:
+            dump_streaming(data, f, indent=2, default=str)
@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 """Analyze git commit distribution for the vault"""
 import subprocess
-import json
 from collections import Counter
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 vault_path = "//mnt/c/Users/hess/OneDrive/Dokumente/MyVault"
 
 # Load current vault analysis to get all tracked files
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 notes_metadata = data.get('notes_metadata', {})
 
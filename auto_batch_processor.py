@@ -6,33 +6,29 @@ and saves them for sequential processing
 
 import json
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
+from analysis_store import AnalysisStore
+
 def load_vault_data():
-    """Load the vault analysis data"""
-    with open("vault_analysis.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Open the vault analysis store"""
+    if not Path("vault_analysis.db").exists():
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
+        sys.exit(1)
+    return AnalysisStore("vault_analysis.db")
 
-def get_all_unprocessed_notes(vault_data, folder_filter="800_Ressources"):
+def get_all_unprocessed_notes(store, folder_filter="800_Ressources"):
     """Get all notes that need AI summaries"""
     unprocessed = []
     
-    for note_id, metadata in vault_data["notes_metadata"].items():
-        path = metadata.get("path", "")
-        
-        # Filter by folder
-        if not path.startswith(folder_filter):
-            continue
-        
-        # Skip if already has AI summary
-        if metadata.get("ai_summary"):
-            continue
-            
+    # Notes in the folder that have no AI summary yet
+    for path in store.get_paths_without_summary(folder_filter):
+        note_id = store.note_id_for_path(path)
         unprocessed.append({
             "note_id": note_id,
-            "path": path,
-            "metadata": metadata
+            "path": path
         })
     
     # Sort by path for better organization
@@ -97,10 +93,10 @@ def main():
     
     # Load vault data
     print("Loading vault data...")
-    vault_data = load_vault_data()
+    store = load_vault_data()
     
     # Get unprocessed notes
-    unprocessed = get_all_unprocessed_notes(vault_data)
+    unprocessed = get_all_unprocessed_notes(store)
     
     if not unprocessed:
         print("\nAll notes have been processed!")
@@ -1,24 +1,24 @@
 #!/usr/bin/env python3
 """Batch processor for AI summaries"""
-import json
 import sys
 from pathlib import Path
 
+from analysis_store import AnalysisStore
+
 def get_next_batch(batch_size=10):
     """Get the next batch of notes to process"""
-    # Load vault data
-    with open("vault_analysis.json", "r") as f:
-        vault_data = json.load(f)
+    # Open vault analysis store
+    if not Path("vault_analysis.db").exists():
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
+        sys.exit(1)
+    store = AnalysisStore("vault_analysis.db")
     
     # Find vault path
     vault_path = Path("/mnt/c/Users/hess/OneDrive/Dokumente/MyVault")
     
     # Get remaining notes
-    remaining = []
-    for note_id, metadata in vault_data["notes_metadata"].items():
-        path = metadata.get("path", "")
-        if path.startswith("800_Ressources/") and not metadata.get("ai_summary"):
-            remaining.append((note_id, metadata))
+    remaining = [(store.note_id_for_path(path), {"path": path})
+                 for path in store.get_paths_without_summary("800_Ressources/")]
     
     # Sort and take batch
     remaining.sort(key=lambda x: x[1].get("path", ""))
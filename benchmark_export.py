@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark file size and load time of the old JSON file against the compact export
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+from analysis_store import AnalysisStore
+from analysis_export import load_analysis_file, write_export
+
+
+def load_legacy(path: str) -> dict:
+    """Load the old file and parse its timeline the way the dashboards do"""
+    with open(path, "r") as f:
+        data = json.load(f)
+    for field in ("created", "modified"):
+        frame = pd.DataFrame(data["timeline"][field])
+        frame[field] = pd.to_datetime(frame[field], format="mixed")
+    return data
+
+
+def load_compact(path: str) -> dict:
+    """Load an export; its timeline already holds datetimes"""
+    data = load_analysis_file(path)
+    for field in ("created", "modified"):
+        frame = pd.DataFrame(data["timeline"][field])
+        frame[field] = pd.to_datetime(frame[field])
+    return data
+
+
+def best_time(load, path: str, repeat: int) -> float:
+    """Fastest of several loads, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compact analysis export")
+    parser.add_argument("db_path", nargs="?", default="vault_analysis.db", help="Analysis store to export")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per format (default: 3)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        print(f"Error: {args.db_path} not found. Please run the analyzer first.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as directory, AnalysisStore(args.db_path) as store:
+        files = [("old JSON", os.path.join(directory, "legacy.json"), load_legacy),
+                 ("compact", os.path.join(directory, "compact.json"), load_compact),
+                 ("compact .gz", os.path.join(directory, "compact.json.gz"), load_compact),
+                 ("compact .xz", os.path.join(directory, "compact.json.xz"), load_compact)]
+
+        print(f"Exporting {args.db_path}...")
+        store.export_json(files[0][1])
+        for _, path, _ in files[1:]:
+            write_export(store, path)
+
+        legacy_size = os.path.getsize(files[0][1])
+        legacy_time = best_time(load_legacy, files[0][1], args.repeat)
+        print(f"\n{'Format':<14}{'Size (MB)':>11}{'Size':>8}{'Load (s)':>10}{'Speedup':>9}")
+        for name, path, load in files:
+            size = os.path.getsize(path)
+            seconds = legacy_time if load is load_legacy else best_time(load, path, args.repeat)
+            print(f"{name:<14}{size / 1024 / 1024:>11.2f}{size / legacy_size:>7.0%}"
+                  f"{seconds:>10.3f}{legacy_time / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark PageRank and degrees of networkx against the CSR graph on a synthetic link graph
+"""
+import sys
+import time
+import random
+import argparse
+
+import numpy as np
+import networkx as nx
+
+from sparse_graph import SparseGraph
+
+
+def synthetic_graph(nodes: int, edges: int, seed: int) -> nx.DiGraph:
+    """Random link graph where popular notes attract more links, with interned ids like the analyzer's"""
+    rng = random.Random(seed)
+    ids = [sys.intern(f"Folder {i % 50}/Note {i}") for i in range(nodes)]
+    weights = [1.0 / (rank + 1) for rank in range(nodes)]
+    graph = nx.DiGraph()
+    graph.add_nodes_from(ids)
+    targets = rng.choices(ids, weights=weights, k=edges)
+    graph.add_edges_from((rng.choice(ids), target) for target in targets)
+    return graph
+
+
+def networkx_metrics(graph: nx.DiGraph):
+    pagerank = nx.pagerank(graph)
+    degrees = {node: (graph.in_degree(node), graph.out_degree(node)) for node in graph}
+    return pagerank, degrees
+
+
+def sparse_metrics(graph: nx.DiGraph):
+    sparse_graph = SparseGraph.from_networkx(graph)
+    scores, report = sparse_graph.pagerank()
+    return sparse_graph, scores, report
+
+
+def best_time(function, graph: nx.DiGraph, repeat: int):
+    """Fastest of several runs in seconds, with the result of the last run"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(graph)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PageRank and degree computation")
+    parser.add_argument("--nodes", type=int, default=50000, help="Notes in the graph (default: 50000)")
+    parser.add_argument("--edges", type=int, default=1000000, help="Links in the graph (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (default: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args()
+
+    print(f"Building a graph with {args.nodes} nodes and {args.edges} links...")
+    graph = synthetic_graph(args.nodes, args.edges, args.seed)
+    # scipy is imported lazily by both; keep its import out of the timings
+    import scipy.sparse
+
+    networkx_seconds, (pagerank, degrees) = best_time(networkx_metrics, graph, args.repeat)
+    sparse_seconds, (sparse_graph, scores, report) = best_time(sparse_metrics, graph, args.repeat)
+
+    expected = np.array([pagerank[node] for node in sparse_graph.nodes])
+    difference = float(np.abs(expected - scores).max())
+    degrees_match = all(degrees[node] == (sparse_graph.in_degree[row], sparse_graph.out_degree[row])
+                        for row, node in enumerate(sparse_graph.nodes))
+
+    print(f"\n{'Implementation':<16}{'Time (s)':>10}{'Speedup':>9}")
+    print(f"{'networkx':<16}{networkx_seconds:>10.3f}{1.0:>8.1f}x")
+    print(f"{'CSR + NumPy':<16}{sparse_seconds:>10.3f}{networkx_seconds / sparse_seconds:>8.1f}x")
+    print(f"\nPageRank {'converged' if report['converged'] else 'DID NOT CONVERGE'} after "
+          f"{report['iterations']} iterations (residual {report['residual']:.2e}, "
+          f"tolerance {report['tolerance']:.2e}) in {report['seconds']:.3f}s")
+    print(f"Largest PageRank difference to networkx: {difference:.2e}")
+    print(f"Degrees match networkx: {degrees_match}")
+    if difference > 1e-9 or not degrees_match:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
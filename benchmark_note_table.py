@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory per note: dict-of-dicts metadata versus the columnar NoteTable
+"""
+import gc
+import sys
+import pickle
+import argparse
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+
+from note_parser import parse_note
+from note_table import NoteTable
+from vault_walker import VaultWalker
+
+
+def load_records(vault_path: str) -> bytes:
+    """Parse every note of a vault, pickled so each measurement starts from fresh objects"""
+    files = VaultWalker(vault_path).walk()
+    records = []
+    for file_path, stat in files["markdown"] + files["excalidraw"]:
+        relative_path = file_path.relative_to(vault_path)
+        records.append(parse_note((str(file_path), str(relative_path), stat.st_size, stat.st_ctime, stat.st_mtime)))
+    return pickle.dumps(records)
+
+
+def metadata_for(record: dict) -> dict:
+    """A note's metadata as ObsidianAnalyzer holds it after a full scan"""
+    return {
+        "path": record["path"],
+        "absolute_path": record["absolute_path"],
+        "type": record["type"],
+        "size": record["size"],
+        "created": datetime.fromtimestamp(record["created"]),
+        "modified": datetime.fromtimestamp(record["modified"]),
+        "links_out": record["links_out"],
+        "links_in": [],
+        "tags": record["tags"],
+        "images": record["images"],
+        "word_count": record["word_count"],
+        "content_hash": record["content_hash"],
+        "linked_content": record["linked_content"],
+        "git_stats": {"commit_count": 0},
+        "commit_count": 0,
+        "ai_summary": "",
+        "ai_hashtags": [],
+        "ai_keywords": [],
+        "importance_score": 0.1 * record["word_count"],
+        "in_degree": 0,
+        "out_degree": len(record["links_out"]),
+        "pagerank": 1.0 / (1 + record["size"]),
+        "git_score": 0.0,
+        "keywords": [],
+        "auto_hashtags": []
+    }
+
+
+def measure(build, blob: bytes) -> int:
+    """Bytes still allocated by the structure build() returns, records freed"""
+    gc.collect()
+    tracemalloc.start()
+    records = pickle.loads(blob)
+    structure = build(records)
+    del records
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return size
+
+
+def build_dicts(records: list) -> dict:
+    return {record["note_id"]: metadata_for(record) for record in records}
+
+
+def build_table(vault_path: str):
+    def build(records: list) -> NoteTable:
+        table = NoteTable(vault_path)
+        for record in records:
+            table[record["note_id"]] = metadata_for(record)
+        return table
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory per note of the note table")
+    parser.add_argument("vault_path", nargs="?", default=r"/mnt/c/Users/hess/Lokal/MyVault",
+                        help="Path to Obsidian vault")
+    args = parser.parse_args()
+
+    if not Path(args.vault_path).exists():
+        print(f"Error: Vault path does not exist: {args.vault_path}")
+        sys.exit(1)
+
+    print(f"Parsing notes from {args.vault_path}...")
+    blob = load_records(args.vault_path)
+    count = len(pickle.loads(blob))
+    print(f"Parsed {count} notes")
+
+    dicts = measure(build_dicts, blob)
+    table = measure(build_table(args.vault_path), blob)
+
+    print(f"\n{'Layout':<14}{'Total (MB)':>12}{'Bytes/note':>12}")
+    print(f"{'dict of dicts':<14}{dicts / 1024 / 1024:>12.2f}{dicts / count:>12.0f}")
+    print(f"{'note table':<14}{table / 1024 / 1024:>12.2f}{table / count:>12.0f}")
+    print(f"\nReduction: {dicts / table:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark markdown parsing throughput (MB/s)
+Compares the single-pass tokenizer in note_parser with the previous multi-pass parser
+"""
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from note_parser import decode_text, parse_markdown_content
+from vault_walker import VaultWalker
+
+
+# Previous implementation: one regex pass per link category, recompiled patterns
+# and list-based duplicate checks. Kept here only as the benchmark baseline.
+def legacy_parse_markdown_content(content: str, metadata: dict) -> None:
+    wikilink_pattern = re.compile(r'\[\[([^|\]]+)(?:\|([^\]]+))?\]\]')
+    tag_pattern = re.compile(r'#([\w\-\_\/]+)')
+    image_pattern = re.compile(r'!\[\[([^\]]+)\]\]|!\[([^\]]*)\]\(([^\)]+)\)')
+
+    metadata["linked_content"] = {"notes": [], "images": [], "pdfs": [], "urls": [], "files": []}
+
+    for link_match in wikilink_pattern.findall(content):
+        link_target = link_match[0]
+        metadata["links_out"].append(link_target)
+        if not any(ext in link_target.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.pdf']):
+            metadata["linked_content"]["notes"].append({
+                "title": link_match[1] if link_match[1] else link_target,
+                "path": link_target
+            })
+
+    metadata["tags"] = list(set(tag_pattern.findall(content)))
+
+    for img in image_pattern.findall(content):
+        img_path = img[0] or img[2]
+        metadata["images"].append(img_path)
+        metadata["linked_content"]["images"].append({
+            "path": img_path,
+            "alt": img[1] if len(img) > 1 and img[1] else ""
+        })
+
+    markdown_link_pattern = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+    for link_text, link_url in markdown_link_pattern.findall(content):
+        if link_url.startswith(('http://', 'https://', 'www.')):
+            metadata["linked_content"]["urls"].append({"text": link_text, "url": link_url})
+        elif link_url.lower().endswith('.pdf'):
+            metadata["linked_content"]["pdfs"].append({"text": link_text, "path": link_url})
+        elif any(link_url.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp']):
+            if link_url not in [img["path"] for img in metadata["linked_content"]["images"]]:
+                metadata["linked_content"]["images"].append({"path": link_url, "alt": link_text})
+        else:
+            metadata["linked_content"]["files"].append({"text": link_text, "path": link_url})
+
+    pdf_pattern = re.compile(r'!\[\[([^]]+\.pdf)\]\]', re.IGNORECASE)
+    for pdf in pdf_pattern.findall(content):
+        if pdf not in [p["path"] for p in metadata["linked_content"]["pdfs"]]:
+            metadata["linked_content"]["pdfs"].append({"text": pdf.split('/')[-1], "path": pdf})
+
+    metadata["word_count"] = len(content.split())
+
+
+def load_notes(vault_path: str) -> list:
+    """Load all markdown notes of a vault into memory"""
+    files = VaultWalker(vault_path).walk()
+    contents = []
+    for file_path, _ in files["markdown"]:
+        try:
+            with open(file_path, 'rb') as f:
+                contents.append(decode_text(f.read()))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Skipping {file_path}: {e}")
+    return contents
+
+
+def measure(parse, contents: list, rounds: int) -> float:
+    """Best-of-N parse time over all notes in seconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for content in contents:
+            parse(content, {"links_out": [], "tags": [], "images": []})
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown parsing throughput")
+    parser.add_argument("vault_path", nargs="?", default=r"/mnt/c/Users/hess/Lokal/MyVault",
+                        help="Path to Obsidian vault")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds, best one counts (default: 5)")
+    args = parser.parse_args()
+
+    if not Path(args.vault_path).exists():
+        print(f"Error: Vault path does not exist: {args.vault_path}")
+        sys.exit(1)
+
+    print(f"Loading notes from {args.vault_path}...")
+    contents = load_notes(args.vault_path)
+    total_mb = sum(len(c.encode('utf-8')) for c in contents) / (1024 * 1024)
+    print(f"Loaded {len(contents)} notes ({total_mb:.2f} MB)")
+
+    legacy = measure(legacy_parse_markdown_content, contents, args.rounds)
+    single_pass = measure(parse_markdown_content, contents, args.rounds)
+
+    print(f"\n{'Parser':<14}{'Time (s)':>10}{'MB/s':>10}")
+    print(f"{'multi-pass':<14}{legacy:>10.3f}{total_mb / legacy:>10.1f}")
+    print(f"{'single-pass':<14}{single_pass:>10.3f}{total_mb / single_pass:>10.1f}")
+    print(f"\nSpeedup: {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
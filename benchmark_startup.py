@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark startup time with python -X importtime and fail if it exceeds its budget
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List, Tuple
+
+# Milliseconds each step may take on a typical laptop
+STARTUP_BUDGETS_MS = {
+    "obsidian_analyzer": 500,
+    "dashboard": 3000,
+}
+# Slow or unused modules that importing the analyzer must not pull in
+FORBIDDEN_IMPORTS = ("nltk", "rake_nltk", "sklearn", "obsidiantools", "pandas", "scipy")
+
+# Constructs an analyzer with every network connection failing
+INIT_SNIPPET = """
+import socket, sys, time
+def offline(*args, **kwargs):
+    raise OSError("network access during startup")
+socket.socket.connect = offline
+socket.create_connection = offline
+start = time.perf_counter()
+from obsidian_analyzer import ObsidianAnalyzer
+ObsidianAnalyzer(sys.argv[1], cache_dir=sys.argv[2])
+print(time.perf_counter() - start)
+"""
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) of every import made by importing module in a fresh interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if own.strip().isdigit():
+            # One space after the separator, then two more per nesting level
+            times.append((name[1:].rstrip(), int(own), int(cumulative)))
+    return times
+
+
+def best_import_time(module: str, repeat: int) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Fastest import time of module in ms, with the imports it made in that run"""
+    best = None
+    for _ in range(repeat):
+        times = import_times(module)
+        # Nested imports are listed before the module; interpreter startup before that is not counted
+        end = next(index for index, (name, _, _) in enumerate(times) if name == module)
+        start = max([index for index, (name, _, _) in enumerate(times[:end]) if not name.startswith(" ")],
+                    default=-1) + 1
+        total = times[end][2] / 1000
+        if best is None or total < best[0]:
+            best = (total, times[start:end + 1])
+    return best
+
+
+def init_time(repeat: int) -> float:
+    """Fastest import plus construction of an analyzer on an empty vault, in ms, without network"""
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        vault = os.path.join(directory, "vault")
+        os.makedirs(vault)
+        for _ in range(repeat):
+            # The git history cache file is written to the working directory
+            result = subprocess.run([sys.executable, "-c", INIT_SNIPPET, vault, os.path.join(directory, ".cache")],
+                                    capture_output=True, text=True, cwd=directory,
+                                    env={**os.environ,
+                                         "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))})
+            if result.returncode != 0:
+                raise RuntimeError(f"Analyzer startup failed:\n{result.stderr[-2000:]}")
+            seconds = float(result.stdout.strip().splitlines()[-1])
+            best = seconds if best is None else min(best, seconds)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analyzer and dashboard startup time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow machine (default: 1.0)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to list (default: 8)")
+    args = parser.parse_args()
+
+    failures = []
+    results: Dict[str, float] = {}
+    for module in STARTUP_BUDGETS_MS:
+        total, times = best_import_time(module, args.repeat)
+        results[f"import {module}"] = total
+
+        # Direct imports of the module are indented by one level
+        direct = [(name.strip(), cumulative) for name, _, cumulative in times
+                  if name.startswith("  ") and not name.startswith("    ")]
+        print(f"\nimport {module}: {total:.0f} ms, slowest direct imports:")
+        for name, cumulative in sorted(direct, key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+        if module == "obsidian_analyzer":
+            loaded = {name.strip().split(".")[0] for name, _, _ in times}
+            for forbidden in FORBIDDEN_IMPORTS:
+                if forbidden in loaded:
+                    failures.append(f"import {module} loads {forbidden}")
+
+    results["import obsidian_analyzer + ObsidianAnalyzer()"] = init_time(args.repeat)
+
+    print(f"\n{'Step':<46}{'Time (ms)':>10}{'Budget':>8}")
+    for step, milliseconds in results.items():
+        module = step.split()[1]
+        budget = STARTUP_BUDGETS_MS[module] * args.budget_scale
+        print(f"{step:<46}{milliseconds:>10.0f}{budget:>8.0f}")
+        if milliseconds > budget:
+            failures.append(f"{step} took {milliseconds:.0f} ms (budget {budget:.0f} ms)")
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll startup steps are within budget")
+
+
+if __name__ == "__main__":
+    main()
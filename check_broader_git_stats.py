@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """Check git stats across different folders"""
 import subprocess
-import json
 from collections import defaultdict
 
+from analysis_export import load_json_export
+
 vault_path = "//mnt/c/Users/hess/OneDrive/Dokumente/MyVault"
 
 # Load vault analysis
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 notes_metadata = data.get('notes_metadata', {})
 
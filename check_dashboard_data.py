@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 """Check if AI classifications are in dashboard data"""
 
-import json
+from analysis_export import load_json_export
 
 # Load the vault analysis data that feeds the dashboard
-with open("vault_analysis.json", "r") as f:
-    data = json.load(f)
+data = load_json_export()
 
 # Check a few notes to see if they have AI data
 print("Checking if AI classifications are in dashboard data...\n")
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import json
+from analysis_export import load_json_export
 
 # Load data
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 meta = data.get('notes_metadata', {})
 
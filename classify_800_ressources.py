@@ -7,13 +7,16 @@ import json
 import os
 from pathlib import Path
 from ai_classifier import AIClassifier
+from analysis_store import AnalysisStore
 
-# Load vault analysis data
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+# Open vault analysis store
+if not Path("vault_analysis.db").exists():
+    print("Error: vault_analysis.db not found. Please run the analyzer first.")
+    exit(1)
+store = AnalysisStore("vault_analysis.db")
 
 # Get vault path from the data
-vault_path = vault_data.get("vault_path", "002_Slipbox")
+vault_path = store.get_meta("vault_path", "002_Slipbox")
 
 # Initialize classifier
 api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -24,14 +27,8 @@ if not api_key:
 
 classifier = AIClassifier(vault_path, api_key)
 
-# Get all notes in 800_Ressources
-ressources_notes = []
-for note_id, metadata in vault_data["notes_metadata"].items():
-    path = metadata.get("path", "")
-    if path.startswith("800_Ressources/"):
-        # Check if already has AI summary
-        if not metadata.get("ai_summary"):
-            ressources_notes.append(path)
+# Get all notes in 800_Ressources without AI summary
+ressources_notes = store.get_paths_without_summary("800_Ressources/")
 
 print(f"Found {len(ressources_notes)} notes in 800_Ressources without AI summaries")
 
@@ -69,23 +66,20 @@ if ressources_notes:
     with open("ai_classifications.json", "r") as f:
         classifications = json.load(f)
     
-    # Update vault data
+    # Update the AI rows of the classified notes
     updates = 0
     for file_path, classification in classifications.items():
-        # Find matching note in vault data
-        for note_id, metadata in vault_data["notes_metadata"].items():
-            if metadata.get("path") == file_path:
-                metadata["ai_summary"] = classification["ai_summary"]
-                metadata["ai_hashtags"] = classification["ai_hashtags"]
-                metadata["ai_keywords"] = classification["ai_keywords"]
-                updates += 1
-                break
+        # Find matching note through the path index
+        note_id = store.note_id_for_path(file_path)
+        if note_id is not None:
+            store.set_ai(note_id, classification["ai_summary"], classification["ai_hashtags"],
+                         classification["ai_keywords"])
+            updates += 1
     
     # Save updated vault analysis
-    with open("vault_analysis.json", "w") as f:
-        json.dump(vault_data, f, indent=2)
+    store.commit()
     
-    print(f"✓ Updated {updates} notes in vault_analysis.json")
+    print(f"✓ Updated {updates} notes in vault_analysis.db")
     print("\nDone! Restart the dashboard to see the AI summaries.")
 else:
     print("\nAll notes in 800_Ressources already have AI summaries!")
\ No newline at end of file
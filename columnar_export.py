@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Arrow IPC file of the notes table that dashboards memory-map instead of parsing JSON"""
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from analysis_store import AnalysisStore, graph_node
+from importance import FEATURES, importance_scores, normalize_weights, top_rows
+
+COLUMNAR_FORMAT = "obsidian-analysis-columns"
+COLUMNAR_VERSION = 2
+
+# Columns the dashboards read as a DataFrame; buffers are shared with the memory map
+SCALAR_COLUMNS = ("id", "path", "type", "size", "created", "modified", "word_count", "commit_count",
+                  "importance_score", "in_degree", "out_degree", "pagerank", "git_score", "orphan",
+                  "important_rank", "content_richness")
+# Per-note lists, read through pyarrow.compute when a tab needs them
+LIST_COLUMNS = ("links", "tags", "images", "keywords", "auto_hashtags")
+TEXT_COLUMNS = ("ai_summary", "linked_content")
+
+SCHEMA = pa.schema(
+    [("id", pa.string()), ("path", pa.string()), ("type", pa.dictionary(pa.int8(), pa.string())),
+     ("size", pa.int64()), ("created", pa.timestamp("us")), ("modified", pa.timestamp("us")),
+     ("word_count", pa.int32()), ("commit_count", pa.int32()), ("importance_score", pa.float64()),
+     ("in_degree", pa.int32()), ("out_degree", pa.int32()), ("pagerank", pa.float64()),
+     ("git_score", pa.float64()), ("orphan", pa.bool_()), ("important_rank", pa.int32()),
+     ("content_richness", pa.float64())]
+    + [(name, pa.list_(pa.string())) for name in LIST_COLUMNS]
+    + [(name, pa.string()) for name in TEXT_COLUMNS])
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _wall_time_us(value) -> int:
+    """Microseconds of a naive local datetime string, kept as wall time like the dashboards show it"""
+    if not value:
+        return 0
+    return (datetime.fromisoformat(str(value)) - _EPOCH) // timedelta(microseconds=1)
+
+
+def write_columnar(store: AnalysisStore, output_file: str, top_n: int = 50) -> None:
+    """Write the notes of a store as one Arrow IPC file, replaced atomically"""
+    columns = {name: [] for name in SCHEMA.names}
+    important = {note_id: rank for rank, note_id in enumerate(store.get_important_note_ids(top_n))}
+    # Only the list fields the dashboards read; links_in and the AI lists are left out
+    lists = {field: store.get_lists(field) for field in ("links_out", "tags", "images", "keywords", "auto_hashtags")}
+
+    for (note_id, path, note_type, size, created, modified, word_count, commit_count, importance_score,
+         in_degree, out_degree, pagerank, git_score, orphan, ai_summary, linked_content,
+         richness) in store.connection.execute(
+            "SELECT notes.note_id, path, type, size, created, modified, word_count, COALESCE(git.commit_count, 0), "
+            "importance_score, in_degree, out_degree, pagerank, git_score, orphan, COALESCE(ai.summary, ''), "
+            "linked_content, content_richness FROM notes LEFT JOIN git ON git.note_id = notes.note_id "
+            "LEFT JOIN ai ON ai.note_id = notes.note_id ORDER BY notes.rowid"):
+        for name, value in (("id", note_id), ("path", path), ("type", note_type), ("size", size),
+                            ("created", _wall_time_us(created)), ("modified", _wall_time_us(modified)),
+                            ("word_count", word_count), ("commit_count", commit_count),
+                            ("importance_score", importance_score), ("in_degree", in_degree),
+                            ("out_degree", out_degree), ("pagerank", pagerank), ("git_score", git_score),
+                            ("orphan", bool(orphan)), ("important_rank", important.get(note_id, -1)),
+                            ("ai_summary", ai_summary), ("linked_content", linked_content or "{}"),
+                            ("content_richness", richness)):
+            columns[name].append(value)
+        # Graph edges are the distinct links of each note
+        columns["links"].append(list(dict.fromkeys(lists["links_out"].get(note_id, ()))))
+        for field in ("tags", "images", "keywords", "auto_hashtags"):
+            columns[field].append(lists[field].get(note_id, []))
+
+    metadata = {
+        "format": COLUMNAR_FORMAT,
+        "version": str(COLUMNAR_VERSION),
+        # Version stamp of the data: the store revision it was written from
+        "revision": str(store.revision()),
+        "vault_path": store.get_meta("vault_path", ""),
+        "stats": json.dumps(store.get_stats(), default=str),
+        "hashtags": json.dumps(store.get_all_hashtags(), ensure_ascii=False),
+        "importance_weights": json.dumps(store.get_importance_weights())
+    }
+    arrays = [pa.array(columns[name], type=field.type) if not pa.types.is_dictionary(field.type)
+              else pa.array(columns[name]).dictionary_encode().cast(field.type)
+              for name, field in zip(SCHEMA.names, SCHEMA)]
+    table = pa.Table.from_arrays(arrays, schema=SCHEMA.with_metadata(metadata))
+
+    # Same directory as the target, so os.replace is an atomic rename
+    temp_file = output_file + ".tmp"
+    try:
+        with pa.OSFile(temp_file, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+class ColumnarDataset:
+    """
+    Read-only view of a columnar export, memory-mapped so opening it reads almost nothing and
+    every process that opens the file shares its pages. Answers the same queries the dashboards
+    make of an AnalysisStore.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._source = pa.memory_map(path, "r")
+        self.table = pa.ipc.open_file(self._source).read_all()
+        metadata = self.table.schema.metadata
+        if metadata.get(b"format") != COLUMNAR_FORMAT.encode() or \
+                int(metadata.get(b"version", b"0")) != COLUMNAR_VERSION:
+            raise ValueError(f"{path} is not a version {COLUMNAR_VERSION} columnar analysis export")
+        self.revision = int(metadata.get(b"revision", b"0"))
+        self.stats = json.loads(metadata[b"stats"])
+        self.hashtags = json.loads(metadata[b"hashtags"])
+        self.importance_weights = normalize_weights(json.loads(metadata[b"importance_weights"]))
+        self._sections = None
+        self._features = None
+        # Zero-copy for numbers, timestamps and strings: each column keeps its own block
+        self.notes = self.table.select(list(SCALAR_COLUMNS)).to_pandas(split_blocks=True)
+
+    def close(self) -> None:
+        self._source.close()
+
+    def _rows(self, mask) -> pd.DataFrame:
+        return self.notes[mask].reset_index(drop=True)
+
+    def _lists(self, name: str, rows) -> List[List[str]]:
+        return self.table.column(name).take(pa.array(rows, type=pa.int64())).to_pylist()
+
+    def get_stats(self) -> Dict:
+        return self.stats
+
+    def get_all_hashtags(self) -> List[Dict]:
+        return self.hashtags
+
+    def get_importance_weights(self) -> Dict[str, float]:
+        return self.importance_weights
+
+    def feature_matrix(self) -> np.ndarray:
+        """Importance features of every note (see importance.FEATURES), one row per note in file order"""
+        if self._features is None:
+            self._features = np.column_stack([self.notes[name].to_numpy(dtype=float) for name in FEATURES])
+        return self._features
+
+    def rank_notes(self, weights: Optional[Dict[str, float]] = None, top_n: int = 50) -> pd.DataFrame:
+        """The top_n notes under other weights, with their new scores"""
+        scores = importance_scores(self.feature_matrix(), weights)
+        rows = top_rows(scores, top_n)
+        ranked = self.notes.iloc[rows].assign(importance_score=scores[rows], images=self._lists("images", rows))
+        return ranked.reset_index(drop=True)
+
+    def get_timeline(self, field: str) -> pd.DataFrame:
+        columns = [field, "path", "type", "importance_score", "commit_count", "git_score"]
+        return self.notes[columns].sort_values(field, kind="stable").reset_index(drop=True)
+
+    def get_important_notes(self) -> pd.DataFrame:
+        rows = self.notes.index[self.notes["important_rank"] >= 0]
+        important = self.notes.loc[rows].assign(images=self._lists("images", rows))
+        return important.sort_values("important_rank").reset_index(drop=True)
+
+    def get_orphaned_notes(self) -> pd.DataFrame:
+        return self._rows(self.notes["orphan"])
+
+    def get_top_folders(self) -> List[str]:
+        paths = self.notes["path"]
+        return paths[paths.str.contains("/", regex=False)].str.split("/", n=1).str[0].unique().tolist()
+
+    def get_notes_by_hashtag(self, hashtag: str) -> List[Dict]:
+        """Notes with an auto hashtag, most important first"""
+        hashtags = self.table.column("auto_hashtags")
+        matches = pc.equal(pc.list_flatten(hashtags), hashtag)
+        rows = sorted(set(pc.filter(pc.list_parent_indices(hashtags), matches).to_pylist()))
+        notes = []
+        for row, keywords, auto_hashtags, ai_summary, linked_content in zip(
+                rows, self._lists("keywords", rows), self._lists("auto_hashtags", rows),
+                self._lists("ai_summary", rows), self._lists("linked_content", rows)):
+            note = self.notes.iloc[row].to_dict()
+            note.update(keywords=keywords, auto_hashtags=auto_hashtags, ai_summary=ai_summary,
+                        linked_content=json.loads(linked_content))
+            notes.append(note)
+        return sorted(notes, key=lambda note: note["importance_score"], reverse=True)
+
+    def get_image_usage(self) -> Dict[str, List[Dict]]:
+        """image -> notes that embed it"""
+        images = self.table.column("images")
+        rows = pc.list_parent_indices(images)
+        usage = {}
+        for image, note_id, path in zip(pc.list_flatten(images).to_pylist(),
+                                        self.table.column("id").take(rows).to_pylist(),
+                                        self.table.column("path").take(rows).to_pylist()):
+            usage.setdefault(image.replace("\\", "/"), []).append(
+                {"note_id": note_id, "path": path, "title": path.split("/")[-1]})
+        return usage
+
+    def iter_graph_nodes(self) -> Iterator[Dict]:
+        """vis.js nodes for notes and missing link targets, built as the network tab reads them"""
+        for node in zip(*(self.table.column(name).to_pylist() for name in ("id", "path", "type", "importance_score"))):
+            yield graph_node(*node)
+        links = self.table.column("links")
+        targets = pc.unique(pc.list_flatten(links))
+        for target in pc.filter(targets, pc.invert(pc.is_in(targets, self.table.column("id")))).to_pylist():
+            yield graph_node(target, target, "missing", 0.0)
+
+    def iter_graph_edges(self) -> Iterator[Dict]:
+        links = self.table.column("links")
+        sources = self.table.column("id").take(pc.list_parent_indices(links))
+        for source, target in zip(sources.to_pylist(), pc.list_flatten(links).to_pylist()):
+            yield {"from": source, "to": target}
+
+    def notes_frame(self) -> pd.DataFrame:
+        """All notes for the analysis tab, with their tags"""
+        return self.notes.assign(tags=self.table.column("tags").to_pylist())
+
+    def dashboard_data(self) -> Dict:
+        """
+        Dashboard sections as DataFrames, built once and shared by every session of the process;
+        graph sections are generated when the network tab reads them
+        """
+        if self._sections is None:
+            self._sections = {
+                "stats": self.stats,
+                "important_notes": self.get_important_notes(),
+                "orphaned_notes": self.get_orphaned_notes(),
+                "timeline": {
+                    "created": self.get_timeline("created"),
+                    "modified": self.get_timeline("modified")
+                },
+                "hashtags": self.hashtags,
+                "image_usage": self.get_image_usage()
+            }
+        sections = self._sections
+        # Shallow copies: a tab that adds columns does not change the frames other sessions see
+        return {
+            **sections,
+            "important_notes": sections["important_notes"].copy(deep=False),
+            "orphaned_notes": sections["orphaned_notes"].copy(deep=False),
+            "timeline": {field: frame.copy(deep=False) for field, frame in sections["timeline"].items()},
+            "graph": {
+                "nodes": self.iter_graph_nodes(),
+                "edges": self.iter_graph_edges()
+            }
+        }
+
+
+class SharedDataset:
+    """
+    A process's handle on the published columnar file. Dashboard sessions share one mapped
+    dataset; when the analyzer replaces the file, the next get() maps the new version and
+    sessions still holding the old one keep it until they end.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._dataset: Optional[ColumnarDataset] = None
+        self._identity = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ColumnarDataset:
+        """The current dataset, reopened if a new version was published since the last call"""
+        stat = os.stat(self.path)
+        # os.replace gives every published version a new inode
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity != self._identity:
+            with self._lock:
+                if identity != self._identity:
+                    dataset = ColumnarDataset(self.path)
+                    if self._dataset is not None:
+                        print(f"Switching dashboard data from revision {self._dataset.revision} "
+                              f"to {dataset.revision}")
+                    self._dataset, self._identity = dataset, identity
+        return self._dataset
+
+
+_shared_datasets: Dict[str, SharedDataset] = {}
+
+
+def shared_dataset(path: str) -> SharedDataset:
+    """The process-wide handle for a columnar file"""
+    key = os.path.abspath(path)
+    if key not in _shared_datasets:
+        _shared_datasets[key] = SharedDataset(path)
+    return _shared_datasets[key]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Rewrite the columnar export after scripts patched the store")
+    parser.add_argument("db_path", nargs="?", default="vault_analysis.db", help="Analysis store")
+    parser.add_argument("output_file", nargs="?", default="vault_analysis.arrow", help="Columnar file to write")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        print(f"Error: {args.db_path} not found. Please run the analyzer first.")
+        return
+    with AnalysisStore(args.db_path) as store:
+        write_columnar(store, args.output_file)
+    print(f"Wrote {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Create correct summaries based on actual batch contents"""
-import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Read each batch prompt to get actual notes
 for batch_num in range(4, 10):
     prompt_file = f"ai_summary_batches/batch_{batch_num:03d}_prompt.txt"
@@ -44,8 +45,7 @@ for batch_num in range(4, 10):
 
 # Now check what's actually needed
 print("\nChecking which notes still need summaries...")
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 remaining = []
 for note_id, metadata in vault_data["notes_metadata"].items():
@@ -3,7 +3,6 @@
 Interactive Dashboard for Obsidian Vault Analysis
 """
 
-import json
 import panel as pn
 import pandas as pd
 import plotly.express as px
@@ -13,16 +12,40 @@ from datetime import datetime
 import tempfile
 import os
 
+from analysis_store import AnalysisStore
+from analysis_export import load_analysis_file
+from columnar_export import shared_dataset
+from importance import DEFAULT_WEIGHTS, FEATURES, contributions, content_richness
+
 pn.extension('plotly', 'tabulator')
 
+# Slider labels of the importance weights, in the order of the breakdown chart
+WEIGHT_LABELS = {
+    'git_score': 'Git Activity',
+    'pagerank': 'PageRank',
+    'in_degree': 'In Links',
+    'out_degree': 'Out Links',
+    'content_richness': 'Content',
+    'base': 'Base',
+}
+
 
 class ObsidianDashboard:
     """Interactive dashboard for vault analysis"""
     
-    def __init__(self, data_file: str = "vault_analysis_with_git.json"):
-        # Load analysis data
-        with open(data_file, 'r') as f:
-            self.data = json.load(f)
+    def __init__(self, data_file: str = "vault_analysis.arrow"):
+        # Load analysis data; the store and the memory-mapped columns are queried per tab,
+        # an export file is loaded whole
+        self.store = None
+        if data_file.endswith('.db'):
+            self.store = AnalysisStore(data_file)
+        elif data_file.endswith('.arrow'):
+            # Shared by all sessions of this process, and by all processes through the page cache
+            self.store = shared_dataset(data_file).get()
+        if self.store:
+            self.data = self.store.dashboard_data()
+        else:
+            self.data = load_analysis_file(data_file)
         
         # Initialize Panel
         self.template = pn.template.MaterialTemplate(
@@ -432,11 +455,8 @@ class ObsidianDashboard:
             pn.pane.Plotly(heatmap, height=400)
         )
     
-    def create_important_notes_tab(self):
-        """Create tab for important notes"""
-        important_df = pd.DataFrame(self.data['important_notes'])
-        
-        # Prepare display columns
+    def _important_display(self, important_df):
+        """Columns of the important notes table"""
         display_df = important_df[[
             'path', 'importance_score', 'commit_count', 'in_degree', 'out_degree', 
             'word_count', 'modified', 'type'
@@ -444,6 +464,39 @@ class ObsidianDashboard:
         
         display_df['modified'] = pd.to_datetime(display_df['modified'], format='mixed').dt.strftime('%Y-%m-%d')
         display_df['importance_score'] = display_df['importance_score'].round(2)
+        return display_df
+    
+    def _importance_breakdown(self, important_df, weights):
+        """Bar chart of the points each factor gives the top 10 notes"""
+        top_df = important_df.head(10)
+        if 'content_richness' in top_df:
+            richness = top_df['content_richness']
+        else:
+            # Exports written before the feature columns existed
+            no_lists = pd.Series([[]] * len(top_df), index=top_df.index)
+            richness = content_richness(top_df['word_count'], top_df.get('images', no_lists).map(len),
+                                        top_df.get('tags', no_lists).map(len))
+        features = top_df.assign(content_richness=richness)[list(FEATURES)].to_numpy(dtype=float)
+        
+        factors_fig = go.Figure()
+        for path, points in zip(top_df['path'], contributions(features, weights)):
+            factors_fig.add_trace(go.Bar(
+                name=path.split('/')[-1][:20] + '...',
+                x=[WEIGHT_LABELS[name] for name in FEATURES],
+                y=points
+            ))
+        
+        factors_fig.update_layout(
+            title="Importance Score Breakdown (Top 10 Notes)",
+            barmode='group',
+            height=400
+        )
+        return factors_fig
+    
+    def create_important_notes_tab(self):
+        """Create tab for important notes, re-ranked with the weight sliders"""
+        important_df = pd.DataFrame(self.data['important_notes'])
+        display_df = self._important_display(important_df)
         
         # Use common table component
         table, row_selector = self.create_scrollable_table(
@@ -467,26 +520,41 @@ class ObsidianDashboard:
         table.sorters = [{'field': 'importance_score', 'dir': 'desc'}]
         
         # Importance factors breakdown
-        factors_fig = go.Figure()
-        
-        for _, note in important_df.head(10).iterrows():
-            factors_fig.add_trace(go.Bar(
-                name=note['path'].split('/')[-1][:20] + '...',
-                x=['Git Activity', 'PageRank', 'In Links', 'Out Links', 'Content'],
-                y=[
-                    note.get('git_score', 0) * 10 * 0.30,  # Git activity score - MOST IMPORTANT
-                    note['pagerank'] * 20,  # Scaled to match new importance calculation
-                    note['in_degree'] * 0.15,
-                    note['out_degree'] * 0.15,
-                    min(note['word_count'] / 1000 + len(note.get('images', [])) * 0.5, 10) * 0.10
-                ]
-            ))
-        
-        factors_fig.update_layout(
-            title="Importance Score Breakdown (Top 10 Notes)",
-            barmode='group',
-            height=400
-        )
+        weights = self.store.get_importance_weights() if self.store else dict(DEFAULT_WEIGHTS)
+        factors_pane = pn.pane.Plotly(self._importance_breakdown(important_df, weights))
+        
+        # Scores of all notes are one product of their stored features and the weights,
+        # so moving a slider re-ranks the whole vault without running the analyzer
+        weight_controls = pn.Column()
+        if self.store:
+            sliders = {name: pn.widgets.FloatSlider(name=label, start=0.0, end=1.0, step=0.05,
+                                                    value=weights[name], width=180)
+                       for name, label in WEIGHT_LABELS.items()}
+            
+            def rerank(event=None):
+                new_weights = {name: slider.value for name, slider in sliders.items()}
+                ranked_df = pd.DataFrame(self.store.rank_notes(new_weights, len(important_df) or 50))
+                ranked_display = self._important_display(ranked_df)
+                table.value = ranked_display
+                table.formatters = {**table.formatters,
+                                    'importance_score': {'type': 'progress',
+                                                         'max': ranked_display['importance_score'].max()}}
+                factors_pane.object = self._importance_breakdown(ranked_df, new_weights)
+            
+            def reset(event=None):
+                for name, slider in sliders.items():
+                    slider.value = weights[name]
+            
+            for slider in sliders.values():
+                slider.param.watch(rerank, 'value')
+            reset_button = pn.widgets.Button(name='Reset weights', button_type='light', width=150)
+            reset_button.on_click(reset)
+            weight_controls = pn.Column(
+                pn.pane.Markdown("### Weights\nRe-rank every note; the saved scores stay unchanged "
+                                 "(`python importance.py --weight NAME=VALUE` saves new ones)"),
+                pn.FlexBox(*sliders.values()),
+                reset_button
+            )
         
         # Create help icon with explanation
         help_text = pn.pane.HTML("""
@@ -515,8 +583,9 @@ class ObsidianDashboard:
                 pn.Spacer(),
                 row_selector
             ),
+            weight_controls,
             table,
-            pn.pane.Plotly(factors_fig)
+            factors_pane
         )
     
     def create_orphaned_notes_tab(self):
@@ -594,7 +663,7 @@ class ObsidianDashboard:
         
         
         # Extract top-level folders from notes metadata
-        top_folders = set()
+        top_folders = set(self.store.get_top_folders()) if self.store else set()
         for metadata in notes_metadata.values():
             path = metadata.get('path', '')
             if path and '/' in path:
@@ -656,9 +725,13 @@ class ObsidianDashboard:
             # Clear current metadata
             current_notes_metadata.clear()
             
-            # Filter notes by hashtag and folder inclusions
+            # Filter notes by hashtag and folder inclusions; the store only returns notes with the hashtag
             filtered_notes = []
-            for note_id, metadata in notes_metadata.items():
+            if self.store:
+                candidates = [(note['id'], note) for note in self.store.get_notes_by_hashtag(selected_hashtag)]
+            else:
+                candidates = notes_metadata.items()
+            for note_id, metadata in candidates:
                 if selected_hashtag in metadata.get('auto_hashtags', []):
                     # Check if note is in an included folder
                     path = metadata.get('path', '')
@@ -1127,11 +1200,14 @@ class ObsidianDashboard:
     def create_analysis_tab(self):
         """Create additional analysis tab"""
         # Prepare data
-        all_notes_df = pd.DataFrame(
-            [{"id": k, **v} for k, v in self.data.get('notes_metadata', {}).items()]
-            if 'notes_metadata' in self.data 
-            else self.data['important_notes'] + self.data['orphaned_notes']
-        )
+        if self.store:
+            all_notes_df = self.store.notes_frame()
+        else:
+            all_notes_df = pd.DataFrame(
+                [{"id": k, **v} for k, v in self.data.get('notes_metadata', {}).items()]
+                if 'notes_metadata' in self.data 
+                else self.data['important_notes'] + self.data['orphaned_notes']
+            )
         
         # Link distribution
         link_dist = px.histogram(
@@ -3,9 +3,10 @@
 import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Load vault data to get correct IDs
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 # Create path to ID mapping
 path_to_id = {}
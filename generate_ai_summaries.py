@@ -14,44 +14,30 @@ from typing import List, Optional
 import argparse
 
 from ai_classifier import AIClassifier
+from analysis_store import AnalysisStore
 
 
-def load_vault_analysis() -> dict:
-    """Load the vault analysis data"""
-    analysis_file = Path("vault_analysis.json")
+def load_vault_analysis() -> AnalysisStore:
+    """Open the vault analysis store"""
+    analysis_file = Path("vault_analysis.db")
     if not analysis_file.exists():
-        print("Error: vault_analysis.json not found. Please run the analyzer first.")
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
         sys.exit(1)
     
-    with open(analysis_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return AnalysisStore(str(analysis_file))
 
 
-def save_vault_analysis(vault_data: dict):
-    """Save the updated vault analysis data"""
-    with open("vault_analysis.json", "w", encoding="utf-8") as f:
-        json.dump(vault_data, f, indent=2, ensure_ascii=False)
+def save_vault_analysis(store: AnalysisStore):
+    """Commit the AI rows written so far"""
+    store.commit()
 
 
-def get_notes_needing_summaries(vault_data: dict, folder_filter: Optional[str] = None) -> List[str]:
+def get_notes_needing_summaries(store: AnalysisStore, folder_filter: Optional[str] = None) -> List[str]:
     """Get list of notes that need AI summaries"""
-    notes_to_process = []
-    
-    for note_id, metadata in vault_data["notes_metadata"].items():
-        path = metadata.get("path", "")
-        
-        # Apply folder filter if specified
-        if folder_filter and not path.startswith(folder_filter):
-            continue
-        
-        # Check if note needs AI summary
-        if not metadata.get("ai_summary"):
-            notes_to_process.append(path)
-    
-    return notes_to_process
+    return store.get_paths_without_summary(folder_filter)
 
 
-def update_vault_with_classifications(vault_data: dict, classifications_file: Path) -> int:
+def update_vault_with_classifications(store: AnalysisStore, classifications_file: Path) -> int:
     """Update vault analysis with AI classifications"""
     if not classifications_file.exists():
         return 0
@@ -61,14 +47,14 @@ def update_vault_with_classifications(vault_data: dict, classifications_file: Pa
     
     updates = 0
     for file_path, classification in classifications.items():
-        # Find matching note in vault data
-        for note_id, metadata in vault_data["notes_metadata"].items():
-            if metadata.get("path") == file_path:
-                metadata["ai_summary"] = classification.get("ai_summary", "")
-                metadata["ai_hashtags"] = classification.get("ai_hashtags", [])
-                metadata["ai_keywords"] = classification.get("ai_keywords", [])
-                updates += 1
-                break
+        # Find matching note through the path index
+        note_id = store.note_id_for_path(file_path)
+        if note_id is not None:
+            store.set_ai(note_id,
+                         classification.get("ai_summary", ""),
+                         classification.get("ai_hashtags", []),
+                         classification.get("ai_keywords", []))
+            updates += 1
     
     return updates
 
@@ -96,11 +82,11 @@ def main():
     
     # Load vault data
     print("Loading vault analysis...")
-    vault_data = load_vault_analysis()
-    vault_path = vault_data.get("vault_path", "002_Slipbox")
+    store = load_vault_analysis()
+    vault_path = store.get_meta("vault_path", "002_Slipbox")
     
     # Get notes to process
-    notes_to_process = get_notes_needing_summaries(vault_data, args.folder)
+    notes_to_process = get_notes_needing_summaries(store, args.folder)
     
     if args.limit:
         notes_to_process = notes_to_process[:args.limit]
@@ -157,9 +143,9 @@ def main():
             classifier._save_classifications()
             
             # Update vault analysis
-            updates = update_vault_with_classifications(vault_data, classifier.classifications_file)
-            save_vault_analysis(vault_data)
-            print(f"✓ Saved {updates} summaries to vault_analysis.json")
+            updates = update_vault_with_classifications(store, classifier.classifications_file)
+            save_vault_analysis(store)
+            print(f"✓ Saved {updates} summaries to vault_analysis.db")
             
             # Show time estimate
             elapsed = time.time() - start_time
@@ -174,8 +160,8 @@ def main():
     # Final save
     print("\nSaving final results...")
     classifier._save_classifications()
-    updates = update_vault_with_classifications(vault_data, classifier.classifications_file)
-    save_vault_analysis(vault_data)
+    updates = update_vault_with_classifications(store, classifier.classifications_file)
+    save_vault_analysis(store)
     
     # Summary
     elapsed = time.time() - start_time
@@ -184,7 +170,7 @@ def main():
     print(f"  - Processed: {processed} notes")
     print(f"  - Failed: {failed} notes")
     print(f"  - Time taken: {elapsed/60:.1f} minutes")
-    print(f"  - Final updates: {updates} notes in vault_analysis.json")
+    print(f"  - Final updates: {updates} notes in vault_analysis.db")
     print(f"\nRestart the dashboard to see the AI summaries.")
 
 
@@ -3,10 +3,11 @@
 import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 def main():
     # Load vault data
-    with open('vault_analysis.json', 'r') as f:
-        vault_data = json.load(f)
+    vault_data = load_json_export()
     
     # Load remaining notes
     with open('remaining_notes.json', 'r') as f:
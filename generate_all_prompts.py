@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Generate all prompts for 800_Ressources folder"""
-import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Load vault data
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 # Find vault path
 vault_path = Path("/mnt/c/Users/hess/OneDrive/Dokumente/MyVault")
@@ -4,9 +4,10 @@
 import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Load vault analysis
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 vault_path = Path(r"/mnt/c/Users/hess/OneDrive/Dokumente/MyVault")
 
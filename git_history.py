@@ -4,14 +4,19 @@ import subprocess
 import json
 import os
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Set, Tuple
 from datetime import datetime
 import concurrent.futures
 from functools import lru_cache
 import logging
 
+from git_index import IndexEntry, read_git_index
+
 logger = logging.getLogger(__name__)
 
+# Git score by commit count: 0, 1, 2, 3, 4-5 and 6 or more commits
+GIT_SCORE_STEPS = (0.0, 0.2, 0.5, 0.7, 0.85, 0.85, 1.0)
+
 
 class GitHistoryAnalyzer:
     """Analyzes git history for files in the vault"""
@@ -55,6 +60,84 @@ class GitHistoryAnalyzer:
         except:
             return False
     
+    def get_head_commit(self) -> Optional[str]:
+        """Get the commit id of HEAD, or None for repos without commits"""
+        if not self.is_git_repo:
+            return None
+        
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.vault_path), "rev-parse", "--verify", "-q", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        except Exception as e:
+            logger.error(f"Error reading HEAD: {e}")
+        return None
+    
+    def get_changed_files(self, since_commit: str) -> Optional[Set[str]]:
+        """Get vault-relative paths touched by commits between since_commit and HEAD"""
+        if not self.is_git_repo:
+            return None
+        
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.vault_path), "diff", "--name-only", "--relative", "-z",
+                 since_commit, "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+            if result.returncode == 0:
+                return {path for path in result.stdout.split("\0") if path}
+        except Exception as e:
+            logger.error(f"Error listing changes since {since_commit}: {e}")
+        # None tells the caller to refresh everything
+        return None
+    
+    def get_index_stats(self) -> Optional[Dict[str, IndexEntry]]:
+        """Stat data and blob ids from .git/index for tracked files that are clean in the work tree"""
+        if not self.is_git_repo:
+            return None
+        
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.vault_path), "rev-parse", "--git-dir", "--show-prefix"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode != 0:
+                return None
+            git_dir, _, prefix = result.stdout.partition("\n")
+            prefix = prefix.strip()
+            entries = read_git_index(str(self.vault_path / git_dir.strip() / "index"))
+            
+            # Git compares its recorded stat data with the work tree (in parallel, in C);
+            # files it reports here have to be looked at on disk
+            dirty = subprocess.run(
+                ["git", "-C", str(self.vault_path), "diff-files", "--name-only", "-z"],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+            if dirty.returncode != 0:
+                return None
+            dirty_paths = set(dirty.stdout.split("\0"))
+        except Exception as e:
+            logger.error(f"Error reading git index: {e}")
+            return None
+        
+        # Index paths are relative to the repository root, which may be above the vault
+        return {
+            path[len(prefix):]: entry
+            for path, entry in entries.items()
+            if path.startswith(prefix) and path not in dirty_paths
+        }
+    
     def get_file_commit_count(self, file_path: str, use_cache: bool = True) -> int:
         """Get the number of commits for a specific file"""
         if not self.is_git_repo:
@@ -175,19 +258,8 @@ class GitHistoryAnalyzer:
     
     def calculate_git_importance_score(self, commit_count: int) -> float:
         """Calculate importance score based on commit count"""
-        # Since most files have 1 commit, adjust scoring to be more granular
-        if commit_count == 0:
-            return 0.0
-        elif commit_count == 1:
-            return 0.2  # Base score for tracked files
-        elif commit_count == 2:
-            return 0.5
-        elif commit_count == 3:
-            return 0.7
-        elif commit_count <= 5:
-            return 0.85
-        else:  # 6+ commits
-            return 1.0
+        # Since most files have 1 commit, small counts get their own steps
+        return GIT_SCORE_STEPS[min(max(commit_count, 0), len(GIT_SCORE_STEPS) - 1)]
     
     def get_vault_statistics(self, file_paths: list) -> Dict:
         """Get overall git statistics for the vault"""
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Reader for git's index file (.git/index, versions 2 to 4)"""
+import struct
+from typing import Dict, NamedTuple, Tuple
+
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size, blob id, flags
+ENTRY_STRUCT = struct.Struct(">10L20sH")
+
+FLAG_EXTENDED = 0x4000
+FLAG_STAGE_MASK = 0x3000
+EXTENDED_SKIP_WORKTREE = 0x4000
+EXTENDED_INTENT_TO_ADD = 0x2000
+MODE_TYPE_MASK = 0o170000
+MODE_REGULAR_FILE = 0o100000
+
+
+class IndexEntry(NamedTuple):
+    """Stat data git recorded for a tracked file; attribute names match os.stat_result"""
+    st_size: int
+    st_ctime: float
+    st_mtime: float
+    st_mtime_ns: int
+    blob_id: str
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode the offset varint used for path prefix compression in index v4"""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7f
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, pos
+
+
+def read_git_index(index_path: str) -> Dict[str, IndexEntry]:
+    """Parse an index file into {repo-relative POSIX path: IndexEntry} for regular files"""
+    with open(index_path, 'rb') as f:
+        data = f.read()
+
+    signature, version, count = struct.unpack_from(">4sLL", data, 0)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise ValueError(f"Unsupported git index (signature {signature!r}, version {version})")
+
+    entries = {}
+    offset = 12
+    previous_path = b""
+    for _ in range(count):
+        (ctime_s, ctime_ns, mtime_s, mtime_ns, _dev, _ino, mode, _uid, _gid,
+         size, blob_id, flags) = ENTRY_STRUCT.unpack_from(data, offset)
+        pos = offset + ENTRY_STRUCT.size
+        extended_flags = 0
+        if flags & FLAG_EXTENDED:
+            extended_flags = struct.unpack_from(">H", data, pos)[0]
+            pos += 2
+
+        if version < 4:
+            end = data.index(b"\0", pos)
+            path = data[pos:end]
+            # Entries are NUL-padded to a multiple of eight bytes
+            offset += (end - offset + 8) & ~7
+        else:
+            # Each path drops some bytes from the end of the previous one and appends the rest
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            path = previous_path[:len(previous_path) - strip] + data[pos:end]
+            offset = end + 1
+        previous_path = path
+
+        # Skip merge conflicts, symlinks, submodules and sparse directories, and entries
+        # whose stat data says nothing about the work tree (skip-worktree, git add -N)
+        if (flags & FLAG_STAGE_MASK or mode & MODE_TYPE_MASK != MODE_REGULAR_FILE
+                or extended_flags & (EXTENDED_SKIP_WORKTREE | EXTENDED_INTENT_TO_ADD)):
+            continue
+
+        entries[path.decode('utf-8', 'surrogateescape')] = IndexEntry(
+            st_size=size,
+            # Same float conversion os.stat() uses
+            st_ctime=ctime_s + ctime_ns * 1e-9,
+            st_mtime=mtime_s + mtime_ns * 1e-9,
+            st_mtime_ns=mtime_s * 1_000_000_000 + mtime_ns,
+            blob_id=blob_id.hex()
+        )
+
+    return entries
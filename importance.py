@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Importance score of every note as one product of a feature matrix and a weight vector, so
+different weights re-rank a vault without scanning it again
+"""
+import os
+import sys
+import argparse
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from git_history import GIT_SCORE_STEPS
+
+# Columns of the feature matrix, as the store and the columnar export keep them
+FEATURES = ("git_score", "pagerank", "in_degree", "out_degree", "content_richness")
+
+# Share of each feature in the score; base is added to every note
+DEFAULT_WEIGHTS = {
+    "git_score": 0.30,         # Git activity - MOST IMPORTANT
+    "pagerank": 0.20,          # Network position
+    "in_degree": 0.15,         # Incoming links
+    "out_degree": 0.15,        # Outgoing links
+    "content_richness": 0.10,  # Words, images and tags
+    "base": 0.10,
+}
+
+# Brings each feature to a comparable range before it is weighted
+FEATURE_SCALES = {"git_score": 10.0, "pagerank": 100.0, "in_degree": 1.0, "out_degree": 1.0,
+                  "content_richness": 1.0}
+
+RICHNESS_CAP = 10.0
+
+
+def git_scores(commit_counts: Iterable[int]) -> np.ndarray:
+    """Git score of each commit count; most files have one commit, so small counts are told apart"""
+    counts = np.asarray(commit_counts, dtype=np.int64)
+    return np.take(GIT_SCORE_STEPS, np.clip(counts, 0, len(GIT_SCORE_STEPS) - 1))
+
+
+def content_richness(word_counts: Iterable[int], image_counts: Iterable[int],
+                     tag_counts: Iterable[int]) -> np.ndarray:
+    """Words per thousand, half a point per image and a fifth per tag, capped"""
+    richness = (np.asarray(word_counts, dtype=float) / 1000.0 + np.asarray(image_counts, dtype=float) * 0.5
+                + np.asarray(tag_counts, dtype=float) * 0.2)
+    return np.minimum(richness, RICHNESS_CAP)
+
+
+def feature_matrix(commit_counts, pagerank, in_degree, out_degree, word_counts, image_counts,
+                   tag_counts) -> np.ndarray:
+    """One row per note, one column per entry of FEATURES"""
+    return np.column_stack([git_scores(commit_counts), np.asarray(pagerank, dtype=float),
+                            np.asarray(in_degree, dtype=float), np.asarray(out_degree, dtype=float),
+                            content_richness(word_counts, image_counts, tag_counts)])
+
+
+def normalize_weights(weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """DEFAULT_WEIGHTS with the given entries replaced"""
+    weights = dict(weights or {})
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise KeyError(f"Not an importance weight: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_WEIGHTS, **{name: float(value) for name, value in weights.items()}}
+
+
+def importance_scores(features: np.ndarray, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Score of every row of a feature matrix"""
+    weights = normalize_weights(weights)
+    coefficients = np.array([weights[name] * FEATURE_SCALES[name] for name in FEATURES])
+    return features @ coefficients + weights["base"]
+
+
+def contributions(features: np.ndarray, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Points each feature adds to the score of each row"""
+    weights = normalize_weights(weights)
+    return features * np.array([weights[name] * FEATURE_SCALES[name] for name in FEATURES])
+
+
+def top_rows(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """Rows of the top_n highest scores, highest first, ties in row order"""
+    top_n = min(int(top_n), len(scores))
+    if top_n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    rows = np.argpartition(-scores, top_n - 1)[:top_n]
+    # Every row scoring as much as the last one kept competes for its place
+    rows = np.flatnonzero(scores >= scores[rows].min())
+    return rows[np.lexsort((rows, -scores[rows]))][:top_n]
+
+
+def parse_weights(values: Iterable[str]) -> Dict[str, float]:
+    """NAME=VALUE arguments as a weights dict"""
+    weights = {}
+    for value in values:
+        name, separator, number = value.partition("=")
+        if not separator or name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Expected NAME=VALUE with NAME one of {', '.join(DEFAULT_WEIGHTS)}, got {value!r}")
+        weights[name] = float(number)
+    return weights
+
+
+def main():
+    from analysis_store import AnalysisStore
+
+    parser = argparse.ArgumentParser(description="Recompute importance scores of a saved analysis with new weights")
+    parser.add_argument("--db", default="vault_analysis.db", help="Analysis store (default: vault_analysis.db)")
+    parser.add_argument("--weight", action="append", default=[], metavar="NAME=VALUE",
+                        help=f"Weight of {', '.join(DEFAULT_WEIGHTS)}; repeat for several")
+    parser.add_argument("--top", type=int, default=10, help="Notes to list (default: 10)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} not found. Please run the analyzer first.")
+        sys.exit(1)
+    try:
+        weights = parse_weights(args.weight)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    with AnalysisStore(args.db) as store:
+        weights = normalize_weights({**store.get_importance_weights(), **weights})
+        store.rescore(weights)
+        store.commit()
+        print("Weights: " + ", ".join(f"{name}={value:g}" for name, value in weights.items()))
+        for note in store.get_important_notes(args.top):
+            print(f"  {note['importance_score']:>8.2f}  {note['path']}")
+    print("Run `python columnar_export.py` to publish the new scores to a running dashboard")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""json.dump for analysis files too large to build in memory first"""
+import json
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable, TextIO
+
+
+def dump_streaming(obj: Any, f: TextIO, indent: int = 2, default: Callable = str) -> None:
+    """
+    Write obj like json.dump(obj, f, indent=indent, default=default), except that iterators
+    (e.g. generators) become arrays and non-dict mappings (e.g. disk stores) become objects
+    that are written item by item
+    """
+    _write_value(obj, f, 0, " " * indent, default)
+
+
+def _is_streamed(obj: Any) -> bool:
+    """Whether obj (or a value inside a dict) has to be written piece by piece"""
+    if isinstance(obj, Iterator) or (isinstance(obj, Mapping) and not isinstance(obj, dict)):
+        return True
+    return isinstance(obj, dict) and any(_is_streamed(value) for value in obj.values())
+
+
+def _write_value(obj: Any, f: TextIO, level: int, indent: str, default: Callable) -> None:
+    """Write one value at the given nesting level"""
+    if isinstance(obj, Iterator):
+        _write_sequence(obj, f, level, indent, default, "[]")
+    elif isinstance(obj, Mapping) and _is_streamed(obj):
+        _write_sequence(iter(obj.items()), f, level, indent, default, "{}")
+    else:
+        # Everything else is encoded in chunks like json.dump, shifted to this nesting level
+        encoder = json.JSONEncoder(indent=len(indent), default=default)
+        for chunk in encoder.iterencode(obj):
+            f.write(chunk.replace("\n", "\n" + indent * level) if level else chunk)
+
+
+def _write_sequence(items: Iterator, f: TextIO, level: int, indent: str, default: Callable,
+                    brackets: str) -> None:
+    """Write array items or (key, value) object items without materializing them"""
+    empty = True
+    for item in items:
+        f.write(",\n" if not empty else brackets[0] + "\n")
+        empty = False
+        f.write(indent * (level + 1))
+        if brackets == "{}":
+            f.write(json.dumps(str(item[0])) + ": ")
+            item = item[1]
+        _write_value(item, f, level + 1, indent, default)
+    f.write(brackets if empty else f"\n{indent * level}{brackets[1]}")
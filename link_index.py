@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Resolution of wikilink targets to note ids, the way Obsidian finds the note a link means"""
+import os
+import sys
+from functools import lru_cache
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def link_path(target: str) -> str:
+    """
+    Link target without #heading or ^block anchor, table escape, leading slash or .md suffix,
+    as written otherwise; empty for links to a heading of the linking note itself
+    """
+    target = target.split("#", 1)[0].split("^", 1)[0].strip()
+    # [[Note\|alias]] inside a markdown table
+    target = target.rstrip("\\").strip()
+    if target.startswith("./"):
+        target = target[2:]
+    target = target.lstrip("/")
+    if target.lower().endswith(".md"):
+        target = target[:-3]
+    return target
+
+
+@lru_cache(maxsize=65536)
+def _link_key(target: str) -> Tuple[str, str]:
+    """(link path, lower-cased lookup key) of a target; the same texts are linked over and over"""
+    path = link_path(target)
+    return path, path.lower()
+
+
+def _suffixes(path: str) -> List[str]:
+    """a/b/c -> a/b/c, b/c, c"""
+    parts = path.split("/")
+    return ["/".join(parts[start:]) for start in range(len(parts))]
+
+
+class LinkIndex:
+    """
+    Lookup of link keys (lower-cased vault paths, every path suffix down to the basename,
+    and frontmatter aliases) to note ids, with the notes linking through each key, so that
+    adding, removing or renaming a note only re-resolves the links it can change.
+    A link is resolved as Obsidian does: the exact vault path, then the path relative to the
+    linking note's folder, then the note with that name (or alias) closest to the vault root
+    """
+
+    def __init__(self):
+        # Lower-cased link path (vault path without .md) -> note id
+        self._paths: Dict[str, str] = {}
+        # Lower-cased path suffix or alias -> note ids it names
+        self._names: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._aliases: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # note id -> (lower-cased link path, lower-cased aliases)
+        self._keys: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        # Most recent choice among several notes of a name, dropped when its candidates change
+        self._chosen: Dict[str, Optional[str]] = {}
+        # source note id -> link targets as written; lower-cased key -> notes linking through it
+        self._links: Dict[str, List[str]] = {}
+        self._linkers: Dict[str, Dict[str, None]] = defaultdict(dict)
+
+    def __contains__(self, note_id: str) -> bool:
+        return note_id in self._keys
+
+    def add(self, note_id: str, path: str, aliases: Iterable[str] = ()) -> Set[str]:
+        """
+        Index a note by its vault-relative path and aliases, or update an indexed one.
+        Returns the notes whose links may now resolve differently
+        """
+        key = link_path(path.replace(os.sep, "/")).lower()
+        aliases = tuple(dict.fromkeys(alias.strip().lower() for alias in aliases if alias.strip()))
+        previous = self._keys.get(note_id)
+        if previous == (key, aliases):
+            return set()
+
+        changed = set()
+        if previous is not None:
+            changed.update(self._unindex(note_id))
+        self._keys[note_id] = (key, aliases)
+        self._paths[key] = note_id
+        for name in _suffixes(key):
+            self._names[name][note_id] = None
+            changed.add(name)
+        for alias in aliases:
+            self._aliases[alias][note_id] = None
+            changed.add(alias)
+        return self._affected(changed)
+
+    def remove(self, note_id: str) -> Set[str]:
+        """Forget a note; returns the notes whose links may now resolve differently"""
+        if note_id not in self._keys:
+            return set()
+        changed = self._unindex(note_id)
+        del self._keys[note_id]
+        return self._affected(changed)
+
+    def _unindex(self, note_id: str) -> Set[str]:
+        key, aliases = self._keys[note_id]
+        if self._paths.get(key) == note_id:
+            del self._paths[key]
+        names = _suffixes(key)
+        for index, entries in ((self._names, names), (self._aliases, aliases)):
+            for entry in entries:
+                index[entry].pop(note_id, None)
+                if not index[entry]:
+                    del index[entry]
+        return set(names) | set(aliases)
+
+    def _affected(self, keys: Set[str]) -> Set[str]:
+        affected = set()
+        for key in keys:
+            self._chosen.pop(key, None)
+            affected.update(self._linkers.get(key, ()))
+        return affected
+
+    def resolve(self, target: str, source: str) -> Optional[str]:
+        """
+        Note id a link of source means; the anchor-free target as written if no note matches,
+        None for a link to source itself, by heading, block, name, path or alias
+        """
+        note_id = self._resolve(target, source)
+        return None if note_id == source else note_id
+
+    def _resolve(self, target: str, source: str) -> Optional[str]:
+        path, key = _link_key(target)
+        if not path:
+            return None
+        note_id = self._paths.get(key)
+        if note_id is not None:
+            return note_id
+
+        folder = self._keys[source][0].rpartition("/")[0] if source in self._keys else ""
+        if folder:
+            note_id = self._paths.get(folder + "/" + key)
+            if note_id is not None:
+                return note_id
+
+        if key not in self._chosen:
+            # File names win over aliases; among several, the one with the fewest folders
+            candidates = self._names.get(key) or self._aliases.get(key) or ()
+            self._chosen[key] = min(candidates, key=lambda candidate: (self._keys[candidate][0].count("/"),
+                                                                       self._keys[candidate][0]), default=None)
+        return self._chosen[key] or path
+
+    def set_links(self, source: str, targets: List[str]) -> List[str]:
+        """Record the links of source as written and return their resolved targets"""
+        self.remove_links(source)
+        self._links[source] = targets
+        for target in targets:
+            key = _link_key(target)[1]
+            if key:
+                self._linkers[key][source] = None
+        return self.resolved_links(source)
+
+    def resolved_links(self, source: str) -> List[str]:
+        """Resolved targets of the recorded links of source, in order, interned"""
+        resolved = (self.resolve(target, source) for target in self._links.get(source, ()))
+        return [sys.intern(target) for target in resolved if target is not None]
+
+    def remove_links(self, source: str) -> None:
+        for target in self._links.pop(source, ()):
+            key = _link_key(target)[1]
+            linkers = self._linkers.get(key)
+            if linkers is not None:
+                linkers.pop(source, None)
+                if not linkers:
+                    del self._linkers[key]
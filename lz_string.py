@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LZ-String decompression (decompressFromBase64)
+The Excalidraw plugin stores drawings in ```compressed-json blocks with this format
+"""
+import re
+from typing import Iterator, Optional
+
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+# Every base64 character carries 6 bits, most significant first
+_BASE64_BITS = {c: format(i, '06b') for i, c in enumerate(BASE64_ALPHABET[:64])}
+# Padding carries no data
+_BASE64_BITS["="] = "000000"
+# The plugin wraps long payloads over several lines
+_BASE64_BITS.update({c: "" for c in " \t\r\n"})
+
+# Base64 characters expanded to bits per refill
+_BLOCK_CHARS = 4096
+
+_SURROGATE_PATTERN = re.compile('[\ud800-\udfff]')
+
+
+def decompress_from_base64(data: str) -> Optional[str]:
+    """Decompress an LZ-String base64 payload, None if it is corrupt"""
+    try:
+        return join_utf16(iter_decompress_from_base64(data))
+    except ValueError:
+        return None
+
+
+def join_utf16(parts) -> str:
+    """Join decompressed pieces into a str, pairing up UTF-16 surrogates"""
+    text = "".join(parts)
+    # JavaScript strings are UTF-16, so astral characters arrive as surrogate pairs
+    if _SURROGATE_PATTERN.search(text):
+        text = text.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+    return text
+
+
+def iter_decompress_from_base64(data: str) -> Iterator[str]:
+    """Yield decompressed pieces in order, so callers can stop early; ValueError if corrupt"""
+    if not data:
+        return
+
+    # Bits are expanded in blocks as the reader advances, never all at once
+    stream = ""
+    stream_start = 0
+    next_char = 0
+    pos = 0
+
+    def read(count: int) -> int:
+        # Values are written least significant bit first
+        nonlocal stream, stream_start, next_char, pos
+        offset = pos - stream_start
+        while offset + count > len(stream) and next_char < len(data):
+            block = data[next_char:next_char + _BLOCK_CHARS]
+            next_char += len(block)
+            try:
+                bits = "".join([_BASE64_BITS[c] for c in block])
+            except KeyError:
+                raise ValueError("invalid base64 character")
+            stream = stream[offset:] + bits
+            stream_start = pos
+            offset = 0
+        # Reads past the end yield zero bits, like the JavaScript reference
+        bits = stream[offset:offset + count].ljust(count, "0")
+        pos += count
+        return int(bits[::-1], 2)
+
+    marker = read(2)
+    if marker == 2:
+        return
+    if marker > 2:
+        raise ValueError("invalid LZ-String header")
+    c = chr(read(8 if marker == 0 else 16))
+
+    dictionary = ["", "", "", c]
+    enlarge_in = 4
+    num_bits = 3
+    w = c
+    yield c
+
+    while True:
+        if next_char >= len(data) and pos >= stream_start + len(stream):
+            raise ValueError("truncated LZ-String data")
+
+        code = read(num_bits)
+        if code == 0 or code == 1:
+            dictionary.append(chr(read(8 if code == 0 else 16)))
+            code = len(dictionary) - 1
+            enlarge_in -= 1
+        elif code == 2:
+            return
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+        if code < len(dictionary):
+            entry = dictionary[code]
+        elif code == len(dictionary):
+            entry = w + w[0]
+        else:
+            raise ValueError("invalid LZ-String dictionary reference")
+
+        yield entry
+        dictionary.append(w + entry[0])
+        enlarge_in -= 1
+        w = entry
+
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
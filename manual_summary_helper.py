@@ -9,12 +9,16 @@ import sys
 from pathlib import Path
 from typing import List, Dict
 
-def load_vault_analysis() -> dict:
-    """Load the vault analysis data"""
-    with open("vault_analysis.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+from analysis_store import AnalysisStore
 
-def get_notes_for_folder(vault_data: dict, folder: str) -> List[Dict]:
+def load_vault_analysis() -> AnalysisStore:
+    """Open the vault analysis store"""
+    if not Path("vault_analysis.db").exists():
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
+        sys.exit(1)
+    return AnalysisStore("vault_analysis.db")
+
+def get_notes_for_folder(store: AnalysisStore, folder: str) -> List[Dict]:
     """Get notes from specific folder that need summaries"""
     # Try to find vault path - check common locations
     vault_path = None
@@ -30,11 +34,8 @@ def get_notes_for_folder(vault_data: dict, folder: str) -> List[Dict]:
     ]
     
     # Try to find a valid vault path by checking if a known note exists
-    sample_note = None
-    for _, metadata in vault_data["notes_metadata"].items():
-        if metadata.get("path", "").startswith(folder):
-            sample_note = metadata.get("path")
-            break
+    paths = store.get_paths_without_summary(folder)
+    sample_note = paths[0] if paths else None
     
     if sample_note:
         for possible_path in possible_paths:
@@ -50,22 +51,21 @@ def get_notes_for_folder(vault_data: dict, folder: str) -> List[Dict]:
     
     notes = []
     
-    for note_id, metadata in vault_data["notes_metadata"].items():
-        path = metadata.get("path", "")
-        if path.startswith(folder) and not metadata.get("ai_summary"):
-            full_path = vault_path / path
-            if full_path.exists():
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    notes.append({
-                        "path": path,
-                        "name": Path(path).name,
-                        "content": content[:3000],  # First 3000 chars
-                        "note_id": note_id
-                    })
-                except Exception as e:
-                    print(f"Error reading {path}: {e}")
+    for path in paths:
+        note_id = store.note_id_for_path(path)
+        full_path = vault_path / path
+        if full_path.exists():
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                notes.append({
+                    "path": path,
+                    "name": Path(path).name,
+                    "content": content[:3000],  # First 3000 chars
+                    "note_id": note_id
+                })
+            except Exception as e:
+                print(f"Error reading {path}: {e}")
     
     return notes
 
@@ -103,7 +103,7 @@ Here are the notes to analyze:
     
     return prompt
 
-def save_manual_summaries(summaries_json: str, vault_data: dict):
+def save_manual_summaries(summaries_json: str, store: AnalysisStore):
     """Save manually generated summaries back to vault analysis"""
     try:
         summaries = json.loads(summaries_json)
@@ -111,15 +111,13 @@ def save_manual_summaries(summaries_json: str, vault_data: dict):
         updated = 0
         for item in summaries.get("summaries", []):
             note_id = item.get("note_id")
-            if note_id and note_id in vault_data["notes_metadata"]:
-                vault_data["notes_metadata"][note_id]["ai_summary"] = item.get("ai_summary", "")
-                vault_data["notes_metadata"][note_id]["ai_hashtags"] = item.get("ai_hashtags", [])
-                vault_data["notes_metadata"][note_id]["ai_keywords"] = item.get("ai_keywords", [])
+            if note_id and store.get_note(note_id) is not None:
+                store.set_ai(note_id, item.get("ai_summary", ""), item.get("ai_hashtags", []),
+                             item.get("ai_keywords", []))
                 updated += 1
         
-        # Save updated vault analysis
-        with open("vault_analysis.json", "w", encoding="utf-8") as f:
-            json.dump(vault_data, f, indent=2, ensure_ascii=False)
+        # Save updated vault analysis; only the AI rows of these notes were rewritten
+        store.commit()
         
         print(f"✓ Successfully updated {updated} notes with AI summaries!")
         return True
@@ -140,13 +138,13 @@ def main():
         return
     
     command = sys.argv[1]
-    vault_data = load_vault_analysis()
+    store = load_vault_analysis()
     
     if command == "generate":
         folder = sys.argv[2] if len(sys.argv) > 2 else "800_Ressources"
         batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 5
         
-        notes = get_notes_for_folder(vault_data, folder)
+        notes = get_notes_for_folder(store, folder)
         print(f"Found {len(notes)} notes in {folder} without AI summaries")
         
         if not notes:
@@ -180,7 +178,7 @@ def main():
             with open(json_file, 'r', encoding='utf-8') as f:
                 summaries_json = f.read()
             
-            if save_manual_summaries(summaries_json, vault_data):
+            if save_manual_summaries(summaries_json, store):
                 print("Restart the dashboard to see the AI summaries!")
         except FileNotFoundError:
             print(f"File not found: {json_file}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Append-only time series of vault statistics and per-note metrics, one sample per analysis run.
+Per-note values are stored as integer deltas against the note's previous sample, and only
+for notes where something changed, so hundreds of runs stay small
+"""
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    sample_id INTEGER PRIMARY KEY,
+    recorded TEXT NOT NULL,
+    stats TEXT
+);
+CREATE TABLE IF NOT EXISTS note_deltas (
+    note_id TEXT NOT NULL,
+    sample_id INTEGER NOT NULL,
+    importance INTEGER NOT NULL,
+    in_degree INTEGER NOT NULL,
+    out_degree INTEGER NOT NULL,
+    commit_count INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (note_id, sample_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latest (
+    note_id TEXT PRIMARY KEY,
+    importance INTEGER NOT NULL,
+    in_degree INTEGER NOT NULL,
+    out_degree INTEGER NOT NULL,
+    commit_count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Next to the default analysis store, as run_analysis.py writes it
+METRICS_DB = "vault_analysis.metrics.db"
+
+# Importance is kept in units of 1/IMPORTANCE_SCALE; smaller changes are not recorded
+IMPORTANCE_SCALE = 10000
+
+METRICS = ("importance", "in_degree", "out_degree", "commit_count")
+
+NoteMetrics = Tuple[str, float, int, int, int]
+
+
+class MetricsHistory:
+    """
+    Samples of the vault stats and of each note's importance, degrees and commit count.
+    Deltas are clustered by note, so a note's whole history is one index range scan
+    """
+
+    def __init__(self, db_path: str = METRICS_DB):
+        self.db_path = str(db_path)
+        self.connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "MetricsHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Writing
+
+    def record(self, stats: Dict, notes: Iterable[NoteMetrics], recorded: Optional[datetime] = None) -> int:
+        """
+        Append a sample: stats as given and (note_id, importance, in_degree, out_degree, commit_count)
+        of every note; notes missing from a sample are recorded as deleted. Returns the sample id
+        """
+        recorded = recorded or datetime.now()
+        latest = {row[0]: row[1:] for row in self.connection.execute(
+            "SELECT note_id, importance, in_degree, out_degree, commit_count FROM latest")}
+
+        with self.connection:
+            sample_id = self.connection.execute(
+                "INSERT INTO samples (recorded, stats) VALUES (?, ?)",
+                (recorded.isoformat(timespec="seconds"), json.dumps(stats, default=str))).lastrowid
+
+            deltas = []
+            updates = []
+            for note_id, importance, in_degree, out_degree, commit_count in notes:
+                values = (round((importance or 0.0) * IMPORTANCE_SCALE), in_degree or 0, out_degree or 0,
+                          commit_count or 0)
+                previous = latest.pop(note_id, None)
+                if previous == values:
+                    continue
+                # A new (or returning) note starts from zero
+                previous = previous or (0, 0, 0, 0)
+                deltas.append((note_id, sample_id, *(new - old for new, old in zip(values, previous)), 0))
+                updates.append((note_id, *values))
+
+            # Whatever is left in latest was not part of this sample
+            deltas.extend((note_id, sample_id, 0, 0, 0, 0, 1) for note_id in latest)
+            self.connection.executemany("INSERT INTO note_deltas VALUES (?, ?, ?, ?, ?, ?, ?)", deltas)
+            self.connection.executemany(
+                "INSERT INTO latest VALUES (?, ?, ?, ?, ?) ON CONFLICT(note_id) DO UPDATE SET "
+                "importance = excluded.importance, in_degree = excluded.in_degree, "
+                "out_degree = excluded.out_degree, commit_count = excluded.commit_count", updates)
+            self.connection.executemany("DELETE FROM latest WHERE note_id = ?", [(note_id,) for note_id in latest])
+        return sample_id
+
+    def record_store(self, store, recorded: Optional[datetime] = None) -> int:
+        """Append a sample of an AnalysisStore"""
+        notes = store.connection.execute(
+            "SELECT notes.note_id, importance_score, in_degree, out_degree, COALESCE(git.commit_count, 0) "
+            "FROM notes LEFT JOIN git ON git.note_id = notes.note_id")
+        return self.record(store.get_stats(), notes, recorded)
+
+    # Queries
+
+    def _recorded(self) -> Dict[int, str]:
+        return dict(self.connection.execute("SELECT sample_id, recorded FROM samples"))
+
+    def vault_history(self) -> List[Dict]:
+        """Stats of every sample, oldest first, with the orphan rate"""
+        history = []
+        for sample_id, recorded, stats in self.connection.execute(
+                "SELECT sample_id, recorded, stats FROM samples ORDER BY sample_id"):
+            stats = json.loads(stats)
+            total = stats.get("total_notes", 0)
+            history.append({"sample": sample_id, "recorded": recorded, **stats,
+                            "orphan_rate": stats.get("orphaned_count", 0) / total if total else 0.0})
+        return history
+
+    def note_history(self, note_id: str) -> List[Dict]:
+        """
+        Values of a note at each sample where they changed, oldest first; a value holds until the
+        next entry. Entries with deleted=True mark samples where the note no longer existed
+        """
+        history = []
+        values = [0, 0, 0, 0]
+        for sample_id, recorded, *deltas, deleted in self.connection.execute(
+                "SELECT d.sample_id, s.recorded, d.importance, d.in_degree, d.out_degree, d.commit_count, "
+                "d.deleted FROM note_deltas d JOIN samples s ON s.sample_id = d.sample_id "
+                "WHERE d.note_id = ? ORDER BY d.sample_id", (note_id,)):
+            if deleted:
+                values = [0, 0, 0, 0]
+                history.append({"sample": sample_id, "recorded": recorded, "deleted": True})
+                continue
+            values = [value + delta for value, delta in zip(values, deltas)]
+            history.append({"sample": sample_id, "recorded": recorded, "deleted": False,
+                            "importance": values[0] / IMPORTANCE_SCALE, "in_degree": values[1],
+                            "out_degree": values[2], "commit_count": values[3]})
+        return history
+
+    def note_series(self, note_id: str) -> List[Dict]:
+        """A note's values at every sample since it first appeared, for charting"""
+        changes = self.note_history(note_id)
+        if not changes:
+            return []
+        by_sample = {change["sample"]: change for change in changes}
+        series = []
+        current = None
+        for sample_id, recorded in self.connection.execute(
+                "SELECT sample_id, recorded FROM samples WHERE sample_id >= ? ORDER BY sample_id",
+                (changes[0]["sample"],)):
+            current = by_sample.get(sample_id, current)
+            if not current["deleted"]:
+                series.append({**current, "sample": sample_id, "recorded": recorded})
+        return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the vault or a note's metrics over time")
+    parser.add_argument("note_id", nargs="?", help="Note to show (default: vault statistics)")
+    parser.add_argument("--db", default=METRICS_DB, help=f"Metrics history (default: {METRICS_DB})")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} not found. Please run the analyzer first.")
+        sys.exit(1)
+
+    with MetricsHistory(args.db) as history:
+        if args.note_id is None:
+            print(f"{'Sample':>6}  {'Recorded':<19}{'Notes':>8}{'Edges':>9}{'Orphans':>9}{'Rate':>7}")
+            for sample in history.vault_history():
+                print(f"{sample['sample']:>6}  {sample['recorded']:<19}{sample.get('total_notes', 0):>8}"
+                      f"{sample.get('graph_edges', 0):>9}{sample.get('orphaned_count', 0):>9}"
+                      f"{sample['orphan_rate']:>7.1%}")
+            return
+
+        changes = history.note_history(args.note_id)
+        if not changes:
+            print(f"No history for {args.note_id}")
+            sys.exit(1)
+        print(f"{'Sample':>6}  {'Recorded':<19}{'Importance':>11}{'In':>6}{'Out':>6}{'Commits':>9}")
+        for change in changes:
+            if change["deleted"]:
+                print(f"{change['sample']:>6}  {change['recorded']:<19}  deleted")
+            else:
+                print(f"{change['sample']:>6}  {change['recorded']:<19}{change['importance']:>11.4f}"
+                      f"{change['in_degree']:>6}{change['out_degree']:>6}{change['commit_count']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Note parsing for the Obsidian analyzer
+Pure functions without analyzer state, so they can run in worker processes
+"""
+
+import os
+import re
+import json
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from lz_string import iter_decompress_from_base64, join_utf16
+
+# Regex patterns
+WIKILINK_PATTERN = re.compile(r'\[\[([^|\]]+)(?:\|([^\]]+))?\]\]')
+
+# One scanner for every markdown token we care about. Each alternative starts with
+# a literal character so the regex engine can skip plain text quickly, and code
+# (fences and inline spans) is consumed before anything inside it can match.
+MARKDOWN_TOKEN_PATTERN = re.compile(r"""
+    `(?:(?<![^\n]`)(?P<fence>(?P<fence_marker>``+)[^\n]*\n(?s:.*?)(?:^[ ]{0,3}`(?P=fence_marker)[ \t]*$|\Z))
+       |(?P<code>`[^\n]+?``|[^`\n]+`))
+  | ~(?<![^\n]~)(?P<tilde_fence>(?P<tilde_marker>~~+)[^\n]*\n(?s:.*?)(?:^[ ]{0,3}~(?P=tilde_marker)[ \t]*$|\Z))
+  | \n(?P<indented_fence>[ ]{1,3}(?P<indent_marker>`{3,}|~{3,})[^\n]*\n(?s:.*?)(?:^[ ]{0,3}(?P=indent_marker)[ \t]*$|\Z))
+  | !(?:(?P<embed>\[\[(?P<embed_target>[^\]]+)\]\])
+       |(?P<image>\[(?P<image_alt>[^\]]*)\]\((?P<image_url>[^\)]+)\)))
+  | \[(?:(?P<wikilink>\[(?P<wikilink_target>[^|\]]+)(?:\|(?P<wikilink_alias>[^\]]+))?\]\])
+       |(?P<link>(?P<link_text>[^\]]+)\]\((?P<link_url>[^\)]+)\)))
+  | \#(?<![\w&#/]\#)(?P<tag>(?P<tag_name>[\w\-/]+))
+""", re.MULTILINE | re.VERBOSE)
+
+# YAML frontmatter at the very start of a note, and its aliases (or alias) key
+FRONTMATTER_PATTERN = re.compile(r'\A---[ \t]*\n(.*?\n)?---[ \t]*(?:\n|\Z)', re.DOTALL)
+ALIASES_KEY_PATTERN = re.compile(r'^alias(?:es)?[ \t]*:[ \t]*(.*)$', re.MULTILINE)
+YAML_LIST_ITEM_PATTERN = re.compile(r'[ \t]*-[ \t]+(.*)')
+
+# Excalidraw scene inside an .excalidraw.md note, and the start of its elements array
+EXCALIDRAW_BLOCK_PATTERN = re.compile(r'^```(json|compressed-json)[ \t]*\n', re.MULTILINE)
+ELEMENTS_KEY_PATTERN = re.compile(r'"elements"\s*:\s*')
+JSON_DECODER = json.JSONDecoder()
+
+# Characters decompressed between checks for the end of the elements array
+DECOMPRESS_CHECK_INTERVAL = 64 * 1024
+
+# Hex colours such as #1e1e1e are not tags
+HEX_COLOUR_PATTERN = re.compile(r'(?=.*\d)(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})')
+
+# Wikilinks mentioning these extensions point at attachments, not notes
+ATTACHMENT_LINK_PATTERN = re.compile(r'\.(?:png|jpe?g|gif|svg|pdf)', re.IGNORECASE)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
+URL_PREFIXES = ('http://', 'https://', 'www.')
+
+# Characters of note text handed to the keyword extractor
+KEYWORD_TEXT_LENGTH = 3000
+
+# (absolute path, vault-relative path, size, ctime, mtime)
+ParseJob = Tuple[str, str, int, float, float]
+
+
+def is_excalidraw_path(path: str) -> bool:
+    """Check whether a file is an Excalidraw drawing"""
+    return path.endswith(".excalidraw.md") or path.endswith(".excalidraw")
+
+
+def note_id_for(relative_path: str) -> str:
+    """Note id is the vault-relative path without its last suffix"""
+    return os.path.splitext(relative_path)[0]
+
+
+def empty_linked_content() -> Dict:
+    """Fresh linked content structure"""
+    return {
+        "notes": [],      # Internal note links
+        "images": [],     # Image links
+        "pdfs": [],       # PDF links
+        "urls": [],       # External URLs
+        "files": []       # Other file links
+    }
+
+
+def parse_note(job: ParseJob, data: Optional[bytes] = None) -> Dict:
+    """Read (unless data is given), hash and parse one file into a plain, picklable record"""
+    file_path, relative_path, size, created, modified = job
+
+    record = {
+        "note_id": note_id_for(relative_path),
+        "path": relative_path,
+        "absolute_path": file_path,
+        "type": "excalidraw" if is_excalidraw_path(file_path) else os.path.splitext(file_path)[1][1:],
+        "size": size,
+        "created": created,
+        "modified": modified,
+        "links_out": [],
+        "tags": [],
+        "images": [],
+        "word_count": 0,
+        "content_hash": "",
+        "linked_content": empty_linked_content(),
+        "aliases": [],
+        "keyword_text": None
+    }
+
+    # Read the file exactly once; hash and text both come from this buffer
+    if data is None:
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
+            return record
+
+    record["content_hash"] = hashlib.md5(data).hexdigest()
+
+    try:
+        content = decode_text(data)
+    except UnicodeDecodeError as e:
+        print(f"Error parsing {file_path}: {e}")
+        return record
+
+    # The keyword stage only looks at the beginning of a note
+    record["keyword_text"] = content[:KEYWORD_TEXT_LENGTH]
+    if file_path.endswith(".md"):
+        record["aliases"] = parse_aliases(content)
+
+    # Parse content based on file type
+    if is_excalidraw_path(file_path):
+        parse_excalidraw_content(content, record, file_path)
+    elif file_path.endswith(".md"):
+        try:
+            parse_markdown_content(content, record)
+        except Exception as e:
+            print(f"Error parsing {file_path}: {e}")
+
+    return record
+
+
+def parse_notes(batch: List[Tuple[ParseJob, Optional[bytes]]]) -> List[Dict]:
+    """parse_note for a batch of (job, data) pairs, one task of the process pool"""
+    return [parse_note(job, data) for job, data in batch]
+
+
+def _yaml_scalar(value: str) -> str:
+    """Plain or quoted YAML scalar without quotes"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def parse_aliases(content: str) -> List[str]:
+    """
+    Frontmatter aliases of a note: a YAML list (block or [flow] style), or a single string
+    whose commas separate aliases as older Obsidian versions wrote them
+    """
+    frontmatter = FRONTMATTER_PATTERN.match(content)
+    if not frontmatter or not frontmatter.group(1):
+        return []
+    block = frontmatter.group(1)
+    key = ALIASES_KEY_PATTERN.search(block)
+    if not key:
+        return []
+
+    value = key.group(1).split(" #", 1)[0].strip()
+    if value.startswith("["):
+        items = value.strip("[]").split(",")
+    elif value:
+        items = value.split(",") if value[0] not in "'\"" else [value]
+    else:
+        # Block list on the following lines
+        items = []
+        for line in block[key.end() + 1:].split("\n"):
+            item = YAML_LIST_ITEM_PATTERN.fullmatch(line)
+            if not item:
+                break
+            items.append(item.group(1))
+    return [alias for alias in map(_yaml_scalar, items) if alias]
+
+
+def decode_text(data: bytes) -> str:
+    """Decode file bytes like open(..., encoding='utf-8') does, including newline translation"""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def find_excalidraw_scene(content: str, file_path: str) -> int:
+    """Offset of the drawing scene within a file, -1 if there is none"""
+    if not file_path.endswith('.excalidraw.md'):
+        return 0
+    # The plugin keeps the scene in a ```json or ```compressed-json block
+    block = EXCALIDRAW_BLOCK_PATTERN.search(content)
+    return block.start() if block else content.find('{"type":"excalidraw"')
+
+
+def excalidraw_text(elements: List[Dict]) -> str:
+    """Plain-text view of a drawing: text elements, container labels and frame names"""
+    lines = []
+    for element in elements:
+        if element.get("isDeleted"):
+            continue
+        element_type = element.get("type")
+        if element_type == "text":
+            # originalText is the label before the drawing wrapped it into lines
+            text = element.get("originalText") or element.get("text")
+        elif element_type == "frame":
+            text = element.get("name")
+        else:
+            continue
+        if text:
+            lines.append(text)
+    return "\n".join(lines)
+
+
+def read_note_text(file_path: str) -> Optional[str]:
+    """Readable text of a note: the file itself, or the words of an Excalidraw drawing"""
+    try:
+        with open(file_path, 'rb') as f:
+            content = decode_text(f.read())
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+    if not is_excalidraw_path(file_path):
+        return content
+
+    try:
+        scene_start = find_excalidraw_scene(content, file_path)
+        elements = extract_excalidraw_elements(content, scene_start) if scene_start != -1 else None
+    except Exception as e:
+        print(f"Error parsing excalidraw {file_path}: {e}")
+        elements = None
+    return content if elements is None else excalidraw_text(elements)
+
+
+def extract_excalidraw_elements(content: str, start: int = 0) -> Optional[List[Dict]]:
+    """Decode only the elements array of the scene at `start`, None if there is none"""
+    block = EXCALIDRAW_BLOCK_PATTERN.match(content, start)
+    if block is not None:
+        start = block.end()
+        if block.group(1) == 'compressed-json':
+            end = content.find('```', start)
+            return _decompress_excalidraw_elements(content[start:end if end != -1 else len(content)])
+
+    # "elements" is the first nested key of a scene, so everything after the
+    # array (appState and the base64 "files" blobs) is never decoded
+    match = ELEMENTS_KEY_PATTERN.search(content, start)
+    if match is None:
+        return None
+    elements, _ = JSON_DECODER.raw_decode(content, match.end())
+    return elements
+
+
+def _decompress_excalidraw_elements(payload: str) -> Optional[List[Dict]]:
+    """Decompress a compressed-json scene only as far as the end of its elements array"""
+    parts = []
+    produced = 0
+    checked = 0
+    for part in iter_decompress_from_base64(payload):
+        parts.append(part)
+        produced += len(part)
+        if produced - checked < DECOMPRESS_CHECK_INTERVAL:
+            continue
+        checked = produced
+
+        # appState follows the elements, so once it shows up the array is usually complete
+        text = join_utf16(parts)
+        parts = [text]
+        if '"appState"' in text:
+            try:
+                return extract_excalidraw_elements(text)
+            except ValueError:
+                # The key was part of some element text, keep going
+                pass
+
+    return extract_excalidraw_elements(join_utf16(parts))
+
+
+def parse_excalidraw_content(content: str, metadata: Dict, file_path: str) -> None:
+    """Parse excalidraw file content for embedded markdown and links"""
+    try:
+        scene_start = find_excalidraw_scene(content, file_path)
+        if file_path.endswith('.excalidraw.md'):
+            # The markdown part mirrors text elements, element links and embedded files
+            parse_markdown_content(content[:scene_start] if scene_start != -1 else content, metadata)
+        if scene_start == -1:
+            return
+
+        elements = extract_excalidraw_elements(content, scene_start)
+        if elements is None:
+            return
+
+        # Keyword and AI stages work on the drawing's words, not on its JSON
+        metadata["keyword_text"] = excalidraw_text(elements)[:KEYWORD_TEXT_LENGTH]
+
+        links_out = metadata["links_out"]
+        # Links already listed in the markdown part are not counted twice
+        known_links = set(links_out) if file_path.endswith(".excalidraw.md") else None
+
+        def add_link(target: str) -> None:
+            if known_links is None:
+                links_out.append(target)
+            elif target not in known_links:
+                known_links.add(target)
+                links_out.append(target)
+
+        for element in elements:
+            if element.get("isDeleted"):
+                continue
+
+            # Look for text elements that might contain links
+            if element.get("type") == "text" and element.get("text"):
+                for link_match in WIKILINK_PATTERN.findall(element["text"]):
+                    add_link(link_match[0])
+
+            # Any element can carry a link to a note or a website
+            link = element.get("link")
+            if link:
+                link_match = WIKILINK_PATTERN.fullmatch(link.strip())
+                if link_match:
+                    add_link(link_match.group(1))
+                elif link.startswith(URL_PREFIXES):
+                    metadata["linked_content"]["urls"].append({"text": link, "url": link})
+
+        # Count elements as "content"
+        metadata["word_count"] = len(elements)
+
+    except Exception as e:
+        print(f"Error parsing excalidraw {file_path}: {e}")
+
+
+def parse_markdown_content(content: str, metadata: Dict) -> None:
+    """Parse markdown content for links, tags, and other metadata in a single pass"""
+    linked_content = empty_linked_content()
+    links_out = metadata["links_out"]
+    images = metadata["images"]
+
+    linked_notes = linked_content["notes"]
+    is_attachment = ATTACHMENT_LINK_PATTERN.search
+
+    def add_wikilink(target: str, alias: Optional[str]) -> None:
+        links_out.append(target)
+        # Add to linked notes
+        if not is_attachment(target):
+            linked_notes.append({"title": alias or target, "path": target})
+
+    def add_markdown_link(link_text: str, link_url: str) -> None:
+        # Categorize the link
+        lowered = link_url.lower()
+        if link_url.startswith(URL_PREFIXES):
+            linked_content["urls"].append({"text": link_text, "url": link_url})
+        elif lowered.endswith('.pdf'):
+            linked_content["pdfs"].append({"text": link_text, "path": link_url})
+        elif lowered.endswith(IMAGE_EXTENSIONS):
+            # Resolved after the scan, once every embedded image is known
+            linked_images.append((link_text, link_url))
+        else:
+            # Other file types
+            linked_content["files"].append({"text": link_text, "path": link_url})
+
+    tags = []
+    seen_tags = set()
+    linked_images = []
+    embedded_pdfs = []
+
+    for match in MARKDOWN_TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+
+        if kind == "wikilink":
+            add_wikilink(*match.group("wikilink_target", "wikilink_alias"))
+        elif kind == "tag":
+            tag = match.group("tag_name")
+            if tag not in seen_tags and not tag.isdigit() and not HEX_COLOUR_PATTERN.fullmatch(tag):
+                seen_tags.add(tag)
+                tags.append(tag)
+        elif kind == "embed":
+            # ![[target|size]] is an image/file embed and a wikilink at the same time
+            target = match.group("embed_target")
+            images.append(target)
+            linked_content["images"].append({"path": target, "alt": ""})
+            link_target, separator, alias = target.partition('|')
+            if link_target and (not separator or alias):
+                add_wikilink(link_target, alias or None)
+            if target.lower().endswith('.pdf'):
+                embedded_pdfs.append(target)
+        elif kind == "image":
+            alt, url = match.group("image_alt", "image_url")
+            images.append(url)
+            linked_content["images"].append({"path": url, "alt": alt})
+            if alt:
+                add_markdown_link(alt, url)
+        elif kind == "link":
+            add_markdown_link(*match.group("link_text", "link_url"))
+        # fences and inline code are skipped on purpose
+
+    metadata["tags"] = tags
+
+    # Image links not captured as embeds
+    image_paths = {img["path"] for img in linked_content["images"]}
+    for link_text, link_url in linked_images:
+        if link_url not in image_paths:
+            image_paths.add(link_url)
+            linked_content["images"].append({"path": link_url, "alt": link_text})
+
+    # Embedded PDFs ![[file.pdf]]
+    pdf_paths = {pdf["path"] for pdf in linked_content["pdfs"]}
+    for pdf in embedded_pdfs:
+        if pdf not in pdf_paths:
+            pdf_paths.add(pdf)
+            linked_content["pdfs"].append({"text": pdf.split('/')[-1], "path": pdf})
+
+    metadata["linked_content"] = linked_content
+
+    # Calculate word count
+    metadata["word_count"] = len(content.split())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Disk-backed note records for analysing vaults that do not fit in memory"""
+import os
+import pickle
+import sqlite3
+import weakref
+import tempfile
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+# Unpickled note dicts take about this many times their pickled size in memory
+MEMORY_PER_PICKLED_BYTE = 8
+
+# Keys fetched per query while iterating, so iteration never holds all keys at once
+ITERATION_BATCH = 1000
+
+
+def _remove_store(connection: sqlite3.Connection, path: str) -> None:
+    """Close and delete a store file"""
+    connection.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class DiskStore:
+    """
+    Scratch SQLite file holding pickled records in named tables, with one write-back
+    cache of recently used records in front of all of them, bounded by `memory_limit_mb`
+    """
+
+    def __init__(self, directory: str, memory_limit_mb: int = 256):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix="notes-", suffix=".sqlite", dir=directory)
+        os.close(fd)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        # Scratch data: a crash loses nothing worth keeping, so skip journaling and fsync
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.memory_limit = max(1, memory_limit_mb) * 1024 * 1024
+
+        # (table, key) -> [value, estimated bytes, dirty]; least recently used first
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._finalizer = weakref.finalize(self, _remove_store, self.connection, self.path)
+
+    def mapping(self, table: str) -> "StoreMapping":
+        """Dict-like view of one table, created empty"""
+        self.connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.connection.execute(f'CREATE TABLE "{table}" (key TEXT PRIMARY KEY, data BLOB)')
+        return StoreMapping(self, table)
+
+    def close(self) -> None:
+        """Delete the store file"""
+        self._cache.clear()
+        self._finalizer()
+
+    def _write(self, table: str, key: str, value: Any) -> int:
+        """Store a value, keeping the position of an existing key like dict does"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.connection.execute(
+            f'INSERT INTO "{table}" (key, data) VALUES (?, ?) '
+            f'ON CONFLICT(key) DO UPDATE SET data = excluded.data', (key, data))
+        return len(data)
+
+    def _remember(self, table: str, key: str, value: Any, pickled_size: int, dirty: bool) -> None:
+        """Cache a value and write back the least recently used ones beyond the memory limit"""
+        cache_key = (table, key)
+        previous = self._cache.pop(cache_key, None)
+        if previous is not None:
+            self._cached_bytes -= previous[1]
+        size = pickled_size * MEMORY_PER_PICKLED_BYTE
+        self._cache[cache_key] = [value, size, dirty]
+        self._cached_bytes += size
+
+        while self._cached_bytes > self.memory_limit and len(self._cache) > 1:
+            (old_table, old_key), (old_value, old_size, old_dirty) = self._cache.popitem(last=False)
+            self._cached_bytes -= old_size
+            if old_dirty:
+                self._write(old_table, old_key, old_value)
+
+    def _forget(self, table: str, key: str) -> None:
+        """Drop a cached value without writing it back"""
+        entry = self._cache.pop((table, key), None)
+        if entry is not None:
+            self._cached_bytes -= entry[1]
+
+    def flush(self) -> None:
+        """Write back every cached value"""
+        for (table, key), entry in self._cache.items():
+            if entry[2]:
+                self._write(table, key, entry[0])
+                entry[2] = False
+        self.connection.commit()
+
+
+class StoreMapping(MutableMapping):
+    """One table of a DiskStore; iterates in insertion order like dict"""
+
+    def __init__(self, store: DiskStore, table: str):
+        self.store = store
+        self.table = table
+
+    def __getitem__(self, key: str) -> Any:
+        # Callers may change what they get in place, so it is written back unless assigned again
+        entry = self.store._cache.get((self.table, key))
+        if entry is not None:
+            self.store._cache.move_to_end((self.table, key))
+            entry[2] = True
+            return entry[0]
+
+        row = self.store.connection.execute(
+            f'SELECT data FROM "{self.table}" WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = pickle.loads(row[0])
+        self.store._remember(self.table, key, value, len(row[0]), dirty=True)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        # Written through at once so new keys get their insertion position
+        size = self.store._write(self.table, key, value)
+        self.store._remember(self.table, key, value, size, dirty=False)
+
+    def __delitem__(self, key: str) -> None:
+        self.store._forget(self.table, key)
+        cursor = self.store.connection.execute(f'DELETE FROM "{self.table}" WHERE key = ?', (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if (self.table, key) in self.store._cache:
+            return True
+        return self.store.connection.execute(
+            f'SELECT 1 FROM "{self.table}" WHERE key = ?', (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        last_rowid = 0
+        while True:
+            rows = self.store.connection.execute(
+                f'SELECT rowid, key FROM "{self.table}" WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                (last_rowid, ITERATION_BATCH)).fetchall()
+            if not rows:
+                return
+            for _, key in rows:
+                yield key
+            last_rowid = rows[-1][0]
+
+    def __len__(self) -> int:
+        return self.store.connection.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def clear(self) -> None:
+        for table, key in [cache_key for cache_key in self.store._cache if cache_key[0] == self.table]:
+            self.store._forget(table, key)
+        self.store.connection.execute(f'DELETE FROM "{self.table}"')
+
+
+def new_mapping(store: Optional[DiskStore], table: str) -> Dict:
+    """A plain dict without a store, otherwise a disk-backed table"""
+    return {} if store is None else store.mapping(table)
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Columnar table of note metadata with integer row ids and dict-like row views"""
+import os
+import sys
+from array import array
+from datetime import datetime
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from note_parser import empty_linked_content
+
+# Fields in the order a note's metadata dict always had them
+FIELDS = ("path", "absolute_path", "type", "size", "created", "modified", "links_out", "links_in",
+          "tags", "images", "word_count", "content_hash", "linked_content", "git_stats", "commit_count",
+          "ai_summary", "ai_hashtags", "ai_keywords", "importance_score", "in_degree", "out_degree",
+          "pagerank", "git_score", "keywords", "auto_hashtags")
+
+# Fixed-width columns: field -> array typecode (int32, int64, float64)
+NUMBER_COLUMNS = {
+    "size": "q",
+    "word_count": "i",
+    "commit_count": "i",
+    "in_degree": "i",
+    "out_degree": "i",
+    "importance_score": "d",
+    "pagerank": "d",
+    "git_score": "d",
+}
+
+# Datetimes, stored as int64 microseconds since the epoch
+TIME_COLUMNS = ("created", "modified")
+
+# String lists stored as tuples of interned strings; tags, hashtags and links repeat across notes
+STRING_LIST_FIELDS = ("links_out", "links_in", "tags", "images", "ai_hashtags", "ai_keywords",
+                      "keywords", "auto_hashtags")
+
+# Everything else that is not a column is kept as a Python object per note
+OBJECT_FIELDS = ("absolute_path", "content_hash", "linked_content", "git_stats", "ai_summary") + STRING_LIST_FIELDS
+_OBJECT_SLOTS = {field: slot for slot, field in enumerate(OBJECT_FIELDS)}
+
+# Fraction of deleted rows at which the table is compacted
+COMPACT_RATIO = 0.5
+
+LINKED_CONTENT_KEYS = tuple(empty_linked_content())
+
+# Shared key tuples of encoded linked content entries
+_ENTRY_KEYS: Dict[tuple, tuple] = {}
+
+
+def datetime_to_epoch_us(value: datetime) -> int:
+    """Exact inverse of datetime.fromtimestamp for naive local datetimes"""
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000 + value.microsecond
+
+
+def epoch_us_to_datetime(value: int) -> datetime:
+    """Same result as datetime.fromtimestamp(value / 1e6), without float rounding"""
+    seconds, microseconds = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def encode_linked_content(linked_content: Dict) -> Any:
+    """
+    Store each category's {"title": ..., "path": ...} style dicts as one shared key tuple plus a
+    flat tuple of interned values; categories with mixed keys are kept as they are
+    """
+    if not isinstance(linked_content, dict) or tuple(linked_content) != LINKED_CONTENT_KEYS:
+        return linked_content
+    encoded = []
+    for entries in linked_content.values():
+        if not entries:
+            encoded.append(None)
+            continue
+        keys = tuple(entries[0]) if isinstance(entries[0], dict) else None
+        if keys is None or any(not isinstance(entry, dict) or tuple(entry) != keys for entry in entries):
+            encoded.append(entries)
+            continue
+        keys = _ENTRY_KEYS.setdefault(keys, keys)
+        encoded.append((keys, tuple(_intern(value) for entry in entries for value in entry.values())))
+    return tuple(encoded)
+
+
+def decode_linked_content(encoded: Any) -> Dict:
+    """Rebuild the linked content dict from encode_linked_content's form"""
+    if encoded is None:
+        return empty_linked_content()
+    if not isinstance(encoded, tuple):
+        return encoded
+    linked_content = {}
+    for category, entries in zip(LINKED_CONTENT_KEYS, encoded):
+        if entries is None:
+            linked_content[category] = []
+        elif isinstance(entries, tuple):
+            keys, values = entries
+            width = len(keys)
+            linked_content[category] = [dict(zip(keys, values[i:i + width]))
+                                        for i in range(0, len(values), width)]
+        else:
+            linked_content[category] = entries
+    return linked_content
+
+
+class NoteRow(Mapping):
+    """View of one table row that reads and writes like the note's metadata dict"""
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "NoteTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field: str) -> Any:
+        return self._table.get_field(self._row, field)
+
+    def __setitem__(self, field: str, value: Any) -> None:
+        self._table.set_field(self._row, field, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    @property
+    def row(self) -> int:
+        """int32 row id of the note"""
+        return self._row
+
+    def to_dict(self) -> Dict:
+        """Plain dict copy with lists, as stored before the table existed"""
+        return {field: self._table.get_field(self._row, field) for field in FIELDS}
+
+
+class NoteTable(MutableMapping):
+    """
+    note_id -> NoteRow, in insertion order like a dict. Scalars live in typed arrays indexed
+    by row id; nested values in per-field lists, or in a disk store in streaming mode.
+    Row views are only valid until the next deletion, which may renumber rows.
+    """
+
+    def __init__(self, vault_path: str, store: Optional[MutableMapping] = None):
+        self.root = str(vault_path)
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = bytearray()
+        self._deleted = 0
+
+        self.paths: List[str] = []
+        self.type_codes = array("b")
+        # Code 0 is the empty type of a row that was never given one
+        self.type_names: List[str] = [""]
+        self.columns = {field: array(typecode) for field, typecode in NUMBER_COLUMNS.items()}
+        self.columns.update({field: array("q") for field in TIME_COLUMNS})
+
+        # Nested values: one list per field in memory, or one list per note in a disk store
+        self._store = store
+        self._objects = None if store is not None else [[] for _ in OBJECT_FIELDS]
+
+    # Mapping interface
+
+    def __getitem__(self, note_id: str) -> NoteRow:
+        return NoteRow(self, self._rows[note_id])
+
+    def __setitem__(self, note_id: str, metadata: Mapping) -> None:
+        row = self._rows.get(note_id)
+        if isinstance(metadata, NoteRow) and metadata._table is self and metadata._row == row:
+            # Assigning a row back to itself; its fields are already stored
+            return
+        if row is None:
+            row = self._append(note_id)
+        else:
+            # Like dict assignment: the note keeps its position, fields not given are reset
+            self._reset(row)
+
+        objects = self._empty_objects()
+        for field in FIELDS:
+            if field not in metadata:
+                continue
+            slot = _OBJECT_SLOTS.get(field)
+            if slot is None:
+                self.set_field(row, field, metadata[field])
+            else:
+                objects[slot] = self._encode(row, field, metadata[field])
+        # Nested values are written in one go, a single store write in streaming mode
+        if self._store is None:
+            for values, value in zip(self._objects, objects):
+                values[row] = value
+        else:
+            self._store[self.ids[row]] = objects
+
+    def __delitem__(self, note_id: str) -> None:
+        row = self._rows.pop(note_id)
+        self._alive[row] = 0
+        self._deleted += 1
+        self.paths[row] = ""
+        if self._store is not None:
+            del self._store[note_id]
+        else:
+            for values in self._objects:
+                values[row] = None
+        if self._deleted > 64 and self._deleted > len(self.ids) * COMPACT_RATIO:
+            self._compact()
+
+    def __iter__(self) -> Iterator[str]:
+        for row in self.live_rows():
+            yield self.ids[row]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, note_id: object) -> bool:
+        return note_id in self._rows
+
+    def clear(self) -> None:
+        for note_id in list(self._rows):
+            del self[note_id]
+
+    # Columns
+
+    def row_of(self, note_id: str) -> Optional[int]:
+        """Row id of a note, None if it is not in the table"""
+        return self._rows.get(note_id)
+
+    def live_rows(self) -> Iterator[int]:
+        """Row ids of all notes in insertion order"""
+        if not self._deleted:
+            return iter(range(len(self.ids)))
+        return (row for row, alive in enumerate(self._alive) if alive)
+
+    def type_of(self, row: int) -> str:
+        """Categorical type of a row"""
+        return self.type_names[self.type_codes[row]]
+
+    def get_field(self, row: int, field: str) -> Any:
+        """Read one field of a row as the metadata dict held it"""
+        column = self.columns.get(field)
+        if column is not None:
+            value = column[row]
+            return epoch_us_to_datetime(value) if field in TIME_COLUMNS else value
+        if field == "path":
+            return self.paths[row]
+        if field == "type":
+            return self.type_of(row)
+
+        slot = _OBJECT_SLOTS.get(field)
+        if slot is None:
+            raise KeyError(field)
+        value = self._get_object(row, slot)
+        if field in STRING_LIST_FIELDS:
+            return list(value)
+        if field == "absolute_path" and value is None:
+            return os.path.join(self.root, self.paths[row])
+        if field == "linked_content":
+            return decode_linked_content(value)
+        return value
+
+    def set_field(self, row: int, field: str, value: Any) -> None:
+        """Write one field of a row"""
+        column = self.columns.get(field)
+        if column is not None:
+            column[row] = datetime_to_epoch_us(value) if field in TIME_COLUMNS else value
+            return
+        if field == "path":
+            self.paths[row] = sys.intern(value)
+            return
+        if field == "type":
+            if value not in self.type_names:
+                self.type_names.append(value)
+            self.type_codes[row] = self.type_names.index(value)
+            return
+
+        slot = _OBJECT_SLOTS.get(field)
+        if slot is None:
+            raise KeyError(field)
+        self._set_object(row, slot, self._encode(row, field, value))
+
+    def _encode(self, row: int, field: str, value: Any) -> Any:
+        """Compact form of a nested value; common values are stored as None or shared tuples"""
+        if field in STRING_LIST_FIELDS:
+            return tuple(_intern(item) for item in value)
+        if field == "absolute_path" and value == os.path.join(self.root, self.paths[row]):
+            # Derived from the path unless the walker produced something else
+            return None
+        if field == "linked_content":
+            if value == empty_linked_content():
+                return None
+            return encode_linked_content(value)
+        return value
+
+    @staticmethod
+    def _empty_objects() -> List:
+        """Stored nested values of a new row"""
+        return [None, "", None, None, ""] + [()] * len(STRING_LIST_FIELDS)
+
+    def _get_object(self, row: int, slot: int) -> Any:
+        if self._store is None:
+            return self._objects[slot][row]
+        return self._store[self.ids[row]][slot]
+
+    def _set_object(self, row: int, slot: int, value: Any) -> None:
+        if self._store is None:
+            self._objects[slot][row] = value
+            return
+        note_id = self.ids[row]
+        values = self._store[note_id]
+        values[slot] = value
+        self._store[note_id] = values
+
+    def _append(self, note_id: str) -> int:
+        """Add an empty row at the end"""
+        row = len(self.ids)
+        note_id = sys.intern(note_id)
+        self.ids.append(note_id)
+        self._rows[note_id] = row
+        self._alive.append(1)
+        self.paths.append("")
+        self.type_codes.append(0)
+        for column in self.columns.values():
+            column.append(0)
+        if self._store is None:
+            for values, value in zip(self._objects, self._empty_objects()):
+                values.append(value)
+        else:
+            self._store[note_id] = self._empty_objects()
+        return row
+
+    def _reset(self, row: int) -> None:
+        """Set the scalar fields of a row back to their defaults"""
+        self.paths[row] = ""
+        self.type_codes[row] = 0
+        for column in self.columns.values():
+            column[row] = 0
+
+    def _compact(self) -> None:
+        """Drop deleted rows and renumber the rest, keeping their order"""
+        keep = [row for row, alive in enumerate(self._alive) if alive]
+        self.ids = [self.ids[row] for row in keep]
+        self._rows = {note_id: row for row, note_id in enumerate(self.ids)}
+        self._alive = bytearray(b"\x01" * len(keep))
+        self._deleted = 0
+        self.paths = [self.paths[row] for row in keep]
+        self.type_codes = array("b", (self.type_codes[row] for row in keep))
+        for field, column in self.columns.items():
+            self.columns[field] = array(column.typecode, (column[row] for row in keep))
+        if self._store is None:
+            self._objects = [[values[row] for row in keep] for values in self._objects]
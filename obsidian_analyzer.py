@@ -6,48 +6,98 @@ Scans and analyzes Obsidian vaults to create interactive visualizations
 
 import os
 import re
+import sys
 import json
-import sqlite3
+import time
+import heapq
+import itertools
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple, Optional
-import hashlib
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Set, Tuple, Optional, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 
-import networkx as nx
-from obsidiantools.api import Vault
-import pandas as pd
-from rake_nltk import Rake
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import networkx as nx
 from diskcache import Cache
 from collections import Counter
 import pickle
-import string
-from nltk.stem import PorterStemmer
-from nltk.corpus import words
-import nltk
 
 from git_history import GitHistoryAnalyzer
+from vault_walker import RULE_FILES, VaultWalker
+from async_reader import AsyncFileReader
+from note_store import DiskStore, new_mapping
+from note_table import NoteTable, epoch_us_to_datetime
+from sparse_graph import SparseGraph
+from link_index import LinkIndex
+from importance import FEATURES, feature_matrix, importance_scores, normalize_weights
+from analysis_store import AnalysisStore
+from note_parser import KEYWORD_TEXT_LENGTH, ParseJob, parse_note, parse_notes, note_id_for, read_note_text
+
+# Metrics computed on first access, and the metrics each one is computed from
+METRIC_DEPENDENCIES = {
+    "git": (),
+    "pagerank": (),
+    "importance": ("git", "pagerank"),
+    "orphans": (),
+    "keywords": (),
+}
 
 
 class ObsidianAnalyzer:
     """Main analyzer class for Obsidian vaults"""
     
-    def __init__(self, vault_path: str, cache_dir: str = ".cache", use_git_cache: bool = False):
+    def __init__(self, vault_path: str, cache_dir: str = ".cache", use_git_cache: bool = False,
+                 workers: int = 1, incremental: bool = False, read_concurrency: int = 0,
+                 streaming: bool = False, memory_limit_mb: int = 256,
+                 importance_weights: Optional[Dict[str, float]] = None):
         self.vault_path = Path(vault_path)
         if not self.vault_path.exists():
             raise ValueError(f"Vault path does not exist: {vault_path}")
         
         self.cache = Cache(cache_dir)
+        # Streaming mode keeps per-note data on disk with at most memory_limit_mb of it in RAM;
+        # the graph only ever holds note ids and links
+        self.streaming = streaming
+        self._store = DiskStore(cache_dir, memory_limit_mb) if streaming else None
         self.graph = nx.DiGraph()
-        self.notes_metadata = {}
+        # Columnar note table; in streaming mode its nested values live in the disk store
+        self.notes_metadata = NoteTable(self.vault_path, new_mapping(self._store, "note_objects")
+                                        if self._store is not None else None)
         self.orphaned_notes = set()
         self.important_notes = []
-        self.keyword_metadata = {}
+        self.keyword_metadata = new_mapping(self._store, "keywords")
         self.ai_classifications = self._load_ai_classifications()
         self.use_git_cache = use_git_cache
+        self.workers = max(1, workers)
+        self.incremental = incremental
+        # Concurrent asyncio reads ahead of the parser; 0 reads each file inside the parser
+        self.read_concurrency = max(0, read_concurrency)
+        
+        # Beginning of each freshly parsed note, kept only until the keyword stage ran
+        self._keyword_texts = new_mapping(self._store, "keyword_texts")
+        # Rule-based (keywords, hashtags) per note, reused while a note is unchanged
+        self._rule_classifications = new_mapping(self._store, "classifications")
+        # Vault-relative path -> fresh record (or None) whose cache entry is rewritten after the scan
+        self._manifest_updates = new_mapping(self._store, "manifest_updates")
+        # Folder fingerprints from the last incremental walk
+        self._directories = None
+        # Notes each metric is out of date for (None: all notes); merged notes are added to them
+        # and compute() brings them up to date
+        self._stale = {metric: set() for metric in METRIC_DEPENDENCIES}
+        # Link targets of notes removed for a new version; the graph only changes if those differ
+        self._replaced_links = {}
+        # CSR copy of the graph with its degrees and PageRank, rebuilt by the pagerank stage
+        self._sparse_graph = None
+        self._pagerank = None
+        self.pagerank_report = None
+        # Importance features by row of the CSR graph (see importance.FEATURES), and their weights
+        self.importance_features = None
+        self.importance_weights = normalize_weights(importance_weights)
+        # Notes with new commits, whose git stats must not come from the history cache
+        self._git_refresh = set()
+        # Note ids by path, path suffix and alias, for resolving what links point at
+        self._link_index = LinkIndex()
         
         # Initialize git analyzer
         self.git_analyzer = GitHistoryAnalyzer(str(self.vault_path))
@@ -56,22 +106,10 @@ class ObsidianAnalyzer:
         if not use_git_cache:
             self.git_analyzer.clear_cache()
         
-        # Regex patterns
-        self.wikilink_pattern = re.compile(r'\[\[([^|\]]+)(?:\|([^\]]+))?\]\]')
-        self.tag_pattern = re.compile(r'#([\w\-\_\/]+)')
-        self.image_pattern = re.compile(r'!\[\[([^\]]+)\]\]|!\[([^\]]*)\]\(([^\)]+)\)')
-        
-        # Keyword extraction
-        self.rake = Rake(max_length=3, min_length=1)
-        self.stemmer = PorterStemmer()
-        
-        # Try to load English words dictionary
-        try:
-            nltk.download('words', quiet=True)
-            self.english_words = set(words.words())
-        except:
-            print("Warning: Could not load English words dictionary")
-            self.english_words = set()
+        # Keyword extraction; nltk takes over a second to import, so both are created on first use
+        self.rake = None
+        self.stemmer = None
+        self._stems = {}
         
         # Enhanced hashtag categories with weighted keywords and stems (English + German)
         self.hashtag_categories = {
@@ -181,107 +219,339 @@ class ObsidianAnalyzer:
         """Scan the entire vault and collect metadata"""
         print(f"Scanning vault at: {self.vault_path}")
         
-        # Find all markdown and excalidraw files
-        md_files = list(self.vault_path.rglob("*.md"))
-        excalidraw_files = list(self.vault_path.rglob("*.excalidraw"))
-        excalidraw_md_files = list(self.vault_path.rglob("*.excalidraw.md"))
-        
-        # Remove .excalidraw.md files from md_files to avoid double counting
-        md_files = [f for f in md_files if not str(f).endswith('.excalidraw.md')]
+        # Clean tracked files get their stat data from .git/index instead of the filesystem
+        index_stats = self.git_analyzer.get_index_stats()
+        if index_stats:
+            print(f"Using git index stat data for {len(index_stats)} clean tracked files")
         
-        # Combine all excalidraw files
-        all_excalidraw_files = excalidraw_files + excalidraw_md_files
+        # Find all markdown and excalidraw files in a single walk
+        walker = VaultWalker(str(self.vault_path))
+        if self.incremental:
+            # Folders whose mtime is unchanged reuse their listing from the last run
+            previous = self.cache.get(self._cache_key("directories"))
+            vault_files, self._directories, changed_folders = walker.walk_fingerprinted(previous, index_stats)
+            print(f"Folder fingerprints: {len(changed_folders)} of {len(self._directories['directories'])} "
+                  f"folders changed")
+        else:
+            vault_files = walker.walk(known_stats=index_stats)
+        md_files = vault_files["markdown"]
+        all_excalidraw_files = vault_files["excalidraw"]
         
         print(f"Found {len(md_files)} markdown files and {len(all_excalidraw_files)} excalidraw files")
         
-        # Process each file
-        for file_path in md_files + all_excalidraw_files:
-            self._process_file(file_path)
+        # Every note is indexed before the first link is resolved, so links to notes later
+        # in the walk point at them right away
+        self._index_notes(md_files + all_excalidraw_files)
         
-        # Calculate graph metrics
-        self._calculate_importance_scores()
-        self._identify_orphans()
+        if self.incremental:
+            # Only reparse files whose size or mtime changed since the last run
+            self._scan_incremental(md_files + all_excalidraw_files)
+        else:
+            # Read, hash and parse every file, then merge the records in walk order
+            jobs = [self._make_parse_job(file_path, file_stat)
+                    for file_path, file_stat in md_files + all_excalidraw_files]
+            for record in self._parse_files(jobs):
+                self._merge_record(record)
         
-        # Extract keywords and classify notes
-        self._extract_keywords_and_classify()
+        # Git stats, PageRank, importance, orphans and keywords are computed on first access
+        if self.incremental:
+            self._save_manifest()
         
-        # Save keyword metadata
-        self._save_keyword_metadata()
+        return self.get_stats()
+    
+    def compute(self, *metrics: str) -> None:
+        """
+        Bring the given metrics (default: all of them) up to date for the notes they are stale for.
+        Getters compute what they need; note records only hold the metrics computed so far
+        """
+        for metric in metrics or METRIC_DEPENDENCIES:
+            self._compute_metric(metric)
         
+        # Git stats and classifications computed after the scan still go into the record cache
+        if self.incremental and self._manifest_updates:
+            self._save_manifest()
+    
+    def _compute_metric(self, metric: str) -> None:
+        """Compute the metrics a metric depends on, then the metric itself where it is stale"""
+        for dependency in METRIC_DEPENDENCIES[metric]:
+            self._compute_metric(dependency)
+        note_ids = self._stale[metric]
+        if note_ids is not None and not note_ids:
+            return
+        stages = {
+            "git": self._load_git_stats,
+            "pagerank": self._calculate_pagerank,
+            "importance": self._calculate_importance_scores,
+            "orphans": self._identify_orphans,
+            "keywords": self._extract_keywords_and_classify
+        }
+        stages[metric](note_ids)
+        self._stale[metric] = set()
+    
+    def _invalidate(self, metric: str, note_ids: Optional[Iterable[str]] = None) -> None:
+        """Mark a metric stale for note_ids (all notes if None), and every metric computed from it"""
+        stale = self._stale[metric]
+        if note_ids is None:
+            self._stale[metric] = None
+        elif stale is not None:
+            stale.update(note_ids)
+        for dependent, dependencies in METRIC_DEPENDENCIES.items():
+            if metric in dependencies:
+                self._invalidate(dependent, note_ids)
+    
+    def _is_stale(self, metric: str, note_id: str) -> bool:
+        """Whether a note's value of a metric still has to be computed"""
+        stale = self._stale[metric]
+        return stale is None or note_id in stale
+    
+    def _notes_for(self, note_ids: Optional[Iterable[str]]) -> Iterable[Tuple[str, Dict]]:
+        """(note_id, metadata) of all notes, or of those note_ids that still exist"""
+        if note_ids is None:
+            return self.notes_metadata.items()
+        return [(note_id, self.notes_metadata[note_id]) for note_id in note_ids
+                if note_id in self.notes_metadata]
+    
+    def get_stats(self) -> Dict:
+        """Summary numbers for the current state of the analysis"""
+        self.compute("orphans")
+        excalidraw_count = sum(1 for metadata in self.notes_metadata.values()
+                               if metadata["type"] == "excalidraw")
         return {
             "total_notes": len(self.notes_metadata),
-            "markdown_count": len(md_files),
-            "excalidraw_count": len(all_excalidraw_files),
+            "markdown_count": len(self.notes_metadata) - excalidraw_count,
+            "excalidraw_count": excalidraw_count,
             "orphaned_count": len(self.orphaned_notes),
             "graph_nodes": self.graph.number_of_nodes(),
             "graph_edges": self.graph.number_of_edges()
         }
     
-    def _process_file(self, file_path: Path) -> None:
-        """Process a single file and extract metadata"""
-        # Skip if it's actually a directory
-        if file_path.is_dir():
-            print(f"Skipping directory: {file_path}")
-            return
+    def update_notes(self, paths: Iterable[str]) -> Dict:
+        """
+        Apply created, changed or deleted files and folders to an already scanned vault;
+        a changed ignore rule file (see vault_walker.RULE_FILES) re-applies the rules to every note
+        """
+        walker = VaultWalker(str(self.vault_path))
+        known = {metadata["path"]: note_id for note_id, metadata in self.notes_metadata.items()}
+        changed = {}
+        removed = set()
+        rules_changed = False
+        
+        for path in paths:
+            relative_path = os.path.relpath(path, self.vault_path)
+            if relative_path == os.curdir or relative_path.startswith(os.pardir):
+                continue
             
+            if Path(relative_path).as_posix() in RULE_FILES:
+                # Ignore rules changed; the walk below applies them to the whole vault
+                rules_changed = True
+            elif os.path.isdir(path):
+                # Folder created or moved in: everything below it is new
+                if walker.is_ignored(Path(relative_path).as_posix(), is_dir=True):
+                    continue
+                found = walker.walk(Path(path))
+                for file_path, file_stat in found["markdown"] + found["excalidraw"]:
+                    changed[str(file_path.relative_to(self.vault_path))] = (file_path, file_stat)
+            elif os.path.isfile(path) and walker.is_note_file(Path(relative_path).as_posix()):
+                try:
+                    file_stat = os.stat(path)
+                except OSError as e:
+                    print(f"Error accessing file {path}: {e}")
+                    continue
+                metadata = self.notes_metadata.get(known.get(relative_path))
+                if (metadata is not None and metadata["size"] == file_stat.st_size
+                        and metadata["modified"] == datetime.fromtimestamp(file_stat.st_mtime)):
+                    # Touched but not modified (e.g. opened in Obsidian)
+                    continue
+                changed[relative_path] = (Path(path), file_stat)
+            elif relative_path in known:
+                removed.add(relative_path)
+            else:
+                # A deleted or moved-away folder takes all its notes with it
+                prefix = relative_path + os.sep
+                removed.update(known_path for known_path in known if known_path.startswith(prefix))
+        
+        if rules_changed:
+            # Notes the new rules exclude are removed, notes they no longer exclude are added;
+            # notes that stay are not read again
+            found = walker.walk()
+            included = {str(file_path.relative_to(self.vault_path)): (file_path, file_stat)
+                        for file_path, file_stat in found["markdown"] + found["excalidraw"]}
+            removed.update(known_path for known_path, note_id in known.items()
+                           if known_path not in included and self.notes_metadata[note_id]["type"] != "missing")
+            for relative_path, entry in included.items():
+                if relative_path not in known:
+                    changed.setdefault(relative_path, entry)
+        removed.difference_update(changed)
+        
+        if not changed and not removed:
+            return self.get_stats()
+        
+        for relative_path in removed:
+            self._remove_note(known[relative_path])
+            if self.incremental:
+                self._manifest.pop(relative_path, None)
+                self.cache.delete(self._cache_key("record", relative_path))
+        
+        jobs = [self._make_parse_job(file_path, file_stat)
+                for _, (file_path, file_stat) in sorted(changed.items())]
+        updated = []
+        for record in self._parse_files(jobs):
+            note_id = record["note_id"]
+            if note_id in self.notes_metadata:
+                self._remove_note(note_id, replaced=True)
+            self._merge_record(record)
+            updated.append(note_id)
+            if self.incremental:
+                file_stat = changed[record["path"]][1]
+                self._manifest[record["path"]] = (file_stat.st_size, file_stat.st_mtime_ns,
+                                                  record["content_hash"], None)
+                self._manifest_updates[record["path"]] = record
+        
+        print(f"Updated {len(updated)} notes, removed {len(removed)} notes")
+        
+        # Merging and removing marked the metrics of these notes and their neighbours stale
+        if self.incremental:
+            self._save_manifest()
+        
+        return self.get_stats()
+    
+    def _make_parse_job(self, file_path: Path, stat: os.stat_result) -> ParseJob:
+        """Describe a file as a plain tuple that can be sent to a worker process"""
         relative_path = file_path.relative_to(self.vault_path)
-        note_id = str(relative_path.with_suffix(''))
+        return (str(file_path), str(relative_path), stat.st_size, stat.st_ctime, stat.st_mtime)
+    
+    def _parse_files(self, jobs: List[ParseJob]) -> Iterator[Dict]:
+        """Parse files serially or in a process pool, yielding records in job order"""
+        if not jobs:
+            return
         
-        # Get file stats
-        try:
-            stat = file_path.stat()
-        except OSError as e:
-            print(f"Error accessing file {file_path}: {e}")
+        reader = None
+        if self.read_concurrency > 0:
+            # Many reads in flight hide per-file latency on network and 9P mounts
+            reader = AsyncFileReader(self.read_concurrency)
+            contents = reader.read_all([job[0] for job in jobs])
+        else:
+            contents = itertools.repeat(None)
+        
+        if self.workers == 1 or len(jobs) < 2:
+            yield from self._report_throughput(lambda: map(parse_note, jobs, contents), jobs, reader)
             return
         
+        print(f"Parsing with {self.workers} worker processes...")
+        # Small chunks keep workers balanced
+        chunksize = max(1, min(64, len(jobs) // (self.workers * 4)))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield from self._report_throughput(
+                lambda: self._map_in_windows(executor, jobs, contents, chunksize), jobs, reader)
+    
+    def _map_in_windows(self, executor: ProcessPoolExecutor, jobs: List[ParseJob],
+                        contents: Iterator[Optional[bytes]], chunksize: int) -> Iterator[Dict]:
+        """
+        Parse chunks of jobs in the pool, yielding records in job order. Unlike executor.map, which
+        drains its inputs up front, only a few chunks per worker are submitted at a time, so the
+        reader's read-ahead window bounds how much file content is held
+        """
+        pending = deque()
+        batches = zip(jobs, contents)
+        while True:
+            while len(pending) < self.workers * 4:
+                batch = list(itertools.islice(batches, chunksize))
+                if not batch:
+                    break
+                pending.append(executor.submit(parse_notes, batch))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    
+    def _report_throughput(self, produce: Callable[[], Iterator[Dict]], jobs: List[ParseJob],
+                           reader: Optional[AsyncFileReader]) -> Iterator[Dict]:
+        """Pass records through and print files/s and MB/s of the read and parse stage"""
+        # Only time spent producing records counts, not the caller's work between them
+        start = time.perf_counter()
+        records = iter(produce())
+        busy = time.perf_counter() - start
+        while True:
+            start = time.perf_counter()
+            record = next(records, None)
+            busy += time.perf_counter() - start
+            if record is None:
+                break
+            yield record
+        
+        busy = max(busy, 1e-9)
+        total_mb = sum(job[2] for job in jobs) / (1024 * 1024)
+        print(f"Read and parsed {len(jobs)} files ({total_mb:.1f} MB) in {busy:.2f}s: "
+              f"{len(jobs) / busy:.0f} files/s, {total_mb / busy:.1f} MB/s")
+        if reader is not None:
+            print(f"Async reader {reader.throughput()}")
+    
+    def _process_file(self, file_path: Path, stat: Optional[os.stat_result] = None) -> None:
+        """Process a single file and extract metadata"""
+        # Get file stats unless the vault walker already has them
+        if stat is None:
+            # Skip if it's actually a directory
+            if file_path.is_dir():
+                print(f"Skipping directory: {file_path}")
+                return
+            
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                print(f"Error accessing file {file_path}: {e}")
+                return
+        
+        self._merge_record(parse_note(self._make_parse_job(file_path, stat)))
+    
+    def _merge_record(self, record: Dict, git_stats: Optional[Dict] = None) -> None:
+        """Add a parsed file record to the notes metadata and the graph"""
+        note_id = sys.intern(record["note_id"])
+        relative_path = record["path"]
+        self._rule_classifications.pop(note_id, None)
+        self._keyword_texts[note_id] = record.get("keyword_text")
+        # Indexed first, so links relative to the note's folder resolve; new aliases can take
+        # over links of other notes
+        affected = self._link_index.add(note_id, relative_path, record.get("aliases", ()))
+        affected.discard(note_id)
+        
         metadata = {
-            "path": str(relative_path),
-            "absolute_path": str(file_path),
-            "type": "excalidraw" if (str(file_path).endswith(".excalidraw.md") or file_path.suffix == ".excalidraw") else file_path.suffix[1:],  # Remove the dot
-            "size": stat.st_size,
-            "created": datetime.fromtimestamp(stat.st_ctime),
-            "modified": datetime.fromtimestamp(stat.st_mtime),
-            "links_out": [],
+            "path": relative_path,
+            "absolute_path": record["absolute_path"],
+            "type": record["type"],
+            "size": record["size"],
+            "created": datetime.fromtimestamp(record["created"]),
+            "modified": datetime.fromtimestamp(record["modified"]),
+            # Resolved to note ids; unresolved links keep their text without anchors
+            "links_out": self._link_index.set_links(note_id, record["links_out"]),
             "links_in": [],
-            "tags": [],
-            "images": [],
-            "word_count": 0,
-            "content_hash": self._get_file_hash(file_path),
-            "linked_content": {
-                "notes": [],
-                "images": [],
-                "pdfs": [],
-                "urls": [],
-                "files": []
-            }
+            "tags": record["tags"],
+            "images": record["images"],
+            "word_count": record["word_count"],
+            "content_hash": record["content_hash"],
+            "linked_content": record["linked_content"]
         }
         
-        # Parse content based on file type
-        if str(file_path).endswith(".excalidraw.md") or file_path.suffix == ".excalidraw":
-            self._parse_excalidraw(file_path, metadata)
-        elif file_path.suffix == ".md":
-            self._parse_markdown(file_path, metadata)
-        
-        # Add git history stats
-        if self.git_analyzer.is_git_repo:
-            git_details = self.git_analyzer.get_file_history_details(str(relative_path), use_cache=self.use_git_cache)
-            metadata["git_stats"] = git_details
-            metadata["commit_count"] = git_details.get("commit_count", 0)
+        # Git history stats from the record cache, otherwise looked up on first access
+        if git_stats is not None:
+            metadata["git_stats"] = git_stats
+            metadata["commit_count"] = git_stats.get("commit_count", 0)
+            self._invalidate("importance", [note_id])
         else:
             metadata["git_stats"] = {"commit_count": 0}
             metadata["commit_count"] = 0
+            self._invalidate("git", [note_id])
         
         # Add AI classification data
-        ai_classification = self.ai_classifications.get(str(relative_path), {})
+        ai_classification = self.ai_classifications.get(relative_path, {})
         metadata["ai_summary"] = ai_classification.get("ai_summary", "")
         metadata["ai_hashtags"] = ai_classification.get("ai_hashtags", [])
         metadata["ai_keywords"] = ai_classification.get("ai_keywords", [])
         
-        # Add to graph
-        self.graph.add_node(note_id, **metadata)
+        # The graph only holds ids and links; a placeholder for this note loses its attributes
+        self.graph.add_node(note_id)
+        self.graph.nodes[note_id].clear()
         
-        # Add edges for outgoing links
-        for link in metadata["links_out"]:
+        # Add edges for outgoing links; interned, so every edge to a note shares one id string
+        for link in map(sys.intern, metadata["links_out"]):
             # Only add edge if target exists or create placeholder
             if link not in self.graph:
                 # Add placeholder node for link target
@@ -290,209 +560,320 @@ class ObsidianAnalyzer:
             self.graph.add_edge(note_id, link)
         
         self.notes_metadata[note_id] = metadata
+        # Link targets gain incoming links; PageRank is global, but a new version with the
+        # same links leaves the graph as it was
+        if self._replaced_links.pop(note_id, None) != set(metadata["links_out"]):
+            self._invalidate("pagerank")
+        self._invalidate("orphans", [note_id, *metadata["links_out"]])
+        self._invalidate("keywords", [note_id])
+        self._relink(affected)
     
-    def _parse_markdown(self, file_path: Path, metadata: Dict) -> None:
-        """Parse markdown file for links, tags, and content"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+    def _index_notes(self, files: List[Tuple[Path, os.stat_result]]) -> None:
+        """Add notes the link index does not know yet; links that now resolve to them are updated"""
+        affected = set()
+        for file_path, _ in files:
+            relative_path = str(file_path.relative_to(self.vault_path))
+            note_id = sys.intern(note_id_for(relative_path))
+            if note_id not in self._link_index:
+                affected.update(self._link_index.add(note_id, relative_path))
+        self._relink(affected)
+    
+    def _relink(self, sources: Iterable[str]) -> None:
+        """Point the links of sources at what they resolve to now that notes came, went or were renamed"""
+        for source in sources:
+            metadata = self.notes_metadata.get(source)
+            if metadata is None:
+                continue
+            links_out = self._link_index.resolved_links(source)
+            if links_out == list(metadata["links_out"]):
+                continue
             
-            self._parse_markdown_content(content, metadata)
+            targets = set(links_out)
+            old_targets = [target for target in self.graph.successors(source) if target not in targets]
+            self.graph.remove_edges_from([(source, target) for target in old_targets])
+            for link in links_out:
+                if link not in self.graph:
+                    self.graph.add_node(link, path=link, type="missing",
+                                        importance_score=0.0, in_degree=0, out_degree=0)
+                self.graph.add_edge(source, link)
+            # Placeholders that nothing links to any more disappear
+            for target in old_targets:
+                if target not in self.notes_metadata and self.graph.in_degree(target) == 0:
+                    self.graph.remove_node(target)
             
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+            metadata["links_out"] = links_out
+            self.notes_metadata[source] = metadata
+            self._invalidate("pagerank")
+            self._invalidate("orphans", [source, *old_targets, *links_out])
+            self._invalidate("keywords", [source])
     
-    def _parse_excalidraw(self, file_path: Path, metadata: Dict) -> None:
-        """Parse excalidraw file for embedded markdown and links"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+    def _cache_key(self, kind: str, *parts: str) -> Tuple:
+        """Namespace cache entries by vault so several vaults can share a cache dir"""
+        return (kind, str(self.vault_path)) + parts
+    
+    def _scan_incremental(self, files: List[Tuple[Path, os.stat_result]]) -> None:
+        """Reparse only new or changed files and patch the graph in place"""
+        self._manifest = self.cache.get(self._cache_key("manifest"), {})
+        git_changed = self._get_git_changed_paths()
+        
+        walk_order = []
+        seen = set()
+        cached_entries = new_mapping(self._store, "cached_entries")
+        touched = {}
+        jobs = []
+        for file_path, file_stat in files:
+            relative_path = str(file_path.relative_to(self.vault_path))
+            walk_order.append(relative_path)
+            seen.add(relative_path)
             
-            # Check if this is a .excalidraw.md file (with frontmatter)
-            if str(file_path).endswith('.excalidraw.md'):
-                # Find the JSON data section (after the frontmatter and markers)
-                # Look for the JSON that starts with {"type":"excalidraw"
-                json_start = content.find('{"type":"excalidraw"')
-                if json_start != -1:
-                    # Find the end of the JSON (matching closing brace)
-                    # This is a simplified approach - for complex nested JSON, 
-                    # we'd need a proper parser
-                    brace_count = 0
-                    json_end = json_start
-                    for i in range(json_start, len(content)):
-                        if content[i] == '{':
-                            brace_count += 1
-                        elif content[i] == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                json_end = i + 1
-                                break
-                    
-                    json_content = content[json_start:json_end]
-                    data = json.loads(json_content)
+            entry = self._manifest.get(relative_path)
+            blob_id = getattr(file_stat, "blob_id", None)
+            if entry is not None and entry[:2] != (file_stat.st_size, file_stat.st_mtime_ns):
+                # Touched but identical content (checkout, sync tools) keeps its git blob id
+                if (blob_id is not None and len(entry) > 3 and entry[3] == blob_id
+                        and note_id_for(relative_path) not in self.notes_metadata):
+                    touched[relative_path] = file_stat
+                    entry = (file_stat.st_size, file_stat.st_mtime_ns) + tuple(entry[2:])
+                    self._manifest[relative_path] = entry
                 else:
-                    # No JSON found, just parse as markdown
-                    self._parse_markdown_content(content, metadata)
-                    return
-            else:
-                # Regular .excalidraw file - pure JSON
-                data = json.loads(content)
+                    entry = None
+            if entry is not None:
+                if note_id_for(relative_path) in self.notes_metadata:
+                    continue
+                cached = self.cache.get(self._cache_key("record", relative_path))
+                # Records cached before aliases were parsed are parsed again once
+                if cached is not None and "aliases" in cached["record"]:
+                    cached_entries[relative_path] = cached
+                    continue
             
-            # Look for text elements that might contain links
-            for element in data.get("elements", []):
-                if element.get("type") == "text" and element.get("text"):
-                    text = element["text"]
-                    
-                    # Extract wikilinks from text
-                    wikilinks = self.wikilink_pattern.findall(text)
-                    for link_match in wikilinks:
-                        link_target = link_match[0]
-                        metadata["links_out"].append(link_target)
+            jobs.append(self._make_parse_job(file_path, file_stat))
+            self._manifest[relative_path] = (file_stat.st_size, file_stat.st_mtime_ns, None, blob_id)
+        
+        # Drop notes whose files were deleted since the last run
+        deleted = [path for path in self._manifest if path not in seen]
+        for relative_path in deleted:
+            self._remove_note(note_id_for(relative_path))
+            self.cache.delete(self._cache_key("record", relative_path))
+            del self._manifest[relative_path]
+        
+        parsed = new_mapping(self._store, "parsed")
+        for record in self._parse_files(jobs):
+            parsed[record["path"]] = record
+        print(f"Incremental scan: {len(parsed)} changed, {len(deleted)} deleted, "
+              f"{len(walk_order) - len(parsed)} unchanged")
+        
+        # Merge in walk order so the result matches a full scan
+        for relative_path in walk_order:
+            note_id = note_id_for(relative_path)
+            refresh_git = git_changed is None or relative_path in git_changed
+            classification = None
             
-            # Count elements as "content"
-            metadata["word_count"] = len(data.get("elements", []))
+            if relative_path in parsed:
+                record = parsed[relative_path]
+                git_stats = None
+                size, mtime_ns, _, blob_id = self._manifest[relative_path]
+                self._manifest[relative_path] = (size, mtime_ns, record["content_hash"], blob_id)
+                self._manifest_updates[relative_path] = record
+            elif relative_path in cached_entries:
+                cached = cached_entries[relative_path]
+                record = cached["record"]
+                git_stats = None if refresh_git else cached.get("git_stats")
+                classification = cached.get("classification")
+                if relative_path in touched:
+                    file_stat = touched[relative_path]
+                    record = dict(record, created=file_stat.st_ctime, modified=file_stat.st_mtime)
+                    self._manifest_updates[relative_path] = record
+                elif refresh_git:
+                    self._manifest_updates.setdefault(relative_path, None)
+            else:
+                # Unchanged and already loaded; only new commits can change its git stats
+                if refresh_git and self.git_analyzer.is_git_repo:
+                    self._git_refresh.add(note_id)
+                    self._invalidate("git", [note_id])
+                continue
             
-        except Exception as e:
-            print(f"Error parsing excalidraw {file_path}: {e}")
-    
-    def _parse_markdown_content(self, content: str, metadata: Dict) -> None:
-        """Parse markdown content for links, tags, and other metadata"""
-        # Initialize comprehensive link data
-        metadata["linked_content"] = {
-            "notes": [],      # Internal note links
-            "images": [],     # Image links
-            "pdfs": [],       # PDF links
-            "urls": [],       # External URLs
-            "files": []       # Other file links
-        }
+            if note_id in self.notes_metadata:
+                self._remove_note(note_id, replaced=True)
+            self._merge_record(record, git_stats)
+            if classification is not None:
+                self._rule_classifications[note_id] = classification
+    
+    def _get_git_changed_paths(self) -> Optional[Set[str]]:
+        """Paths touched by commits since the last incremental run (None means all)"""
+        self._git_head = self.git_analyzer.get_head_commit()
+        if not self.git_analyzer.is_git_repo:
+            return set()
         
-        # Extract wikilinks (internal note links)
-        wikilinks = self.wikilink_pattern.findall(content)
-        for link_match in wikilinks:
-            link_target = link_match[0]
-            metadata["links_out"].append(link_target)
-            # Add to linked notes
-            if not any(ext in link_target.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.pdf']):
-                metadata["linked_content"]["notes"].append({
-                    "title": link_match[1] if link_match[1] else link_target,
-                    "path": link_target
-                })
+        previous_head = self.cache.get(self._cache_key("git_head"))
+        if self._git_head is None or previous_head is None:
+            return None
+        if self._git_head == previous_head:
+            return set()
+        return self.git_analyzer.get_changed_files(previous_head)
+    
+    def _remove_note(self, note_id: str, replaced: bool = False) -> None:
+        """
+        Remove a note and its outgoing edges, keeping a placeholder if still linked.
+        Unless a new version of the note replaces it, links to it are resolved again
+        """
+        if self.notes_metadata.pop(note_id, None) is None:
+            return
+        self._link_index.remove_links(note_id)
+        if not replaced:
+            affected = self._link_index.remove(note_id)
+            affected.discard(note_id)
+        else:
+            affected = ()
+        self._rule_classifications.pop(note_id, None)
+        self._keyword_texts.pop(note_id, None)
+        self.keyword_metadata.pop(note_id, None)
+        self.orphaned_notes.discard(note_id)
+        self._git_refresh.discard(note_id)
+        if replaced and note_id in self.graph:
+            # _merge_record tells whether the new version links elsewhere
+            self._replaced_links[note_id] = set(self.graph.successors(note_id))
+        else:
+            self._invalidate("pagerank")
         
-        # Extract tags
-        tags = self.tag_pattern.findall(content)
-        metadata["tags"] = list(set(tags))
-        
-        # Extract images (both wikilink and markdown style)
-        images = self.image_pattern.findall(content)
-        for img in images:
-            img_path = img[0] or img[2]
-            metadata["images"].append(img_path)
-            metadata["linked_content"]["images"].append({
-                "path": img_path,
-                "alt": img[1] if len(img) > 1 and img[1] else ""
-            })
-        
-        # Extract standard markdown links [text](url)
-        markdown_link_pattern = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
-        markdown_links = markdown_link_pattern.findall(content)
-        for link_text, link_url in markdown_links:
-            # Categorize the link
-            if link_url.startswith(('http://', 'https://', 'www.')):
-                metadata["linked_content"]["urls"].append({
-                    "text": link_text,
-                    "url": link_url
-                })
-            elif link_url.lower().endswith('.pdf'):
-                metadata["linked_content"]["pdfs"].append({
-                    "text": link_text,
-                    "path": link_url
-                })
-            elif any(link_url.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp']):
-                # Image link not captured by image pattern
-                if link_url not in [img["path"] for img in metadata["linked_content"]["images"]]:
-                    metadata["linked_content"]["images"].append({
-                        "path": link_url,
-                        "alt": link_text
-                    })
-            else:
-                # Other file types
-                metadata["linked_content"]["files"].append({
-                    "text": link_text,
-                    "path": link_url
-                })
+        if note_id not in self.graph:
+            self._relink(affected)
+            return
         
-        # Extract embedded PDFs ![[file.pdf]]
-        pdf_pattern = re.compile(r'!\[\[([^]]+\.pdf)\]\]', re.IGNORECASE)
-        pdfs = pdf_pattern.findall(content)
-        for pdf in pdfs:
-            if pdf not in [p["path"] for p in metadata["linked_content"]["pdfs"]]:
-                metadata["linked_content"]["pdfs"].append({
-                    "text": pdf.split('/')[-1],
-                    "path": pdf
-                })
+        targets = [target for target in self.graph.successors(note_id) if target != note_id]
+        # Targets lose an incoming link
+        self._invalidate("orphans", targets)
+        if any(source != note_id for source in self.graph.predecessors(note_id)):
+            # Other notes still link here, so it becomes a missing link target again
+            self.graph.remove_edges_from([(note_id, target) for target in self.graph.successors(note_id)])
+            attributes = self.graph.nodes[note_id]
+            attributes.clear()
+            attributes.update(path=note_id, type="missing",
+                              importance_score=0.0, in_degree=0, out_degree=0)
+        else:
+            self.graph.remove_node(note_id)
+        
+        # Placeholders that nothing links to any more disappear with the note
+        for target in targets:
+            if (target not in self.notes_metadata and target in self.graph
+                    and self.graph.in_degree(target) == 0):
+                self.graph.remove_node(target)
         
-        # Calculate word count
-        metadata["word_count"] = len(content.split())
+        self._relink(affected)
+        # Once its links went elsewhere, a deleted note is no placeholder either
+        if (note_id in self.graph and note_id not in self.notes_metadata
+                and self.graph.in_degree(note_id) == 0):
+            self.graph.remove_node(note_id)
     
-    def _get_file_hash(self, file_path: Path) -> str:
-        """Calculate file hash for change detection"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception as e:
-            print(f"Error hashing {file_path}: {e}")
-            return ""
+    def _save_manifest(self) -> None:
+        """Persist the per-file manifest and the records changed by this scan"""
+        for relative_path, record in self._manifest_updates.items():
+            note_id = note_id_for(relative_path)
+            metadata = self.notes_metadata.get(note_id)
+            if metadata is None:
+                continue
+            
+            key = self._cache_key("record", relative_path)
+            if record is not None:
+                # The keyword text is only needed until the note is classified
+                entry = {"record": {k: v for k, v in record.items() if k != "keyword_text"}}
+            else:
+                entry = self.cache.get(key)
+            if entry is None:
+                continue
+            # Not yet looked up: the next run looks it up again
+            entry["git_stats"] = None if self._is_stale("git", note_id) else metadata.get("git_stats")
+            entry["classification"] = self._rule_classifications.get(note_id)
+            self.cache.set(key, entry)
+        
+        self.cache.set(self._cache_key("manifest"), self._manifest)
+        if self._directories is not None:
+            self.cache.set(self._cache_key("directories"), self._directories)
+        self.cache.set(self._cache_key("git_head"), self._git_head)
+        print(f"Updated manifest entries for {len(self._manifest_updates)} files")
+        self._manifest_updates.clear()
     
-    def _calculate_importance_scores(self) -> None:
-        """Calculate importance scores for all notes"""
-        # Calculate PageRank
-        try:
-            pagerank = nx.pagerank(self.graph)
-        except:
-            pagerank = {node: 0.0 for node in self.graph.nodes()}
+    def _load_git_stats(self, note_ids: Optional[Iterable[str]] = None) -> None:
+        """Look up the git history of each note (or just note_ids)"""
+        for note_id, metadata in self._notes_for(note_ids):
+            if self.git_analyzer.is_git_repo:
+                use_cache = self.use_git_cache and note_id not in self._git_refresh
+                metadata["git_stats"] = self.git_analyzer.get_file_history_details(metadata["path"],
+                                                                                   use_cache=use_cache)
+            else:
+                metadata["git_stats"] = {"commit_count": 0}
+            metadata["commit_count"] = metadata["git_stats"].get("commit_count", 0)
+            self.notes_metadata[note_id] = metadata
+            self._git_refresh.discard(note_id)
+            if self.incremental:
+                self._manifest_updates.setdefault(metadata["path"], None)
+    
+    def _calculate_pagerank(self, note_ids: Optional[Iterable[str]] = None) -> None:
+        """PageRank and degrees of the whole link graph; any change to the graph changes every score"""
+        previous = self._sparse_graph
+        self._sparse_graph = SparseGraph.from_networkx(self.graph)
+        start = None
+        if previous is not None and self._pagerank is not None:
+            # After an update the old scores are close to the new ones, so few iterations are needed
+            start = self._sparse_graph.carry_over(previous.nodes, self._pagerank)
+        self._pagerank, report = self._sparse_graph.pagerank(start=start)
+        self.pagerank_report = report
+        if report["converged"]:
+            print(f"PageRank converged after {report['iterations']} iterations "
+                  f"({'warm' if report['warm_start'] else 'uniform'} start, residual {report['residual']:.2e}, "
+                  f"tolerance {report['tolerance']:.2e})")
+        else:
+            # The scores of the last iteration are used, but they are not final
+            print(f"Warning: PageRank did not converge in {report['iterations']} iterations "
+                  f"(residual {report['residual']:.2e}, tolerance {report['tolerance']:.2e}); "
+                  f"importance scores are approximate")
+    
+    def _calculate_importance_scores(self, note_ids: Optional[Iterable[str]] = None) -> None:
+        """Feature rows of all notes (or just note_ids), scored with one product by the weights"""
+        graph = self._sparse_graph
+        if note_ids is None or self.importance_features is None or len(self.importance_features) != len(graph.nodes):
+            # A new graph means new PageRank for every note; rows of missing link targets stay zero
+            self.importance_features = np.zeros((len(graph.nodes), len(FEATURES)))
+            note_ids = None
+        notes = list(self._notes_for(note_ids))
+        if not notes:
+            return
         
-        # Calculate importance for each note
-        for note_id, metadata in self.notes_metadata.items():
-            # Get graph metrics
-            in_degree = self.graph.in_degree(note_id)
-            out_degree = self.graph.out_degree(note_id)
-            pagerank_score = pagerank.get(note_id, 0.0)
-            
-            # Content richness score
-            content_richness = (
-                metadata["word_count"] / 1000.0 +  # Normalize word count
-                len(metadata["images"]) * 0.5 +     # Images add value
-                len(metadata["tags"]) * 0.2         # Tags indicate organization
-            )
-            
-            # Git activity score
-            commit_count = metadata.get("commit_count", 0)
-            git_score = self.git_analyzer.calculate_git_importance_score(commit_count)
-            
-            # Calculate composite importance score
-            importance_score = (
-                0.30 * git_score * 10 +            # Git activity (scaled) - MOST IMPORTANT
-                0.20 * pagerank_score * 100 +       # PageRank (scaled)
-                0.15 * in_degree +                  # Incoming links
-                0.15 * out_degree +                 # Outgoing links
-                0.10 * min(content_richness, 10) + # Content (capped)
-                0.10 * 1.0                         # Base score
-            )
-            
-            metadata["importance_score"] = importance_score
-            metadata["in_degree"] = in_degree
-            metadata["out_degree"] = out_degree
+        # Every note is a node of the graph
+        rows = np.fromiter((graph.index[note_id] for note_id, _ in notes), dtype=np.int64, count=len(notes))
+        features = feature_matrix([metadata.get("commit_count", 0) for _, metadata in notes], self._pagerank[rows],
+                                  graph.in_degree[rows], graph.out_degree[rows],
+                                  [metadata["word_count"] for _, metadata in notes],
+                                  [len(metadata["images"]) for _, metadata in notes],
+                                  [len(metadata["tags"]) for _, metadata in notes])
+        self.importance_features[rows] = features
+        scores = importance_scores(features, self.importance_weights)
+        
+        for (note_id, metadata), score, (git_score, pagerank_score, in_degree, out_degree, _) in zip(
+                notes, scores.tolist(), features.tolist()):
+            metadata["importance_score"] = score
+            metadata["in_degree"] = int(in_degree)
+            metadata["out_degree"] = int(out_degree)
             metadata["pagerank"] = pagerank_score
             metadata["git_score"] = git_score
+            # Assigning back lets a disk-backed store write the record once
+            self.notes_metadata[note_id] = metadata
     
-    def _identify_orphans(self) -> None:
-        """Identify notes without any connections"""
-        for note_id, metadata in self.notes_metadata.items():
+    def _identify_orphans(self, note_ids: Optional[Iterable[str]] = None) -> None:
+        """Identify notes without any connections (only re-check note_ids if given)"""
+        if note_ids is None:
+            self.orphaned_notes = set()
+            note_ids = self.notes_metadata
+        for note_id in note_ids:
+            metadata = self.notes_metadata.get(note_id)
             # Check if this is an actual file (not a missing link target)
-            if metadata.get("type") != "missing":
-                if (self.graph.in_degree(note_id) == 0 and 
-                    self.graph.out_degree(note_id) == 0):
-                    self.orphaned_notes.add(note_id)
+            if metadata is None or metadata.get("type") == "missing":
+                self.orphaned_notes.discard(note_id)
+                continue
+            if (self.graph.in_degree(note_id) == 0 and 
+                self.graph.out_degree(note_id) == 0):
+                self.orphaned_notes.add(note_id)
+            else:
+                self.orphaned_notes.discard(note_id)
     
     def _is_valid_word(self, word: str) -> bool:
         """Check if a word is valid (not hex codes, etc.)"""
@@ -520,108 +901,27 @@ class ObsidianAnalyzer:
         
         return True
     
-    def _extract_keywords_and_classify(self) -> None:
-        """Extract keywords from each note and classify with hashtags"""
+    def _extract_keywords_and_classify(self, note_ids: Optional[Iterable[str]] = None) -> None:
+        """Extract keywords from each note (or just note_ids) and classify with hashtags"""
         print("Extracting keywords and classifying notes...")
         
-        total_notes = len(self.notes_metadata)
+        notes = self._notes_for(note_ids)
+        total_notes = len(notes)
         processed = 0
         
-        for note_id, metadata in self.notes_metadata.items():
+        for note_id, metadata in notes:
             if metadata.get("type") == "missing":
                 continue
                 
-            # Combine content from various sources
-            text_parts = []
-            
-            # Add filename (without extension)
-            filename = Path(metadata["path"]).stem
-            text_parts.append(filename.replace("-", " ").replace("_", " "))
-            
-            # Add existing tags
-            text_parts.extend(metadata.get("tags", []))
-            
-            # Add linked note names
-            for link in metadata.get("links_out", []):
-                text_parts.append(link.replace("-", " ").replace("_", " "))
-            
-            # Read file content for keyword extraction (limit to first 3000 chars for better context)
-            try:
-                with open(metadata["absolute_path"], 'r', encoding='utf-8') as f:
-                    content = f.read(3000)
-                    # Remove code blocks and special characters
-                    content = re.sub(r'```[^`]*```', '', content)  # Remove code blocks
-                    content = re.sub(r'`[^`]+`', '', content)      # Remove inline code
-                    content = re.sub(r'https?://\S+', '', content)  # Remove URLs
-                    text_parts.append(content)
-            except Exception:
-                pass
-            
-            # Combine all text
-            full_text = " ".join(text_parts)
-            
-            # Extract keywords using RAKE with filtering
-            keywords = []
-            if full_text.strip():
-                try:
-                    # Clean text for RAKE
-                    clean_text = re.sub(r'[^\w\s]', ' ', full_text)
-                    clean_text = ' '.join(word for word in clean_text.split() if self._is_valid_word(word))
-                    
-                    self.rake.extract_keywords_from_text(clean_text)
-                    keyword_scores = self.rake.get_ranked_phrases_with_scores()
-                    
-                    # Filter and get top keywords
-                    valid_keywords = []
-                    for score, phrase in keyword_scores:
-                        # Check if phrase contains valid words
-                        words = phrase.split()
-                        if all(self._is_valid_word(w) for w in words):
-                            valid_keywords.append(phrase)
-                        if len(valid_keywords) >= 15:  # Limit to 15 keywords
-                            break
-                    
-                    keywords = valid_keywords
-                except Exception as e:
-                    print(f"Error extracting keywords from {note_id}: {e}")
-            
-            # Enhanced hashtag classification with weighted scoring
-            hashtag_scores = {}
-            full_text_lower = full_text.lower()
-            words_in_text = set(full_text_lower.split())
-            
-            for hashtag, category_data in self.hashtag_categories.items():
-                score = 0
-                matched_keywords = []
-                
-                # Check each category keyword
-                for keyword in category_data["keywords"]:
-                    # Direct match
-                    if keyword in full_text_lower:
-                        score += 2.0
-                        matched_keywords.append(keyword)
-                    # Word match
-                    elif keyword in words_in_text:
-                        score += 1.5
-                        matched_keywords.append(keyword)
-                    # Stem match
-                    else:
-                        keyword_stem = self.stemmer.stem(keyword)
-                        for word in words_in_text:
-                            if self.stemmer.stem(word) == keyword_stem:
-                                score += 1.0
-                                matched_keywords.append(f"{word}→{keyword}")
-                                break
-                
-                # Apply weight and threshold
-                if score > 0:
-                    weighted_score = score * category_data["weight"]
-                    if weighted_score >= 2.0:  # Threshold for classification
-                        hashtag_scores[hashtag] = (weighted_score, matched_keywords)
-            
-            # Select hashtags with highest scores (max 5)
-            selected_hashtags = sorted(hashtag_scores.items(), key=lambda x: x[1][0], reverse=True)[:5]
-            hashtags = [tag for tag, _ in selected_hashtags]
+            # Rule-based classification only depends on the note itself
+            classification = self._rule_classifications.get(note_id)
+            if classification is None:
+                classification = self._classify_note(note_id, metadata)
+                self._rule_classifications[note_id] = classification
+                if self.incremental:
+                    self._manifest_updates.setdefault(metadata["path"], None)
+            keywords, hashtags = classification
+            self._keyword_texts.pop(note_id, None)
             
             # Check for AI classifications
             relative_path = metadata["path"]
@@ -643,18 +943,148 @@ class ObsidianAnalyzer:
             metadata["keywords"] = combined_keywords
             metadata["auto_hashtags"] = combined_hashtags
             metadata["ai_summary"] = ai_data.get("ai_summary", "")
+            self.notes_metadata[note_id] = metadata
             
             # Progress update
             processed += 1
             if processed % 100 == 0:
                 print(f"  Processed {processed}/{total_notes} notes...")
+        
+        self._save_keyword_metadata()
+    
+    def _classify_note(self, note_id: str, metadata: Dict) -> Tuple[List[str], List[str]]:
+        """Extract RAKE keywords and rule-based hashtags for a single note"""
+        # Combine content from various sources
+        text_parts = []
+        
+        # Add filename (without extension)
+        filename = Path(metadata["path"]).stem
+        text_parts.append(filename.replace("-", " ").replace("_", " "))
+        
+        # Add existing tags
+        text_parts.extend(metadata.get("tags", []))
+        
+        # Add linked note names; links are resolved to note ids, so without their folders
+        for link in metadata.get("links_out", []):
+            text_parts.append(link.rsplit("/", 1)[-1].replace("-", " ").replace("_", " "))
+        
+        # Note content kept from the parse stage (first 3000 chars for better context)
+        content = self._keyword_texts.get(note_id)
+        if content is None:
+            content = self._read_keyword_text(metadata["absolute_path"])
+        if content:
+            # Remove code blocks and special characters
+            content = re.sub(r'```[^`]*```', '', content)  # Remove code blocks
+            content = re.sub(r'`[^`]+`', '', content)      # Remove inline code
+            content = re.sub(r'https?://\S+', '', content)  # Remove URLs
+            text_parts.append(content)
+        
+        # Combine all text
+        full_text = " ".join(text_parts)
+        
+        # Extract keywords using RAKE with filtering
+        keywords = []
+        rake = self._get_rake()
+        if full_text.strip() and rake is not None:
+            try:
+                # Clean text for RAKE
+                clean_text = re.sub(r'[^\w\s]', ' ', full_text)
+                clean_text = ' '.join(word for word in clean_text.split() if self._is_valid_word(word))
+                
+                rake.extract_keywords_from_text(clean_text)
+                keyword_scores = rake.get_ranked_phrases_with_scores()
+                
+                # Filter and get top keywords
+                valid_keywords = []
+                for score, phrase in keyword_scores:
+                    # Check if phrase contains valid words
+                    words = phrase.split()
+                    if all(self._is_valid_word(w) for w in words):
+                        valid_keywords.append(phrase)
+                    if len(valid_keywords) >= 15:  # Limit to 15 keywords
+                        break
+                
+                keywords = valid_keywords
+            except Exception as e:
+                print(f"Error extracting keywords from {note_id}: {e}")
+        
+        # Enhanced hashtag classification with weighted scoring
+        hashtag_scores = {}
+        full_text_lower = full_text.lower()
+        words_in_text = set(full_text_lower.split())
+        
+        # Stem every word once; the first word seen per stem is reported as the match
+        stemmed_words = {}
+        for word in words_in_text:
+            stemmed_words.setdefault(self._stem(word), word)
+        
+        for hashtag, category_data in self.hashtag_categories.items():
+            score = 0
+            matched_keywords = []
+            
+            # Check each category keyword
+            for keyword in category_data["keywords"]:
+                # Direct match
+                if keyword in full_text_lower:
+                    score += 2.0
+                    matched_keywords.append(keyword)
+                # Word match
+                elif keyword in words_in_text:
+                    score += 1.5
+                    matched_keywords.append(keyword)
+                # Stem match
+                else:
+                    word = stemmed_words.get(self._stem(keyword))
+                    if word is not None:
+                        score += 1.0
+                        matched_keywords.append(f"{word}→{keyword}")
+            
+            # Apply weight and threshold
+            if score > 0:
+                weighted_score = score * category_data["weight"]
+                if weighted_score >= 2.0:  # Threshold for classification
+                    hashtag_scores[hashtag] = (weighted_score, matched_keywords)
+        
+        # Select hashtags with highest scores (max 5)
+        selected_hashtags = sorted(hashtag_scores.items(), key=lambda x: x[1][0], reverse=True)[:5]
+        hashtags = [tag for tag, _ in selected_hashtags]
+        
+        return keywords, hashtags
+    
+    def _get_rake(self):
+        """RAKE extractor, or None if nltk has no stopword list (it is never downloaded here)"""
+        if self.rake is None:
+            from rake_nltk import Rake
+            try:
+                self.rake = Rake(max_length=3, min_length=1)
+            except LookupError:
+                print("Warning: nltk stopwords not installed, skipping RAKE keywords "
+                      "(python -m nltk.downloader stopwords punkt_tab)")
+                self.rake = False
+        return self.rake or None
+    
+    def _stem(self, word: str) -> str:
+        """Porter stem of a word, memoized across notes"""
+        stem = self._stems.get(word)
+        if stem is None:
+            if self.stemmer is None:
+                from nltk.stem import PorterStemmer
+                self.stemmer = PorterStemmer()
+            stem = self._stems[word] = self.stemmer.stem(word)
+        return stem
+    
+    def _read_keyword_text(self, file_path: str) -> Optional[str]:
+        """Fallback for notes whose parse record carries no text (e.g. older cache entries)"""
+        text = read_note_text(file_path)
+        return text[:KEYWORD_TEXT_LENGTH] if text is not None else None
     
     def _save_keyword_metadata(self) -> None:
         """Save keyword metadata to persistent file"""
         metadata_file = self.vault_path.parent / "keyword_metadata.pkl"
         try:
             with open(metadata_file, 'wb') as f:
-                pickle.dump(self.keyword_metadata, f)
+                # The file format is a plain dict, also in streaming mode
+                pickle.dump(dict(self.keyword_metadata), f)
             print(f"Saved keyword metadata to {metadata_file}")
         except Exception as e:
             print(f"Error saving keyword metadata: {e}")
@@ -692,57 +1122,70 @@ class ObsidianAnalyzer:
     
     def get_timeline_data(self) -> Dict:
         """Get data for timeline visualizations"""
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame.from_dict(self.notes_metadata, orient='index')
-        
-        # Sort by dates
-        created_timeline = df[['created', 'path', 'type', 'importance_score']].sort_values('created')
-        modified_timeline = df[['modified', 'path', 'type', 'importance_score']].sort_values('modified')
-        
         return {
-            "created": created_timeline.to_dict('records'),
-            "modified": modified_timeline.to_dict('records')
+            "created": list(self.iter_timeline("created")),
+            "modified": list(self.iter_timeline("modified"))
         }
     
+    def iter_timeline(self, field: str) -> Iterator[Dict]:
+        """Yield (field, path, type, importance) records sorted by the created or modified date"""
+        self.compute("importance")
+        table = self.notes_metadata
+        dates = table.columns[field]
+        importance = table.columns["importance_score"]
+        # Sorted on the int64 epoch column; sorted() is stable, so ties stay in insertion order
+        for row in sorted(table.live_rows(), key=dates.__getitem__):
+            yield {
+                field: epoch_us_to_datetime(dates[row]),
+                "path": table.paths[row],
+                "type": table.type_of(row),
+                "importance_score": importance[row]
+            }
+    
     def get_important_notes(self, top_n: int = 20) -> List[Dict]:
         """Get the most important notes"""
-        sorted_notes = sorted(
-            self.notes_metadata.items(),
-            key=lambda x: x[1]["importance_score"],
-            reverse=True
-        )
+        self.compute("importance")
+        table = self.notes_metadata
+        # nlargest keeps only top_n rows and orders ties like a stable sort
+        top_rows = heapq.nlargest(top_n, table.live_rows(),
+                                  key=table.columns["importance_score"].__getitem__)
         
         return [
             {
-                "id": note_id,
-                **metadata
+                "id": table.ids[row],
+                **table[table.ids[row]].to_dict()
             }
-            for note_id, metadata in sorted_notes[:top_n]
+            for row in top_rows
         ]
     
     def get_orphaned_notes(self) -> List[Dict]:
         """Get all orphaned notes"""
-        return [
-            {
+        return list(self.iter_orphaned_notes())
+    
+    def iter_orphaned_notes(self) -> Iterator[Dict]:
+        """Yield orphaned notes one at a time"""
+        self.compute("orphans")
+        for note_id in self.orphaned_notes:
+            yield {
                 "id": note_id,
-                **self.notes_metadata[note_id]
+                **self.notes_metadata[note_id].to_dict()
             }
-            for note_id in self.orphaned_notes
-        ]
     
     def get_notes_by_hashtag(self, hashtag: str) -> List[Dict]:
         """Get all notes with a specific hashtag"""
+        self.compute("keywords", "importance")
         notes = []
         for note_id, metadata in self.notes_metadata.items():
             if metadata.get("type") != "missing" and hashtag in metadata.get("auto_hashtags", []):
                 notes.append({
                     "id": note_id,
-                    **metadata
+                    **metadata.to_dict()
                 })
         return sorted(notes, key=lambda x: x.get("importance_score", 0), reverse=True)
     
     def get_all_hashtags(self) -> List[Dict]:
         """Get all unique hashtags with counts"""
+        self.compute("keywords")
         hashtag_counts = Counter()
         for metadata in self.notes_metadata.values():
             if metadata.get("type") != "missing":
@@ -754,30 +1197,44 @@ class ObsidianAnalyzer:
     
     def export_graph_data(self) -> Dict:
         """Export graph data for visualization"""
-        nodes = []
-        edges = []
-        
+        return {"nodes": list(self.iter_graph_nodes()), "edges": list(self.iter_graph_edges())}
+    
+    def iter_graph_nodes(self) -> Iterator[Dict]:
+        """Yield vis.js nodes for notes and missing link targets"""
+        self.compute("importance")
+        table = self.notes_metadata
+        importance_column = table.columns["importance_score"]
         for node_id, data in self.graph.nodes(data=True):
-            # Skip nodes without proper data (might be link targets without files)
-            if "path" not in data:
+            # Notes are read from the note table, link placeholders from their node attributes
+            row = table.row_of(node_id)
+            if row is not None:
+                path, group, importance = table.paths[row], table.type_of(row), importance_column[row]
+            elif "path" in data:
+                path, group, importance = data["path"], data.get("type", "unknown"), data.get("importance_score", 0.0)
+            else:
+                # Skip nodes without proper data (might be link targets without files)
                 continue
-                
-            importance = data.get("importance_score", 0.0)
-            nodes.append({
+            
+            yield {
                 "id": node_id,
-                "label": Path(data["path"]).stem if "path" in data else node_id,
-                "title": f"{data.get('path', node_id)}\nImportance: {importance:.2f}",
+                "label": Path(path).stem,
+                "title": f"{path}\nImportance: {importance:.2f}",
                 "value": importance,
-                "group": data.get("type", "unknown")
-            })
-        
+                "group": group
+            }
+    
+    def iter_graph_edges(self) -> Iterator[Dict]:
+        """Yield vis.js edges for all links"""
         for source, target in self.graph.edges():
-            edges.append({
+            yield {
                 "from": source,
                 "to": target
-            })
-        
-        return {"nodes": nodes, "edges": edges}
+            }
+    
+    def close(self) -> None:
+        """Remove the on-disk store of streaming mode"""
+        if self._store is not None:
+            self._store.close()
 
 
 def main():
@@ -803,31 +1260,16 @@ def main():
         print(f"  - {note['path']} (score: {note['importance_score']:.2f})")
     
     # Get orphaned notes
-    orphaned = analyzer.get_orphaned_notes()
-    print(f"\nOrphaned Notes ({len(orphaned)} total):")
-    for note in orphaned[:10]:  # Show first 10
+    print(f"\nOrphaned Notes ({len(analyzer.orphaned_notes)} total):")
+    for note in itertools.islice(analyzer.iter_orphaned_notes(), 10):  # Show first 10
         print(f"  - {note['path']}")
     
-    # Export data for dashboard
-    timeline_data = analyzer.get_timeline_data()
-    graph_data = analyzer.export_graph_data()
-    hashtags = analyzer.get_all_hashtags()
-    
-    # Save data for dashboard
-    output_data = {
-        "stats": stats,
-        "important_notes": important_notes,
-        "orphaned_notes": orphaned,
-        "timeline": timeline_data,
-        "graph": graph_data,
-        "hashtags": hashtags,
-        "notes_metadata": analyzer.notes_metadata
-    }
-    
-    with open("vault_analysis.json", "w") as f:
-        json.dump(output_data, f, default=str, indent=2)
-    
-    print("\nAnalysis complete! Data saved to vault_analysis.json")
+    # Save data for dashboard and scripts; every note row is upserted (scores move with the graph),
+    # but link, tag and image rows are only rewritten for notes whose lists changed
+    with AnalysisStore("vault_analysis.db") as store:
+        store.save_analysis(analyzer, stats)
+    
+    print("\nAnalysis complete! Data saved to vault_analysis.db")
 
 
 if __name__ == "__main__":
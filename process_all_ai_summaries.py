@@ -2,9 +2,12 @@
 """Process all AI summaries and update vault analysis"""
 import json
 import os
+import sys
 from pathlib import Path
 
-def save_summaries(summaries_file):
+from analysis_store import AnalysisStore
+
+def save_summaries(store, summaries_file):
     """Save AI summaries to vault analysis"""
     # Load summaries
     with open(summaries_file, 'r') as f:
@@ -12,31 +15,26 @@ def save_summaries(summaries_file):
     
     summaries = data.get('summaries', [])
     
-    # Load vault analysis
-    with open('vault_analysis.json', 'r') as f:
-        vault_data = json.load(f)
-    
-    notes_metadata = vault_data.get('notes_metadata', {})
-    
     # Update each note with AI summary
     updated_count = 0
     for summary in summaries:
         note_id = summary['note_id']
-        if note_id in notes_metadata:
-            notes_metadata[note_id]['ai_summary'] = summary['ai_summary']
-            notes_metadata[note_id]['ai_hashtags'] = summary['ai_hashtags']
-            notes_metadata[note_id]['ai_keywords'] = summary['ai_keywords']
+        if store.get_note(note_id) is not None:
+            store.set_ai(note_id, summary['ai_summary'], summary['ai_hashtags'], summary['ai_keywords'])
             updated_count += 1
     
-    # Save updated vault analysis
-    with open('vault_analysis.json', 'w') as f:
-        json.dump(vault_data, f, indent=2)
+    # Save updated vault analysis; only the AI rows of these notes were rewritten
+    store.commit()
     
     print(f"Updated {updated_count} notes with AI summaries from {summaries_file}")
     return updated_count
 
 def main():
     """Process all batch summary files"""
+    if not Path('vault_analysis.db').exists():
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
+        sys.exit(1)
+    store = AnalysisStore('vault_analysis.db')
     total_updated = 0
     
     # Process all batch files
@@ -46,28 +44,24 @@ def main():
         print("No batch summary files found. Looking for individual files...")
         # Try batch_1_summaries.json format
         if os.path.exists('batch_1_summaries.json'):
-            total_updated += save_summaries('batch_1_summaries.json')
+            total_updated += save_summaries(store, 'batch_1_summaries.json')
     else:
         for batch_file in batch_files:
             if os.path.exists(batch_file):
-                total_updated += save_summaries(batch_file)
+                total_updated += save_summaries(store, batch_file)
     
     print(f"\nTotal notes updated: {total_updated}")
     
     # Update remaining notes list
     if os.path.exists('remaining_notes.json'):
-        with open('vault_analysis.json', 'r') as f:
-            vault_data = json.load(f)
-        
-        notes_metadata = vault_data.get('notes_metadata', {})
-        
         # Find notes without AI summaries in 800_Ressources
         remaining = []
-        for note_id, metadata in notes_metadata.items():
-            if '800_Ressources' in note_id and not metadata.get('ai_summary'):
+        for path in store.get_paths_without_summary():
+            note_id = store.note_id_for_path(path)
+            if '800_Ressources' in note_id:
                 remaining.append({
                     'note_id': note_id,
-                    'path': metadata.get('path', '')
+                    'path': path
                 })
         
         # Save updated remaining notes
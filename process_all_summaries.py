@@ -10,35 +10,28 @@ import time
 from pathlib import Path
 from datetime import datetime
 
+from analysis_store import AnalysisStore
+
 def load_vault_data():
-    """Load the vault analysis data"""
-    with open("vault_analysis.json", "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Open the vault analysis store"""
+    if not Path("vault_analysis.db").exists():
+        print("Error: vault_analysis.db not found. Please run the analyzer first.")
+        sys.exit(1)
+    return AnalysisStore("vault_analysis.db")
 
-def save_vault_data(vault_data):
-    """Save the vault analysis data"""
-    with open("vault_analysis.json", "w", encoding="utf-8") as f:
-        json.dump(vault_data, f, indent=2, ensure_ascii=False)
+def save_vault_data(store):
+    """Commit the AI rows written so far"""
+    store.commit()
 
-def get_all_unprocessed_notes(vault_data, folder_filter="800_Ressources"):
+def get_all_unprocessed_notes(store, folder_filter="800_Ressources"):
     """Get all notes that need AI summaries"""
     unprocessed = []
     
-    for note_id, metadata in vault_data["notes_metadata"].items():
-        path = metadata.get("path", "")
-        
-        # Filter by folder
-        if not path.startswith(folder_filter):
-            continue
-        
-        # Skip if already has AI summary
-        if metadata.get("ai_summary"):
-            continue
-            
+    # Notes in the folder that have no AI summary yet
+    for path in store.get_paths_without_summary(folder_filter):
         unprocessed.append({
-            "note_id": note_id,
-            "path": path,
-            "metadata": metadata
+            "note_id": store.note_id_for_path(path),
+            "path": path
         })
     
     # Sort by path for better organization
@@ -46,32 +39,31 @@ def get_all_unprocessed_notes(vault_data, folder_filter="800_Ressources"):
     
     return unprocessed
 
-def generate_progress_report(vault_data, folder_filter="800_Ressources"):
+def generate_progress_report(store, folder_filter="800_Ressources"):
     """Generate a progress report"""
     total = 0
     completed = 0
     by_folder = {}
     
-    for note_id, metadata in vault_data["notes_metadata"].items():
+    for note_id, metadata in store.iter_notes("substr(notes.path, 1, length(?)) = ?", (folder_filter, folder_filter)):
         path = metadata.get("path", "")
-        if path.startswith(folder_filter):
-            total += 1
-            
-            # Extract subfolder
-            parts = path.split("/")
-            if len(parts) > 1:
-                subfolder = parts[1]
-            else:
-                subfolder = "root"
-            
-            if subfolder not in by_folder:
-                by_folder[subfolder] = {"total": 0, "completed": 0}
-            
-            by_folder[subfolder]["total"] += 1
-            
-            if metadata.get("ai_summary"):
-                completed += 1
-                by_folder[subfolder]["completed"] += 1
+        total += 1
+        
+        # Extract subfolder
+        parts = path.split("/")
+        if len(parts) > 1:
+            subfolder = parts[1]
+        else:
+            subfolder = "root"
+        
+        if subfolder not in by_folder:
+            by_folder[subfolder] = {"total": 0, "completed": 0}
+        
+        by_folder[subfolder]["total"] += 1
+        
+        if metadata.get("ai_summary"):
+            completed += 1
+            by_folder[subfolder]["completed"] += 1
     
     return {
         "total": total,
@@ -129,18 +121,17 @@ def save_batch_prompt(prompt, batch_num):
         f.write(prompt)
     return filename
 
-def process_batch_response(json_response, vault_data):
-    """Process a batch response and update vault data"""
+def process_batch_response(json_response, store):
+    """Process a batch response and update the AI rows of the store"""
     try:
         response_data = json.loads(json_response)
         updated = 0
         
         for summary in response_data.get("summaries", []):
             note_id = summary.get("note_id")
-            if note_id and note_id in vault_data["notes_metadata"]:
-                vault_data["notes_metadata"][note_id]["ai_summary"] = summary.get("ai_summary", "")
-                vault_data["notes_metadata"][note_id]["ai_hashtags"] = summary.get("ai_hashtags", [])
-                vault_data["notes_metadata"][note_id]["ai_keywords"] = summary.get("ai_keywords", [])
+            if note_id and store.get_note(note_id) is not None:
+                store.set_ai(note_id, summary.get("ai_summary", ""), summary.get("ai_hashtags", []),
+                             summary.get("ai_keywords", []))
                 updated += 1
         
         return updated
@@ -159,10 +150,10 @@ def main():
     
     # Load vault data
     print("Loading vault data...")
-    vault_data = load_vault_data()
+    store = load_vault_data()
     
     # Generate initial progress report
-    progress = generate_progress_report(vault_data)
+    progress = generate_progress_report(store)
     print(f"\nInitial Status:")
     print(f"  Total notes: {progress['total']}")
     print(f"  Completed: {progress['completed']} ({progress['completed']/progress['total']*100:.1f}%)")
@@ -174,7 +165,7 @@ def main():
         print(f"  {folder}: {stats['completed']}/{stats['total']} ({pct:.1f}%)")
     
     # Get unprocessed notes
-    unprocessed = get_all_unprocessed_notes(vault_data)
+    unprocessed = get_all_unprocessed_notes(store)
     
     if not unprocessed:
         print("\nAll notes have been processed!")
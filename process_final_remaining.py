@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Process all truly remaining notes that don't have AI summaries yet"""
-import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Load vault data
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 vault_path = Path("/mnt/c/Users/hess/OneDrive/Dokumente/MyVault")
 
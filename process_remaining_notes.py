@@ -3,9 +3,10 @@
 import json
 from pathlib import Path
 
+from analysis_export import load_json_export
+
 # Load vault data
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 # Find vault path
 vault_path = Path("/mnt/c/Users/hess/OneDrive/Dokumente/MyVault")
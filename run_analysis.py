@@ -16,6 +16,35 @@ def install_requirements():
     subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
 
 
+def save_analysis(analyzer, stats: dict, output_file: str = "vault_analysis.db",
+                  json_file: str = None, export_file: str = None) -> None:
+    """Upsert the analysis into the SQLite store; readers keep seeing the previous revision until it commits"""
+    from analysis_store import AnalysisStore
+    from analysis_export import write_export
+    from columnar_export import write_columnar
+    from run_history import list_runs, record_run
+    from metrics_history import MetricsHistory
+    
+    base_name = os.path.splitext(output_file)[0]
+    with AnalysisStore(output_file) as store:
+        store.save_analysis(analyzer, stats)
+        # Memory-mapped by the dashboard, so it starts without parsing anything
+        write_columnar(store, base_name + ".arrow")
+        # Changes since the last run, for `python run_history.py diff` and downstream jobs
+        record_run(store, base_name + ".changes.jsonl")
+        run = list_runs(store)[-1]
+        print(f"Run {run['run']}: {run['added']} added, {run['deleted']} deleted, {run['changed']} changed, "
+              f"{run['relinked']} relinked notes, {run['importance']} importance changes")
+        # Vault growth and per-note scores over time, for `python metrics_history.py`
+        with MetricsHistory(base_name + ".metrics.db") as history:
+            history.record_store(store)
+        if json_file:
+            # Single-file format for scripts that still read vault_analysis.json
+            store.export_json(json_file)
+        if export_file:
+            write_export(store, export_file)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze Obsidian vault and create interactive dashboard")
     parser.add_argument("vault_path", nargs="?", 
@@ -25,19 +54,53 @@ def main():
     parser.add_argument("--analyze-only", action="store_true", help="Only run analysis, don't launch dashboard")
     parser.add_argument("--dashboard-only", action="store_true", help="Only launch dashboard with existing data")
     parser.add_argument("--port", type=int, default=5006, help="Port for dashboard (default: 5006)")
+    parser.add_argument("--num-procs", type=int, default=1,
+                      help="Serve the dashboard from N worker processes sharing one memory-mapped dataset "
+                           "(default: 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                      help="Number of worker processes for parsing notes (default: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                      help="Only reparse notes that changed since the last incremental run")
+    parser.add_argument("--read-concurrency", type=int, default=0,
+                      help="Read up to N files at once with asyncio, for slow mounts like /mnt/c or OneDrive "
+                           "(default: 0, read one file at a time)")
+    parser.add_argument("--streaming", action="store_true",
+                      help="Keep note data on disk instead of in memory, for very large vaults")
+    parser.add_argument("--memory-limit", type=int, default=256,
+                      help="MB of note data held in memory in --streaming mode (default: 256)")
+    parser.add_argument("--watch", action="store_true",
+                      help="Keep running and update the analysis whenever notes change")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                      help="Seconds without changes before a batch is applied in --watch mode (default: 2.0)")
+    parser.add_argument("--export-json", metavar="FILE", default=None,
+                      help="Also write the whole analysis to a JSON file, e.g. vault_analysis.json")
+    parser.add_argument("--export", metavar="FILE", default=None,
+                      help="Also write a compact versioned export, gzip or lzma compressed if FILE ends "
+                           "in .gz or .xz, e.g. vault_analysis.json.gz")
+    parser.add_argument("--weight", action="append", default=[], metavar="NAME=VALUE",
+                      help="Importance weight of git_score, pagerank, in_degree, out_degree, content_richness "
+                           "or base, e.g. --weight pagerank=0.4; repeat for several")
     
     args = parser.parse_args()
     
+    if args.watch and args.dashboard_only:
+        parser.error("--watch cannot be combined with --dashboard-only")
+    if args.watch and args.num_procs > 1:
+        parser.error("--num-procs needs its own process; run --watch --analyze-only next to "
+                     "--dashboard-only --num-procs N, whose workers pick up each new analysis")
+    
     if args.install:
         install_requirements()
         print("\nDependencies installed successfully!")
         print("Please run the script again without --install to analyze your vault.")
         sys.exit(0)
     
-    # Import modules after installation check
+    # Import modules after installation check, only those this mode needs
     try:
-        from obsidian_analyzer import ObsidianAnalyzer
-        from dashboard import ObsidianDashboard
+        if not args.dashboard_only:
+            from obsidian_analyzer import ObsidianAnalyzer
+        if not args.analyze_only:
+            from dashboard import ObsidianDashboard
     except ImportError as e:
         print(f"Error importing modules: {e}")
         print("\nPlease install dependencies first by running:")
@@ -69,7 +132,20 @@ def main():
             os.remove(git_cache_file)
             print("Cleared git cache for fresh commit data")
         
-        analyzer = ObsidianAnalyzer(vault_path)
+        from importance import parse_weights
+        try:
+            importance_weights = parse_weights(args.weight)
+        except ValueError as e:
+            parser.error(str(e))
+        if os.path.exists("vault_analysis.db"):
+            # Weights saved by an earlier run or by importance.py hold unless overridden
+            from analysis_store import AnalysisStore
+            with AnalysisStore("vault_analysis.db") as store:
+                importance_weights = {**store.get_importance_weights(), **importance_weights}
+        
+        analyzer = ObsidianAnalyzer(vault_path, workers=args.workers, incremental=args.incremental,
+                                    read_concurrency=args.read_concurrency, streaming=args.streaming,
+                                    memory_limit_mb=args.memory_limit, importance_weights=importance_weights)
         stats = analyzer.scan_vault()
         
         print(f"\nVault Statistics:")
@@ -77,27 +153,41 @@ def main():
             print(f"  {key}: {value}")
         
         # Get and save all data
-        output_data = {
-            "stats": stats,
-            "important_notes": analyzer.get_important_notes(50),  # Get more for analysis
-            "orphaned_notes": analyzer.get_orphaned_notes(),
-            "timeline": analyzer.get_timeline_data(),
-            "graph": analyzer.export_graph_data()
-        }
+        save_analysis(analyzer, stats, json_file=args.export_json, export_file=args.export)
         
-        import json
-        with open("vault_analysis.json", "w") as f:
-            json.dump(output_data, f, default=str, indent=2)
+        print("\nAnalysis complete! Data saved to vault_analysis.db")
+    
+    if args.watch:
+        from vault_watcher import VaultWatcher
+        
+        if not args.analyze_only:
+            # Every page load reads the latest data, so refreshing the browser shows the changes
+            import panel as pn
+            print(f"\nLaunching dashboard on http://localhost:{args.port}")
+            pn.serve({"/": lambda: ObsidianDashboard("vault_analysis.arrow").serve()},
+                     port=args.port, address="0.0.0.0", show=False, threaded=True)
         
-        print("\nAnalysis complete! Data saved to vault_analysis.json")
+        def on_update(stats):
+            save_analysis(analyzer, stats, json_file=args.export_json, export_file=args.export)
+            print(f"Saved vault_analysis.db ({stats['total_notes']} notes, "
+                  f"{stats['orphaned_count']} orphaned)")
+        
+        VaultWatcher(analyzer, on_update, debounce=args.debounce).run()
+        sys.exit(0)
     
     if not args.analyze_only:
         # Launch dashboard
         print(f"\nLaunching dashboard on http://localhost:{args.port}")
         print("Press Ctrl+C to stop the server")
         
-        dashboard = ObsidianDashboard()
-        dashboard.serve().show(port=args.port, address="0.0.0.0", open=False)
+        if args.num_procs > 1:
+            # Each session gets its own dashboard; all sessions of all workers map the same file
+            import panel as pn
+            pn.serve({"/": lambda: ObsidianDashboard("vault_analysis.arrow").serve()},
+                     port=args.port, address="0.0.0.0", show=False, num_procs=args.num_procs)
+        else:
+            dashboard = ObsidianDashboard()
+            dashboard.serve().show(port=args.port, address="0.0.0.0", open=False)
         print(f"\nDashboard is running!")
         print(f"Open in your browser: http://localhost:{args.port}")
         print("Press Ctrl+C to stop")
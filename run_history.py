@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+History of analysis runs: a content-hash manifest per run, the changes between runs,
+a diff command and a JSONL change feed
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional
+
+from analysis_store import AnalysisStore
+
+# The manifest holds the notes and resolved links of the last recorded run; run_changes holds
+# what each run changed relative to the one before, so diffs only read changed notes
+RUNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    finished TEXT,
+    revision INTEGER,
+    total_notes INTEGER,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS manifest (
+    note_id TEXT PRIMARY KEY,
+    path TEXT,
+    content_hash TEXT,
+    importance_score REAL,
+    list_digest TEXT
+);
+CREATE TABLE IF NOT EXISTS manifest_links (
+    note_id TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manifest_links_note ON manifest_links (note_id);
+CREATE TABLE IF NOT EXISTS run_changes (
+    run_id INTEGER NOT NULL,
+    note_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    path TEXT,
+    content_hash TEXT,
+    links_added TEXT,
+    links_removed TEXT,
+    importance_before REAL,
+    importance_after REAL
+);
+CREATE INDEX IF NOT EXISTS run_changes_run ON run_changes (run_id);
+"""
+
+# Smallest importance change reported; smaller drifts add up until they are reported
+IMPORTANCE_DELTA = 0.01
+
+# Bound on the parameters of one IN (...) query
+_CHUNK = 500
+
+
+def _chunks(items: List[str]) -> Iterator[List[str]]:
+    for start in range(0, len(items), _CHUNK):
+        yield items[start:start + _CHUNK]
+
+
+def _create_schema(store: AnalysisStore) -> None:
+    """Create the run tables, adding columns that manifests of older versions lack"""
+    store.connection.executescript(RUNS_SCHEMA)
+    columns = {row[1] for row in store.connection.execute("PRAGMA table_info(manifest)")}
+    if "list_digest" not in columns:
+        # Without digests every note is compared once, which also repairs links recorded stale
+        store.connection.execute("ALTER TABLE manifest ADD COLUMN list_digest TEXT")
+        store.connection.commit()
+
+
+def _links(store: AnalysisStore, table: str, column: str, note_ids: List[str]) -> Dict[str, List[str]]:
+    """Distinct link targets per note, in link order, from the links or manifest_links table"""
+    links = defaultdict(dict)
+    for chunk in _chunks(note_ids):
+        for note_id, target in store.connection.execute(
+                f"SELECT {column}, target FROM {table} WHERE {column} IN ({', '.join('?' * len(chunk))}) "
+                f"ORDER BY rowid", chunk):
+            links[note_id][target] = None
+    return {note_id: list(targets) for note_id, targets in links.items()}
+
+
+def record_run(store: AnalysisStore, feed_file: Optional[str] = None,
+               min_importance_delta: float = IMPORTANCE_DELTA) -> int:
+    """
+    Compare the store with the manifest of the previous run, record the changes as a new run
+    and append them to feed_file; returns the run id
+    """
+    connection = store.connection
+    _create_schema(store)
+    with connection:
+        run_id = (connection.execute("SELECT MAX(run_id) FROM runs").fetchone()[0] or 0) + 1
+        added = connection.execute(
+            "SELECT n.note_id, n.path, n.content_hash, n.importance_score, n.list_digest FROM notes n "
+            "LEFT JOIN manifest m ON m.note_id = n.note_id WHERE m.note_id IS NULL").fetchall()
+        deleted = connection.execute(
+            "SELECT m.note_id, m.path, m.importance_score FROM manifest m "
+            "LEFT JOIN notes n ON n.note_id = m.note_id WHERE n.note_id IS NULL").fetchall()
+        # Resolved links also change when another note is added, renamed or deleted or gains an
+        # alias, so notes whose list digest moved are compared as well as edited ones
+        touched = connection.execute(
+            "SELECT n.note_id, n.path, n.content_hash, n.list_digest, n.content_hash IS NOT m.content_hash "
+            "FROM notes n JOIN manifest m ON m.note_id = n.note_id "
+            "WHERE n.content_hash IS NOT m.content_hash OR n.list_digest IS NOT m.list_digest").fetchall()
+        importance = connection.execute(
+            "SELECT n.note_id, n.path, m.importance_score, n.importance_score FROM notes n "
+            "JOIN manifest m ON m.note_id = n.note_id "
+            "WHERE ABS(n.importance_score - m.importance_score) >= ?", (min_importance_delta,)).fetchall()
+
+        touched_ids = [row[0] for row in touched]
+        current = _links(store, "links", "source", [row[0] for row in added] + touched_ids)
+        previous = _links(store, "manifest_links", "note_id", touched_ids + [row[0] for row in deleted])
+
+        rows = []
+        for note_id, path, content_hash, score, _ in added:
+            rows.append((run_id, note_id, "added", path, content_hash, json.dumps(current.get(note_id, [])),
+                         None, None, score))
+        for note_id, path, score in deleted:
+            rows.append((run_id, note_id, "deleted", path, None, None,
+                         json.dumps(previous.get(note_id, [])), score, None))
+        changed, relinked = [], []
+        for note_id, path, content_hash, _, edited in touched:
+            new_links, old_links = current.get(note_id, []), previous.get(note_id, [])
+            new_set, old_set = set(new_links), set(old_links)
+            links_added = [target for target in new_links if target not in old_set]
+            links_removed = [target for target in old_links if target not in new_set]
+            if edited:
+                changed.append(note_id)
+                rows.append((run_id, note_id, "changed", path, content_hash, json.dumps(links_added),
+                             json.dumps(links_removed), None, None))
+            elif links_added or links_removed:
+                relinked.append(note_id)
+                rows.append((run_id, note_id, "relinked", path, None, json.dumps(links_added),
+                             json.dumps(links_removed), None, None))
+        for note_id, path, before, after in importance:
+            rows.append((run_id, note_id, "importance", path, None, None, None, before, after))
+        connection.executemany("INSERT INTO run_changes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+        # Move the manifest to this run
+        gone = [row[0] for row in deleted] + touched_ids
+        for chunk in _chunks(gone):
+            connection.execute(f"DELETE FROM manifest_links WHERE note_id IN ({', '.join('?' * len(chunk))})", chunk)
+        connection.executemany("DELETE FROM manifest WHERE note_id = ?", [(row[0],) for row in deleted])
+        connection.executemany("INSERT INTO manifest (note_id, path, content_hash, importance_score, list_digest) "
+                               "VALUES (?, ?, ?, ?, ?)", added)
+        connection.executemany("UPDATE manifest SET path = ?, content_hash = ?, list_digest = ? WHERE note_id = ?",
+                               [(path, content_hash, digest, note_id)
+                                for note_id, path, content_hash, digest, _ in touched])
+        connection.executemany("UPDATE manifest SET importance_score = ? WHERE note_id = ?",
+                               [(after, note_id) for note_id, _, _, after in importance])
+        connection.executemany("INSERT INTO manifest_links VALUES (?, ?)",
+                               [(note_id, target) for note_id in [row[0] for row in added] + touched_ids
+                                for target in current.get(note_id, [])])
+
+        summary = {"added": len(added), "deleted": len(deleted), "changed": len(changed),
+                   "relinked": len(relinked), "importance": len(importance)}
+        total_notes = connection.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+        connection.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                           (run_id, datetime.now().isoformat(timespec="seconds"), store.revision(),
+                            total_notes, json.dumps(summary)))
+
+    if feed_file:
+        # Appended after the commit; `run_history.py feed --since` rebuilds lines lost to a crash
+        with open(feed_file, "a", encoding="utf-8") as f:
+            for event in iter_events(store, run_id - 1):
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    return run_id
+
+
+def list_runs(store: AnalysisStore) -> List[Dict]:
+    """Recorded runs, oldest first"""
+    _create_schema(store)
+    return [{"run": run_id, "finished": finished, "revision": revision, "total_notes": total_notes,
+             "relinked": 0, **json.loads(summary)}
+            for run_id, finished, revision, total_notes, summary in store.connection.execute(
+                "SELECT run_id, finished, revision, total_notes, summary FROM runs ORDER BY run_id")]
+
+
+def iter_events(store: AnalysisStore, since_run: int = 0, until_run: Optional[int] = None) -> Iterator[Dict]:
+    """Change feed events of the runs after since_run (up to until_run); each run ends with a "run" event"""
+    until_run = sys.maxsize if until_run is None else until_run
+    runs = {run["run"]: run for run in list_runs(store) if since_run < run["run"] <= until_run}
+    changes = store.connection.execute(
+        "SELECT run_id, note_id, event, path, content_hash, links_added, links_removed, importance_before, "
+        "importance_after FROM run_changes WHERE run_id > ? AND run_id <= ? ORDER BY run_id, rowid",
+        (since_run, until_run))
+
+    def close_runs(up_to: int) -> Iterator[Dict]:
+        for run_id in sorted(run_id for run_id in runs if run_id < up_to):
+            yield {"event": "run", **runs.pop(run_id)}
+
+    for run_id, note_id, event, path, content_hash, links_added, links_removed, before, after in changes:
+        yield from close_runs(run_id)
+        record = {"run": run_id, "event": event, "note_id": note_id, "path": path}
+        if event in ("added", "changed"):
+            record["content_hash"] = content_hash
+        if links_added is not None:
+            record["links_added"] = json.loads(links_added)
+        if links_removed is not None:
+            record["links_removed"] = json.loads(links_removed)
+        if event in ("importance", "deleted"):
+            record["importance_before"] = before
+        if event in ("importance", "added"):
+            record["importance_after"] = after
+        yield record
+    yield from close_runs(sys.maxsize)
+
+
+def diff_runs(store: AnalysisStore, from_run: int, to_run: int) -> Dict:
+    """Net changes between two recorded runs, read from the changes of the runs in between"""
+    notes = {}
+    for event in iter_events(store, from_run, to_run):
+        if event["event"] == "run":
+            continue
+        note = notes.setdefault(event["note_id"], {
+            "path": event["path"], "existed": event["event"] != "added", "exists": True,
+            "content": False, "links": Counter(), "before": None, "after": None, "scored": False})
+        note["path"] = event["path"]
+        note["exists"] = event["event"] != "deleted"
+        note["content"] = note["content"] or event["event"] not in ("importance", "relinked")
+        note["links"].update(event.get("links_added", []))
+        note["links"].subtract(event.get("links_removed", []))
+        if "importance_before" in event and not note["scored"]:
+            note["before"] = event["importance_before"]
+        if "importance_before" in event or "importance_after" in event:
+            note["scored"] = True
+            note["after"] = event.get("importance_after")
+
+    diff = {"from_run": from_run, "to_run": to_run, "added": [], "deleted": [], "changed": [], "relinked": [],
+            "importance": []}
+    for note_id, note in notes.items():
+        if not note["existed"] and not note["exists"]:
+            continue
+        links_added = [target for target, count in note["links"].items() if count > 0]
+        links_removed = [target for target, count in note["links"].items() if count < 0]
+        entry = {"note_id": note_id, "path": note["path"]}
+        if not note["existed"]:
+            diff["added"].append({**entry, "links": links_added, "importance_score": note["after"]})
+        elif not note["exists"]:
+            diff["deleted"].append({**entry, "links": links_removed, "importance_score": note["before"]})
+        else:
+            if note["content"]:
+                diff["changed"].append({**entry, "links_added": links_added, "links_removed": links_removed})
+            elif links_added or links_removed:
+                # Same content, but links resolve to other notes now
+                diff["relinked"].append({**entry, "links_added": links_added, "links_removed": links_removed})
+            if note["scored"] and note["before"] != note["after"]:
+                diff["importance"].append({**entry, "before": note["before"], "after": note["after"],
+                                           "delta": note["after"] - note["before"]})
+    diff["importance"].sort(key=lambda item: abs(item["delta"]), reverse=True)
+    return diff
+
+
+def print_diff(diff: Dict, top_n: int = 20) -> None:
+    """Summary of a diff for the terminal"""
+    print(f"Changes from run {diff['from_run']} to run {diff['to_run']}:")
+    for kind in ("added", "deleted", "changed", "relinked"):
+        print(f"\n{kind.capitalize()} notes: {len(diff[kind])}")
+        for note in diff[kind][:top_n]:
+            if kind in ("changed", "relinked"):
+                links = f"+{len(note['links_added'])} -{len(note['links_removed'])} links"
+            else:
+                links = f"{len(note['links'])} links"
+            print(f"  - {note['path']} ({links})")
+        if len(diff[kind]) > top_n:
+            print(f"  ... and {len(diff[kind]) - top_n} more")
+
+    link_delta = (sum(len(note["links_added"]) for note in diff["changed"] + diff["relinked"])
+                  + sum(len(note["links"]) for note in diff["added"]))
+    link_removed = (sum(len(note["links_removed"]) for note in diff["changed"] + diff["relinked"])
+                    + sum(len(note["links"]) for note in diff["deleted"]))
+    print(f"\nLinks: +{link_delta} -{link_removed}")
+
+    print(f"\nImportance changes: {len(diff['importance'])}")
+    for note in diff["importance"][:top_n]:
+        print(f"  {note['delta']:+8.3f}  {note['before']:.3f} -> {note['after']:.3f}  {note['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List analysis runs, diff them and print the change feed")
+    parser.add_argument("--db", default="vault_analysis.db", help="Analysis store (default: vault_analysis.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List recorded runs")
+    diff_parser = commands.add_parser("diff", help="Show what changed between two runs")
+    diff_parser.add_argument("from_run", type=int, nargs="?", help="Older run (default: the one before TO_RUN)")
+    diff_parser.add_argument("to_run", type=int, nargs="?", help="Newer run (default: the latest run)")
+    diff_parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    diff_parser.add_argument("--top", type=int, default=20, help="Notes listed per section (default: 20)")
+    feed_parser = commands.add_parser("feed", help="Print change feed events as JSON lines")
+    feed_parser.add_argument("--since", type=int, default=0, help="Only runs after this one (default: 0)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} not found. Please run the analyzer first.")
+        sys.exit(1)
+
+    with AnalysisStore(args.db) as store:
+        runs = list_runs(store)
+        if args.command == "list":
+            for run in runs:
+                print(f"Run {run['run']:>4}  {run['finished']}  {run['total_notes']} notes  "
+                      f"+{run['added']} -{run['deleted']} ~{run['changed']} notes, {run['relinked']} relinked, "
+                      f"{run['importance']} importance changes")
+        elif args.command == "feed":
+            for event in iter_events(store, args.since):
+                print(json.dumps(event, ensure_ascii=False))
+        else:
+            if not runs:
+                print("Error: no runs recorded yet")
+                sys.exit(1)
+            to_run = args.to_run if args.to_run is not None else runs[-1]["run"]
+            from_run = args.from_run if args.from_run is not None else to_run - 1
+            diff = diff_runs(store, from_run, to_run)
+            if args.json:
+                print(json.dumps(diff, ensure_ascii=False, indent=2))
+            else:
+                print_diff(diff, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,15 @@
 """
 Scan vault for ALL image files and add them to the analysis
 """
-import json
 import os
 from pathlib import Path
 from collections import defaultdict
 
-# Load existing analysis
-print("Loading existing vault analysis...")
-with open('vault_analysis_with_git.json', 'r') as f:
-    data = json.load(f)
+from analysis_store import AnalysisStore
+
+# Open the analysis store; only the image tables are written
+print("Opening vault analysis store...")
+store = AnalysisStore('vault_analysis.db')
 
 vault_path = Path("/mnt/c/Users/hess/Lokal/MyVault")
 if not vault_path.exists():
@@ -55,33 +55,15 @@ print("Images by format:")
 for ext, count in sorted(image_count_by_extension.items()):
     print(f"  {ext}: {count}")
 
+store.replace_image_files(all_images.values())
+
 # Now check which images are referenced in notes
 print("\nAnalyzing image usage in notes...")
-notes_metadata = data.get('notes_metadata', {})
-referenced_images = set()
-image_usage = defaultdict(list)  # image -> list of notes using it
-
-for note_id, metadata in notes_metadata.items():
-    if isinstance(metadata, dict):
-        images = metadata.get('images', [])
-        for img in images:
-            # Normalize the image path
-            img_normalized = img.replace('\\', '/')
-            referenced_images.add(img_normalized)
-            image_usage[img_normalized].append({
-                'note_id': note_id,
-                'path': metadata.get('path', ''),
-                'title': metadata.get('path', '').split('/')[-1]
-            })
-
-# Find orphaned images (in vault but not referenced)
-orphaned_images = []
-for img_path, img_data in all_images.items():
-    if img_path not in referenced_images:
-        orphaned_images.append(img_data)
+image_usage = store.get_image_usage()  # image -> list of notes using it
+referenced_images = set(image_usage)
 
-# Sort orphaned images by size (largest first)
-orphaned_images.sort(key=lambda x: x['size'], reverse=True)
+# Images in the vault but not referenced, largest first
+orphaned_images = store.get_orphaned_images()
 
 print(f"\nImage usage statistics:")
 print(f"  Total images in vault: {len(all_images)}")
@@ -89,18 +71,15 @@ print(f"  Referenced images: {len(referenced_images)}")
 print(f"  Orphaned images: {len(orphaned_images)}")
 print(f"  Total size of orphaned images: {sum(img['size'] for img in orphaned_images) / (1024*1024):.1f} MB")
 
-# Add comprehensive image data to the analysis
-data['all_images'] = all_images
-data['image_usage'] = dict(image_usage)
-data['orphaned_images'] = orphaned_images
-data['image_stats'] = {
+# Image usage is queried from the store; only the summary is kept as metadata
+store.set_meta('image_stats', {
     'total_images': len(all_images),
     'referenced_images': len(referenced_images),
     'orphaned_images': len(orphaned_images),
     'formats': dict(image_count_by_extension),
     'total_size_mb': round(sum(img['size'] for img in all_images.values()) / (1024*1024), 2),
     'orphaned_size_mb': round(sum(img['size'] for img in orphaned_images) / (1024*1024), 2)
-}
+})
 
 # Show top 10 largest orphaned images
 if orphaned_images:
@@ -109,9 +88,9 @@ if orphaned_images:
         print(f"  {img['filename']} ({img['size_mb']} MB) - {img['path']}")
 
 # Save updated analysis
-print("\nSaving updated analysis with comprehensive image data...")
-with open('vault_analysis_with_git.json', 'w') as f:
-    json.dump(data, f, indent=2, default=str)
+print("\nSaving image data to vault_analysis.db...")
+store.commit()
+store.close()
 
 print("✓ Analysis updated successfully!")
 print(f"\nTo see all images in the dashboard, restart it:")
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 """Show progress of AI summary generation"""
-import json
+from analysis_export import load_json_export
 
 # Load vault data
-with open("vault_analysis.json", "r") as f:
-    vault_data = json.load(f)
+vault_data = load_json_export()
 
 # Count progress
 total = 0
@@ -3,7 +3,6 @@
 Streamlit Dashboard for Obsidian Vault Analysis
 """
 
-import json
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -14,6 +13,8 @@ from pyvis.network import Network
 import tempfile
 import os
 
+from analysis_store import AnalysisStore
+
 # Page config
 st.set_page_config(
     page_title="Obsidian Vault Analyzer",
@@ -21,17 +22,25 @@ st.set_page_config(
     layout="wide"
 )
 
+def get_store():
+    """
+    This session's store connection; sessions run concurrently in their own threads and must not
+    share one sqlite3 connection. WAL lets them read while the analyzer writes
+    """
+    if "store" not in st.session_state:
+        st.session_state.store = AnalysisStore("vault_analysis.db")
+    return st.session_state.store
+
 @st.cache_data
-def load_data():
-    """Load analysis data"""
-    with open("vault_analysis.json", 'r') as f:
-        return json.load(f)
+def load_data(revision: int):
+    """Load analysis data (cached per store revision, so watch-mode updates show up)"""
+    return get_store().dashboard_data()
 
 def main():
     st.title("📝 Obsidian Vault Analyzer")
     
     # Load data
-    data = load_data()
+    data = load_data(get_store().revision())
     
     # Sidebar with statistics
     with st.sidebar:
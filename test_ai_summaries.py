@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
-import json
+from analysis_export import load_json_export
 
 # Load the vault analysis data
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 notes_metadata = data.get('notes_metadata', {})
 
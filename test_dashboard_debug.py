@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 """Test the dashboard hashtag functionality"""
-import json
+from analysis_export import load_json_export
 
 # Load the data
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 notes_metadata = data.get('notes_metadata', {})
 hashtags_data = data.get('hashtags', [])
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 """Test git integration across different folders"""
-import json
 from git_history import GitHistoryAnalyzer
 from collections import defaultdict
 
+from analysis_export import load_json_export
+
 # Load current vault analysis
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 vault_path = "//mnt/c/Users/hess/OneDrive/Dokumente/MyVault"
 notes_metadata = data.get('notes_metadata', {})
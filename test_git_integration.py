@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """Test git integration on a subset of files"""
-import json
 from git_history import GitHistoryAnalyzer
 
+from analysis_export import load_json_export
+
 # Load current vault analysis
-with open('vault_analysis.json', 'r') as f:
-    data = json.load(f)
+data = load_json_export()
 
 vault_path = "//mnt/c/Users/hess/OneDrive/Dokumente/MyVault"
 notes_metadata = data.get('notes_metadata', {})
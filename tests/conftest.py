@@ -0,0 +1,39 @@
+"""The modules under test live in the repository root"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sample_vault(tmp_path, monkeypatch):
+    """A few linked notes with tags, an image and an alias; caches go to tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / "vault"
+    notes = {
+        "Hub.md": "---\ntags: [project]\naliases: [Center]\n---\n# Hub\nLinks to [[Projects/Alpha]] and "
+                  "[[Beta|the beta]] #planning\n![[diagram.png]]\n",
+        "Projects/Alpha.md": "Alpha goes back to the [[Center]] and on to [[Beta#Status]].\n",
+        "Projects/Beta.md": "Beta refers to [[Missing Note]] and to [[#Status]] itself.\n## Status\nopen\n",
+        "Archive/Old.md": "Nothing links here #archive\n",
+    }
+    for path, content in notes.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(content, encoding="utf-8")
+    (root / "diagram.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    return root
+
+
+@pytest.fixture
+def sample_store(sample_vault, tmp_path):
+    """AnalysisStore holding the analysis of sample_vault"""
+    from analysis_store import AnalysisStore
+    from obsidian_analyzer import ObsidianAnalyzer
+
+    analyzer = ObsidianAnalyzer(str(sample_vault))
+    stats = analyzer.scan_vault()
+    with AnalysisStore(str(tmp_path / "vault_analysis.db")) as store:
+        store.save_analysis(analyzer, stats)
+        yield store
@@ -0,0 +1,69 @@
+"""Compact export of analysis_export, read back against the store it was written from"""
+import json
+
+import pytest
+
+import analysis_store
+from analysis_export import EXPORT_VERSION, load_analysis_file, load_json_export, write_export
+
+
+def as_json(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+@pytest.mark.parametrize("suffix", [".json", ".json.gz", ".json.xz"])
+def test_export_round_trip(sample_store, tmp_path, suffix):
+    path = str(tmp_path / ("analysis" + suffix))
+    write_export(sample_store, path)
+    data = load_analysis_file(path)
+
+    expected = sample_store.dashboard_data()
+    expected["notes_metadata"] = dict(sample_store.iter_notes())
+    assert as_json(data) == as_json(expected)
+    assert not (tmp_path / ("analysis.tmp" + suffix)).exists()
+
+
+def test_old_json_files_load_as_they_are(sample_store, tmp_path):
+    path = str(tmp_path / "vault_analysis.json")
+    sample_store.export_json(path)
+    with open(path, encoding="utf-8") as f:
+        assert load_analysis_file(path) == json.load(f)
+
+
+def test_other_versions_are_rejected(sample_store, tmp_path):
+    path = str(tmp_path / "analysis.json")
+    write_export(sample_store, path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] = EXPORT_VERSION + 1
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    with pytest.raises(ValueError):
+        load_analysis_file(path)
+
+
+def test_export_json_matches_json_dump(sample_store, tmp_path, monkeypatch):
+    # Pages of two notes, so the streamed notes_metadata crosses page boundaries
+    monkeypatch.setattr(analysis_store._NotesMetadata.__init__, "__defaults__", (2,))
+    path = tmp_path / "vault_analysis.json"
+    sample_store.export_json(str(path))
+
+    expected = sample_store.dashboard_data()
+    expected["revision"] = sample_store.revision()
+    expected["notes_metadata"] = dict(sample_store.iter_notes())
+    assert path.read_text() == json.dumps(expected, indent=2, default=str)
+
+
+def test_stale_json_exports_are_refused(sample_store, tmp_path):
+    path = str(tmp_path / "vault_analysis.json")
+    with pytest.raises(SystemExit):
+        load_json_export(path, sample_store.db_path)
+
+    sample_store.export_json(path)
+    assert load_json_export(path, sample_store.db_path)["revision"] == sample_store.revision()
+
+    # An AI summary written to the store afterwards makes the file stale
+    sample_store.set_ai("Hub", "Summary", ["#moc"], [])
+    sample_store.commit()
+    with pytest.raises(SystemExit):
+        load_json_export(path, sample_store.db_path)
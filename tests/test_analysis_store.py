@@ -0,0 +1,99 @@
+"""Round trips of analyses through the SQLite store of analysis_store"""
+import json
+
+import numpy as np
+import pytest
+
+from analysis_store import AnalysisStore
+from importance import importance_scores
+from obsidian_analyzer import ObsidianAnalyzer
+
+
+@pytest.fixture
+def analyzer(sample_vault):
+    analyzer = ObsidianAnalyzer(str(sample_vault))
+    analyzer.scan_vault()
+    analyzer.compute()
+    return analyzer
+
+
+def as_json(value):
+    """Values as the JSON output wrote them"""
+    return json.loads(json.dumps(value, default=str))
+
+
+def test_notes_round_trip(analyzer, tmp_path):
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        assert store.save_analysis(analyzer, {"total_notes": len(analyzer.notes_metadata)}) == \
+            len(analyzer.notes_metadata)
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        stored = dict(store.iter_notes())
+        assert list(stored) == list(analyzer.notes_metadata)
+        links_in = {}
+        for note_id, metadata in analyzer.notes_metadata.items():
+            for target in dict.fromkeys(metadata["links_out"]):
+                links_in.setdefault(target, []).append(note_id)
+        for note_id, metadata in analyzer.notes_metadata.items():
+            # The analyzer leaves links_in empty; the store derives it from the links table
+            assert stored[note_id] == {**as_json(metadata.to_dict()), "links_in": links_in.get(note_id, [])}, note_id
+            assert store.get_note(note_id) == stored[note_id]
+        assert stored["Hub"]["links_in"] == ["Projects/Alpha"]
+        assert stored["Projects/Beta"]["links_out"] == ["Missing Note"]
+        assert sorted(store.get_orphaned_note_ids()) == sorted(analyzer.orphaned_notes)
+        assert store.get_stats() == {"total_notes": len(analyzer.notes_metadata)}
+
+
+def test_unchanged_lists_are_not_rewritten(analyzer, tmp_path):
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        store.save_analysis(analyzer, {})
+        rowids = store.connection.execute("SELECT rowid FROM links ORDER BY rowid").fetchall()
+        store.save_analysis(analyzer, {})
+        assert store.connection.execute("SELECT rowid FROM links ORDER BY rowid").fetchall() == rowids
+
+
+def test_patch_and_delete(analyzer, tmp_path):
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        store.save_analysis(analyzer, {})
+        revision = store.revision()
+        assert store.patch_note("Hub", word_count=12345, linked_content={"links": []})
+        assert not store.patch_note("No Such Note", word_count=1)
+        with pytest.raises(KeyError):
+            store.patch_note("Hub", links_out=[])
+        store.commit()
+        assert store.revision() == revision + 1
+        assert store.get_note("Hub")["word_count"] == 12345
+        assert store.get_note("Hub")["linked_content"] == {"links": []}
+
+        store.delete_note("Hub")
+        assert store.get_note("Hub") is None
+        assert "Hub" not in store.get_lists("links_out")
+        assert all("Hub" not in sources for sources in store.get_lists("links_in").values())
+
+
+def test_set_tags_is_counted_and_survives_until_the_next_save(analyzer, tmp_path):
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        store.save_analysis(analyzer, {})
+        store.set_tags("Hub", "auto_hashtags", ["#ai-only"])
+        store.refresh_hashtags()
+        assert store.get_note("Hub")["auto_hashtags"] == ["#ai-only"]
+        assert {"hashtag": "#ai-only", "count": 1} in store.get_all_hashtags()
+        with pytest.raises(KeyError):
+            store.set_tags("Hub", "links_out", [])
+
+        # The cleared digest makes the next analysis rewrite the patched lists
+        store.save_analysis(analyzer, {})
+        assert store.get_note("Hub")["auto_hashtags"] == analyzer.notes_metadata["Hub"]["auto_hashtags"]
+
+
+def test_rescore_matches_the_analyzer(analyzer, tmp_path):
+    with AnalysisStore(str(tmp_path / "analysis.db")) as store:
+        store.save_analysis(analyzer, {})
+        note_ids, features = store.feature_matrix()
+        expected = [analyzer.notes_metadata[note_id]["importance_score"] for note_id in note_ids]
+        assert np.allclose(importance_scores(features, analyzer.importance_weights), expected)
+
+        weights = {"pagerank": 1.0, "git_score": 0.0}
+        ranked = store.rank_notes(weights, top_n=3)
+        store.rescore(weights)
+        assert store.get_importance_weights()["pagerank"] == 1.0
+        assert [note["id"] for note in ranked] == store.get_important_note_ids(3)
@@ -0,0 +1,96 @@
+"""Arrow notes table of columnar_export, read back against the store it was written from"""
+import os
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from columnar_export import ColumnarDataset, shared_dataset, write_columnar
+
+
+@pytest.fixture
+def dataset(sample_store, tmp_path):
+    path = str(tmp_path / "vault_analysis.arrow")
+    write_columnar(sample_store, path)
+    dataset = ColumnarDataset(path)
+    yield dataset
+    dataset.close()
+
+
+def test_sections_match_the_store(sample_store, dataset):
+    expected = sample_store.dashboard_data()
+    data = dataset.dashboard_data()
+    assert dataset.revision == sample_store.revision()
+    assert data["stats"] == expected["stats"]
+    assert data["hashtags"] == expected["hashtags"]
+    assert data["image_usage"] == expected["image_usage"]
+    assert data["important_notes"]["id"].tolist() == [note["id"] for note in expected["important_notes"]]
+    assert data["orphaned_notes"]["id"].tolist() == [note["id"] for note in expected["orphaned_notes"]]
+    assert data["important_notes"]["images"].tolist() == [note["images"] for note in expected["important_notes"]]
+    for field in ("created", "modified"):
+        assert data["timeline"][field]["path"].tolist() == [item["path"] for item in expected["timeline"][field]]
+    assert list(data["graph"]["nodes"]) == expected["graph"]["nodes"]
+    assert list(data["graph"]["edges"]) == expected["graph"]["edges"]
+
+
+def test_ranking_matches_the_store(sample_store, dataset):
+    note_ids, features = sample_store.feature_matrix()
+    assert dataset.notes["id"].tolist() == note_ids
+    assert np.array_equal(dataset.feature_matrix(), features)
+    assert dataset.get_importance_weights() == sample_store.get_importance_weights()
+
+    weights = {"in_degree": 1.0, "git_score": 0.0}
+    ranked = dataset.rank_notes(weights, top_n=3)
+    expected = sample_store.rank_notes(weights, top_n=3)
+    assert ranked["id"].tolist() == [note["id"] for note in expected]
+    assert np.allclose(ranked["importance_score"], [note["importance_score"] for note in expected])
+
+
+def test_hashtag_and_folder_queries(sample_store, dataset):
+    assert sample_store.get_all_hashtags()
+    for item in sample_store.get_all_hashtags():
+        notes = dataset.get_notes_by_hashtag(item["hashtag"])
+        assert [note["id"] for note in notes] == \
+            [note["id"] for note in sample_store.get_notes_by_hashtag(item["hashtag"])]
+    assert sorted(dataset.get_top_folders()) == sorted(sample_store.get_top_folders())
+
+
+def test_other_versions_are_rejected(dataset, tmp_path):
+    table = dataset.table.replace_schema_metadata({**dataset.table.schema.metadata, b"version": b"1"})
+    path = str(tmp_path / "old.arrow")
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    with pytest.raises(ValueError):
+        ColumnarDataset(path)
+
+
+def test_shared_dataset_follows_replacements(sample_store, tmp_path):
+    path = str(tmp_path / "shared.arrow")
+    write_columnar(sample_store, path)
+    shared = shared_dataset(path)
+    first = shared.get()
+    assert shared.get() is first
+
+    sample_store.commit()
+    write_columnar(sample_store, path)
+    second = shared.get()
+    assert second is not first and second.revision == first.revision + 1
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_shared_dataset_sees_rows_of_a_replaced_file(sample_store, tmp_path):
+    path = str(tmp_path / "shared.arrow")
+    write_columnar(sample_store, path)
+    shared = shared_dataset(path)
+    first = shared.get()
+    assert "Archive/Old" in set(first.notes_frame()["id"])
+
+    sample_store.delete_note("Archive/Old")
+    sample_store.commit()
+    write_columnar(sample_store, path)
+    second = shared.get()
+    assert sorted(second.notes_frame()["id"]) == sorted(note_id for note_id, _ in sample_store.iter_notes())
+    assert "Archive/Old" not in set(second.notes_frame()["id"])
+    assert second.get_orphaned_notes().empty
+    # Sessions still holding the old version keep reading its rows
+    assert "Archive/Old" in set(first.notes_frame()["id"])
@@ -0,0 +1,85 @@
+"""Parsing of .git/index versions 2 to 4 by git_index, checked against git itself"""
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from git_index import read_git_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    files = {
+        "Note.md": "# Note\n",
+        "Folder/Deep/Nested Note.md": "nested\n" * 50,
+        "Folder/Deep/Nested Other.md": "other\n",
+        "Folder/Übersicht.md": "umlaut\n",
+        "Zettel.excalidraw.md": "drawing\n",
+    }
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content, encoding="utf-8")
+    git(tmp_path, "add", ".")
+    return tmp_path
+
+
+def expected_entries(repo):
+    """Path -> blob id of the stage-0 regular files git lists"""
+    entries = {}
+    for line in git(repo, "-c", "core.quotepath=off", "ls-files", "-s").splitlines():
+        mode, blob_id, stage, path = line.split(None, 3)
+        if mode == "100644" and stage == "0":
+            entries[path] = blob_id
+    return entries
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_entries_match_git(repo, version):
+    git(repo, "update-index", "--index-version", str(version))
+    if version == 3:
+        # Extended flags only exist from version 3; the entry is skipped
+        (repo / "Later.md").write_text("later\n")
+        git(repo, "add", "-N", "Later.md")
+
+    index_path = repo / ".git" / "index"
+    assert int.from_bytes(index_path.read_bytes()[4:8], "big") == version
+    entries = read_git_index(str(index_path))
+    expected = expected_entries(repo)
+    expected.pop("Later.md", None)
+    assert {path: entry.blob_id for path, entry in entries.items()} == expected
+    assert "Later.md" not in entries
+    for path, entry in entries.items():
+        stat = os.stat(repo / path)
+        assert entry.st_size == stat.st_size
+        assert entry.st_mtime_ns == stat.st_mtime_ns
+        assert entry.st_mtime == stat.st_mtime
+
+
+def test_skip_worktree_and_symlinks_are_skipped(repo):
+    os.symlink("Note.md", repo / "Link.md")
+    git(repo, "add", "Link.md")
+    git(repo, "update-index", "--skip-worktree", "Folder/Übersicht.md")
+    git(repo, "update-index", "--index-version", "4")
+
+    entries = read_git_index(str(repo / ".git" / "index"))
+    assert "Link.md" not in entries
+    assert "Folder/Übersicht.md" not in entries
+    assert "Folder/Deep/Nested Other.md" in entries
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "index"
+    path.write_bytes(b"DIRC\x00\x00\x00\x05\x00\x00\x00\x00")
+    with pytest.raises(ValueError):
+        read_git_index(str(path))
+    path.write_bytes(b"NOPE\x00\x00\x00\x02\x00\x00\x00\x00")
+    with pytest.raises(ValueError):
+        read_git_index(str(path))
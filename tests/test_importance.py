@@ -0,0 +1,61 @@
+"""Importance scores of importance, against the per-note formula they replaced"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from importance import (DEFAULT_WEIGHTS, contributions, feature_matrix, git_scores, importance_scores,
+                        normalize_weights, parse_weights, top_rows)
+
+
+def scalar_score(commit_count, pagerank, in_degree, out_degree, word_count, images, tags):
+    """One note's score as the analyzer computed it before the feature matrix"""
+    git = 0.0 if commit_count == 0 else 0.2 if commit_count == 1 else 0.5 if commit_count == 2 else \
+        0.7 if commit_count == 3 else 0.85 if commit_count <= 5 else 1.0
+    richness = min(word_count / 1000 + images * 0.5 + tags * 0.2, 10)
+    return (git * 10 * 0.30 + pagerank * 100 * 0.20 + in_degree * 0.15 + out_degree * 0.15
+            + richness * 0.10 + 0.10)
+
+
+def test_scores_match_the_scalar_formula():
+    rng = np.random.default_rng(3)
+    notes = [(int(rng.integers(0, 9)), float(rng.random() / 50), int(rng.integers(0, 20)),
+              int(rng.integers(0, 20)), int(rng.integers(0, 30000)), int(rng.integers(0, 5)),
+              int(rng.integers(0, 8))) for _ in range(200)]
+    features = feature_matrix(*zip(*notes))
+    assert np.allclose(importance_scores(features), [scalar_score(*note) for note in notes])
+    assert np.allclose(contributions(features).sum(axis=1) + DEFAULT_WEIGHTS["base"], importance_scores(features))
+
+
+def test_git_score_steps(tmp_path):
+    from git_history import GitHistoryAnalyzer
+
+    counts = [0, 1, 2, 3, 4, 5, 6, 100]
+    assert git_scores(counts).tolist() == [0.0, 0.2, 0.5, 0.7, 0.85, 0.85, 1.0, 1.0]
+    analyzer = GitHistoryAnalyzer(str(tmp_path), cache_file=str(tmp_path / "cache.json"))
+    assert [analyzer.calculate_git_importance_score(count) for count in counts] == git_scores(counts).tolist()
+
+
+def test_git_history_does_not_import_numpy():
+    # Git-only scripts take the step table from git_history without loading numpy
+    subprocess.run([sys.executable, "-c", "import sys, git_history; assert 'numpy' not in sys.modules"],
+                   check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_weights():
+    assert normalize_weights({"pagerank": 1}) == {**DEFAULT_WEIGHTS, "pagerank": 1.0}
+    with pytest.raises(KeyError):
+        normalize_weights({"popularity": 1})
+    assert parse_weights(["git_score=0", "base=0.5"]) == {"git_score": 0.0, "base": 0.5}
+    for value in ("git_score", "popularity=1", "pagerank=high"):
+        with pytest.raises(ValueError):
+            parse_weights([value])
+
+
+def test_top_rows_breaks_ties_in_row_order():
+    scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 0.5])
+    assert top_rows(scores, 4).tolist() == [1, 3, 2, 4]
+    assert top_rows(scores, 10).tolist() == [1, 3, 2, 4, 0, 5]
+    assert top_rows(scores, 0).tolist() == []
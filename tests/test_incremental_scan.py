@@ -0,0 +1,90 @@
+"""Incremental rescans of ObsidianAnalyzer against a fresh scan of the same vault"""
+import os
+
+import pytest
+
+from obsidian_analyzer import ObsidianAnalyzer
+
+
+def snapshot(analyzer):
+    """Notes with all metrics, graph nodes and edges, and orphans of a computed analyzer"""
+    analyzer.compute()
+    notes = {}
+    for note_id, metadata in analyzer.notes_metadata.items():
+        fields = {}
+        for field, value in metadata.to_dict().items():
+            if isinstance(value, float):
+                value = round(value, 9)
+            elif field in ("keywords", "auto_hashtags"):
+                # Built from sets, so their order is arbitrary
+                value = sorted(value)
+            fields[field] = value
+        notes[note_id] = fields
+    nodes = {node: attributes.get("type") for node, attributes in analyzer.graph.nodes(data=True)}
+    return notes, nodes, sorted(analyzer.graph.edges()), sorted(analyzer.orphaned_notes)
+
+
+def rescan(vault, cache_dir):
+    analyzer = ObsidianAnalyzer(str(vault), cache_dir=str(cache_dir), incremental=True)
+    analyzer.scan_vault()
+    return analyzer
+
+
+def fresh(vault, tmp_path):
+    analyzer = ObsidianAnalyzer(str(vault), cache_dir=str(tmp_path / "fresh-cache"))
+    analyzer.scan_vault()
+    return analyzer
+
+
+def write(path, text, mtime_ns=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        # Edits within one timestamp tick must still count as changes
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def edit(vault):
+    write(vault / "Projects" / "Alpha.md", "Alpha now links to [[Archive/Old]] only #edited\n",
+          mtime_ns=2_000_000_000_000_000_000)
+
+
+def add(vault):
+    write(vault / "Projects" / "Gamma.md", "---\naliases: [Missing Note]\n---\nGamma links [[Hub]]\n")
+
+
+def delete(vault):
+    (vault / "Projects" / "Beta.md").unlink()
+
+
+def rename(vault):
+    os.rename(vault / "Projects", vault / "Work")
+
+
+@pytest.mark.parametrize("change", [edit, add, delete, rename])
+def test_rescan_matches_a_fresh_scan(sample_vault, tmp_path, change, capsys):
+    cache_dir = tmp_path / "cache"
+    rescan(sample_vault, cache_dir)
+    change(sample_vault)
+    capsys.readouterr()
+
+    analyzer = rescan(sample_vault, cache_dir)
+    assert "Incremental scan:" in capsys.readouterr().out
+    assert snapshot(analyzer) == snapshot(fresh(sample_vault, tmp_path))
+
+
+def test_rescans_in_a_row(sample_vault, tmp_path):
+    cache_dir = tmp_path / "cache"
+    rescan(sample_vault, cache_dir)
+    for change in (edit, add, delete, rename):
+        change(sample_vault)
+        assert snapshot(rescan(sample_vault, cache_dir)) == snapshot(fresh(sample_vault, tmp_path))
+
+
+def test_unchanged_notes_are_not_parsed_again(sample_vault, tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    rescan(sample_vault, cache_dir)
+    edit(sample_vault)
+    capsys.readouterr()
+    rescan(sample_vault, cache_dir)
+    assert "Incremental scan: 1 changed, 0 deleted, 3 unchanged" in capsys.readouterr().out
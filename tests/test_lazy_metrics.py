@@ -0,0 +1,126 @@
+"""Lazily computed metrics of ObsidianAnalyzer and what invalidates them"""
+import os
+
+import pytest
+
+from obsidian_analyzer import METRIC_DEPENDENCIES, ObsidianAnalyzer
+
+STAGES = {
+    "git": "_load_git_stats",
+    "pagerank": "_calculate_pagerank",
+    "importance": "_calculate_importance_scores",
+    "orphans": "_identify_orphans",
+    "keywords": "_extract_keywords_and_classify",
+}
+
+
+@pytest.fixture
+def analyzer(sample_vault, tmp_path):
+    """Analyzer of sample_vault whose stages record (metric, note ids or None for all notes)"""
+    analyzer = ObsidianAnalyzer(str(sample_vault), cache_dir=str(tmp_path / "cache"))
+    analyzer.calls = []
+    for metric, name in STAGES.items():
+        stage = getattr(analyzer, name)
+
+        def recording(note_ids=None, metric=metric, stage=stage):
+            analyzer.calls.append((metric, None if note_ids is None else sorted(note_ids)))
+            return stage(note_ids)
+
+        setattr(analyzer, name, recording)
+    return analyzer
+
+
+def scores(analyzer):
+    return {(note_id, field): metadata[field] for note_id, metadata in analyzer.notes_metadata.items()
+            for field in ("importance_score", "pagerank", "in_degree", "out_degree")}
+
+
+def edit(sample_vault, name, text, mtime_ns):
+    path = sample_vault / name
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_stages_cover_every_metric():
+    assert set(STAGES) == set(METRIC_DEPENDENCIES)
+
+
+def test_orphans_need_no_git_stats_or_keywords(analyzer):
+    analyzer.scan_vault()
+    orphans = analyzer.get_orphaned_notes()
+    assert [note["path"] for note in orphans] == ["Archive/Old.md"]
+    assert {metric for metric, _ in analyzer.calls} == {"orphans"}
+
+
+def test_importance_computes_its_dependencies_once(analyzer):
+    analyzer.scan_vault()
+    analyzer.calls.clear()
+    analyzer.compute("importance")
+    assert [metric for metric, _ in analyzer.calls] == ["git", "pagerank", "importance"]
+    analyzer.compute("importance")
+    assert analyzer.calls[3:] == []
+
+
+def test_text_edit_leaves_pagerank_alone(analyzer, sample_vault, tmp_path):
+    analyzer.scan_vault()
+    analyzer.compute()
+    analyzer.calls.clear()
+
+    # Same links, more words and a new tag
+    path = edit(sample_vault, "Archive/Old.md", "Nothing links here, still #archive #kept\n", 2_000_000_000_000_000_000)
+    analyzer.update_notes([path])
+    analyzer.compute()
+    assert sorted(analyzer.calls) == [("git", ["Archive/Old"]), ("importance", ["Archive/Old"]),
+                                      ("keywords", ["Archive/Old"]), ("orphans", ["Archive/Old"])]
+
+    fresh = ObsidianAnalyzer(str(sample_vault), cache_dir=str(tmp_path / "fresh-cache"))
+    fresh.scan_vault()
+    fresh.compute()
+    assert scores(analyzer) == scores(fresh)
+
+
+def test_link_edit_recomputes_pagerank(analyzer, sample_vault, tmp_path):
+    analyzer.scan_vault()
+    analyzer.compute()
+    analyzer.calls.clear()
+
+    path = edit(sample_vault, "Archive/Old.md", "Now links to [[Hub]]\n", 2_000_000_000_000_000_000)
+    analyzer.update_notes([path])
+    analyzer.compute()
+    # Hub gains a link and Old stops being an orphan; PageRank and importance are global
+    assert sorted(analyzer.calls) == [("git", ["Archive/Old"]), ("importance", None),
+                                      ("keywords", ["Archive/Old"]), ("orphans", ["Archive/Old", "Hub"]),
+                                      ("pagerank", None)]
+    assert analyzer.get_orphaned_notes() == []
+
+    fresh = ObsidianAnalyzer(str(sample_vault), cache_dir=str(tmp_path / "fresh-cache"))
+    fresh.scan_vault()
+    fresh.compute()
+    # Warm-started, so PageRank only agrees within its tolerance
+    assert scores(analyzer) == pytest.approx(scores(fresh), rel=1e-4)
+
+
+def test_nothing_to_recompute(analyzer):
+    analyzer.scan_vault()
+    analyzer.compute()
+    analyzer.calls.clear()
+    analyzer.update_notes([])
+    analyzer.compute()
+    assert analyzer.calls == []
+
+
+def test_hashtag_stems_are_computed_once(sample_vault, tmp_path):
+    analyzer = ObsidianAnalyzer(str(sample_vault), cache_dir=str(tmp_path / "cache"))
+    stemmed = []
+    analyzer._stem("warmup")
+    stem = analyzer.stemmer.stem
+    analyzer.stemmer.stem = lambda word: stemmed.append(word) or stem(word)
+
+    for note_id in ("Meditating", "Meditating again"):
+        metadata = {"path": f"{note_id}.md", "absolute_path": str(sample_vault / f"{note_id}.md")}
+        analyzer._keyword_texts[note_id] = "meditating every morning"
+        _, hashtags = analyzer._classify_note(note_id, metadata)
+        # "meditating" stems like the category keywords "meditate" and "meditation"
+        assert "#meditation" in hashtags
+    assert len(stemmed) == len(set(stemmed))
@@ -0,0 +1,100 @@
+"""Wikilink resolution of link_index"""
+from link_index import LinkIndex, link_path
+
+
+def make_index(*notes):
+    index = LinkIndex()
+    for path, *aliases in notes:
+        index.add(path[:-3], path, aliases[0] if aliases else ())
+    return index
+
+
+def test_link_path_drops_anchors_and_suffix():
+    assert link_path("Folder/Note.md#Heading") == "Folder/Note"
+    assert link_path("Note^block") == "Note"
+    assert link_path("./Note\\") == "Note"
+    assert link_path("/Note") == "Note"
+    assert link_path("#Heading") == ""
+
+
+def test_exact_path_wins():
+    index = make_index(("Note.md",), ("A/Note.md",))
+    assert index.resolve("A/Note", "Other") == "A/Note"
+    assert index.resolve("a/note.md", "Other") == "A/Note"
+
+
+def test_same_folder_is_preferred():
+    index = make_index(("A/Sub/Note.md",), ("B/Note.md",), ("B/Source.md",))
+    index.add("A/Source", "A/Source.md")
+    # Sub/Note is a path relative to A, the folder of the linking note
+    assert index.resolve("Sub/Note", "A/Source") == "A/Sub/Note"
+    assert index.resolve("Note", "B/Source") == "B/Note"
+
+
+def test_fewest_folders_then_path_order():
+    index = make_index(("A/B/Note.md",), ("C/Note.md",), ("B/Note.md",))
+    assert index.resolve("Note", "Elsewhere") == "B/Note"
+    index.add("Note", "Note.md")
+    assert index.resolve("Note", "Elsewhere") == "Note"
+
+
+def test_names_win_over_aliases():
+    index = make_index(("A/Topic.md",), ("Overview.md", ["Topic"]))
+    assert index.resolve("Topic", "Elsewhere") == "A/Topic"
+    assert index.resolve("topic", "Elsewhere") == "A/Topic"
+    index.remove("A/Topic")
+    assert index.resolve("Topic", "Elsewhere") == "Overview"
+
+
+def test_unresolved_link_keeps_its_text():
+    index = make_index(("Note.md",))
+    assert index.resolve("Missing Note#Part", "Note") == "Missing Note"
+
+
+def test_anchors_resolve_to_the_note():
+    index = make_index(("A/Note.md",), ("Source.md",))
+    assert index.resolve("Note#Heading", "Source") == "A/Note"
+    assert index.resolve("Note^abc123", "Source") == "A/Note"
+    assert index.resolve("A/Note.md#Heading", "Source") == "A/Note"
+
+
+def test_links_to_the_linking_note_add_no_edge():
+    index = make_index(("A/Note1.md", ["First"]), ("Other.md",))
+    for target in ("#Self", "Note1#Self", "Note1", "A/Note1^block", "First", "first#Heading"):
+        assert index.resolve(target, "A/Note1") is None, target
+    assert index.set_links("A/Note1", ["Note1#Self", "First", "Other"]) == ["Other"]
+    assert index.resolve("First", "Other") == "A/Note1"
+
+
+def test_add_invalidates_links_through_shadowed_name():
+    index = make_index(("A/Foo.md",), ("X.md",), ("Y.md",))
+    assert index.set_links("X", ["Foo"]) == ["A/Foo"]
+    assert index.set_links("Y", ["Other"]) == ["Other"]
+    assert index.add("Foo", "Foo.md") == {"X"}
+    assert index.resolved_links("X") == ["Foo"]
+
+
+def test_alias_change_invalidates_linkers():
+    index = make_index(("Note.md",), ("X.md",))
+    assert index.set_links("X", ["Nickname"]) == ["Nickname"]
+    assert index.add("Note", "Note.md", ["Nickname"]) == {"X"}
+    assert index.resolved_links("X") == ["Note"]
+    assert index.add("Note", "Note.md", ["Nickname"]) == set()
+    assert index.add("Note", "Note.md") == {"X"}
+    assert index.resolved_links("X") == ["Nickname"]
+
+
+def test_rename_and_delete_invalidate_linkers():
+    index = make_index(("A/Foo.md",), ("X.md",))
+    index.set_links("X", ["Foo"])
+    # A rename is the old note removed and the new one added
+    assert index.remove("A/Foo") == {"X"}
+    assert index.resolved_links("X") == ["Foo"]
+    assert index.add("B/Foo", "B/Foo.md") == {"X"}
+    assert index.resolved_links("X") == ["B/Foo"]
+    assert index.remove("B/Foo") == {"X"}
+    assert index.resolved_links("X") == ["Foo"]
+
+    index.remove_links("X")
+    index.add("Foo", "Foo.md")
+    assert index.remove("Foo") == set()
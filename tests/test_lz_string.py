@@ -0,0 +1,51 @@
+"""LZ-String decompression of lz_string, against payloads from the reference compressToBase64"""
+import lz_string
+from lz_string import decompress_from_base64, iter_decompress_from_base64
+
+DRAWING = ('{"type":"excalidraw","elements":['
+           + ",".join('{"id":"e%d","type":"text","text":"Idee %d"}' % (i, i * 7 % 13) for i in range(40))
+           + "]}")
+DRAWING_BASE64 = (
+    "N4IgLgngDgpiBcIYA8DGBDANgSwCYCd0B3EAGiUxgFsYA7MAZwQG1Q8EkAGM8aORMCjA9ByYYgCSuGDAAE3AL6k2uDjACMIvh1HDyujlJmyA7CCUq1"
+    "AJi2wdQkQ8nS5miyHaIYAZlv9wDvpOIEZyABzmyh6qXgAsfvZijknOxjbunkgArAkCgQEpIS6yAJyRll4AbLkFerWGxb4ZMUhm+tp5SUGFobLqilGZ"
+    "MBHtdp11Bqly8c1qZaP+Bt3iRcbqboMtGtwLiRPBvTmzXus1S/VTfembauo2u+PJK73Vx0jqvg/1yw3GAxXveJfc6TVZyMxvDQ5YH5UG9DYAjTVG"
+    "FdC5g2QRSHqNq8MbfNG9a6I9QjXGLWEHYplLHzMl7J6/ORNG5eKw7OmPH6XfrlaLWTQo/Y9YozFlIKz3Dn4uHFU6QqyfKUgynGI5imBWIFKinCtZ"
+    "Evms6Ha1Ey4yvdVWZHGoXPYr/A3inGQPHK3Xg3lDKyk53kk0q1werZWWk++lc9GY9XedmhzkE4r6obeAXWhmXalRyWx6X+2TMxHeRXZ122tb2pNa"
+    "4s60vTQNqbxGqt+t19BEOnxWps2xmyNUFp0dHMtu51rzeb2Dks980FkOT6s9xQAXQUQA")
+
+
+def test_short_payloads():
+    assert decompress_from_base64("IZA=") == "a"
+    assert decompress_from_base64("BYUwNmD2AEDukCcwBNqgjeTXqnRKQA==") == "hello world hello world hello world"
+    assert decompress_from_base64("Q===") == ""
+    assert decompress_from_base64("") == ""
+
+
+def test_drawing_payload():
+    assert decompress_from_base64(DRAWING_BASE64) == DRAWING
+
+
+def test_wrapped_payload_and_small_refills(monkeypatch):
+    # The plugin wraps long payloads; refills of a few characters cross every boundary
+    wrapped = "\n".join(DRAWING_BASE64[start:start + 64] for start in range(0, len(DRAWING_BASE64), 64))
+    monkeypatch.setattr(lz_string, "_BLOCK_CHARS", 5)
+    assert decompress_from_base64(wrapped) == DRAWING
+
+
+def test_surrogate_pairs_are_joined():
+    # Ω, then U+1F600 as the surrogate pair JavaScript strings hold
+    assert decompress_from_base64("pXAAJLwbgAeyD2DWQ===") == "Ω \U0001f600 ok"
+
+
+def test_iteration_can_stop_early():
+    pieces = iter_decompress_from_base64(DRAWING_BASE64)
+    prefix = ""
+    while len(prefix) < 20:
+        prefix += next(pieces)
+    assert DRAWING.startswith(prefix)
+
+
+def test_corrupt_payloads():
+    assert decompress_from_base64("N4Ig!!!") is None
+    assert decompress_from_base64(DRAWING_BASE64[:40]) is None
+    assert decompress_from_base64("////") is None
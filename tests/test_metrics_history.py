@@ -0,0 +1,68 @@
+"""Delta-encoded metrics history of metrics_history"""
+from datetime import datetime
+
+import pytest
+
+from metrics_history import METRICS_DB, MetricsHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    with MetricsHistory(str(tmp_path / "metrics.db")) as history:
+        yield history
+
+
+def test_note_values_round_trip(history):
+    runs = [
+        {"A": (1.25, 1, 2, 3), "B": (0.5, 0, 1, 1)},
+        {"A": (1.25, 1, 2, 3), "B": (0.75, 2, 1, 1)},
+        {"A": (2.0, 0, 2, 4)},
+        {"A": (2.0, 0, 2, 4), "B": (0.1, 0, 0, 0)},
+    ]
+    for number, notes in enumerate(runs):
+        history.record({"total_notes": len(notes), "orphaned_count": 1},
+                       [(note_id, *values) for note_id, values in notes.items()],
+                       recorded=datetime(2026, 1, number + 1))
+
+    # Only samples where something changed are stored
+    assert [change["sample"] for change in history.note_history("A")] == [1, 3]
+    assert [change["deleted"] for change in history.note_history("B")] == [False, False, True, False]
+
+    series = {note_id: history.note_series(note_id) for note_id in ("A", "B")}
+    assert [(entry["sample"], entry["importance"], entry["in_degree"], entry["commit_count"])
+            for entry in series["A"]] == [(1, 1.25, 1, 3), (2, 1.25, 1, 3), (3, 2.0, 0, 4), (4, 2.0, 0, 4)]
+    assert [(entry["sample"], entry["importance"], entry["in_degree"]) for entry in series["B"]] == \
+        [(1, 0.5, 0), (2, 0.75, 2), (4, 0.1, 0)]
+    assert history.note_series("C") == []
+
+    vault = history.vault_history()
+    assert [sample["total_notes"] for sample in vault] == [2, 2, 1, 2]
+    assert vault[2]["orphan_rate"] == 1.0 and vault[0]["recorded"] == "2026-01-01T00:00:00"
+
+
+def test_history_survives_reopening(tmp_path):
+    path = str(tmp_path / "metrics.db")
+    with MetricsHistory(path) as history:
+        history.record({}, [("A", 1.0, 1, 1, 1)])
+    with MetricsHistory(path) as history:
+        history.record({}, [("A", 1.0, 1, 1, 1)])
+        history.record({}, [("A", 3.0, 1, 1, 1)])
+        assert [change["importance"] for change in history.note_history("A")] == [1.0, 3.0]
+
+
+def test_record_store(sample_store, tmp_path):
+    with MetricsHistory(str(tmp_path / "metrics.db")) as history:
+        history.record_store(sample_store)
+        for note_id, metadata in sample_store.iter_notes():
+            change, = history.note_history(note_id)
+            assert change["importance"] == pytest.approx(metadata["importance_score"], abs=1 / 10000)
+            assert (change["in_degree"], change["out_degree"], change["commit_count"]) == \
+                (metadata["in_degree"], metadata["out_degree"], metadata["commit_count"])
+
+
+def test_default_path_is_the_one_run_analysis_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert METRICS_DB == "vault_analysis.metrics.db"
+    with MetricsHistory() as history:
+        assert history.db_path == METRICS_DB
+    assert (tmp_path / METRICS_DB).exists()
@@ -0,0 +1,148 @@
+"""Single-pass markdown and Excalidraw scene parsing of note_parser"""
+import json
+
+import lz_string
+import note_parser
+from note_parser import (empty_linked_content, excalidraw_text, extract_excalidraw_elements, find_excalidraw_scene,
+                         parse_aliases, parse_excalidraw_content, parse_markdown_content, read_note_text)
+
+
+def parse(content):
+    metadata = {"links_out": [], "images": [], "tags": [], "linked_content": empty_linked_content()}
+    parse_markdown_content(content, metadata)
+    return metadata
+
+
+def test_wikilinks_and_embeds_share_one_path():
+    metadata = parse("See [[Note A|the alias]], [[Folder/Note B#Part]] and [[diagram.png]].\n"
+                     "![[Embedded Note]] ![[photo.jpg|300]] ![[Other|Shown]]\n")
+    assert metadata["links_out"] == ["Note A", "Folder/Note B#Part", "diagram.png", "Embedded Note",
+                                     "photo.jpg", "Other"]
+    assert metadata["linked_content"]["notes"] == [
+        {"title": "the alias", "path": "Note A"},
+        {"title": "Folder/Note B#Part", "path": "Folder/Note B#Part"},
+        {"title": "Embedded Note", "path": "Embedded Note"},
+        {"title": "Shown", "path": "Other"},
+    ]
+    assert metadata["images"] == ["Embedded Note", "photo.jpg|300", "Other|Shown"]
+
+
+def test_code_is_skipped():
+    metadata = parse("#real [[Linked]]\n```\n[[Not a link]] #not-a-tag\n```\n`[[inline]]` #tag2 #123\n")
+    assert metadata["links_out"] == ["Linked"]
+    assert metadata["tags"] == ["real", "tag2"]
+
+
+def test_markdown_links_are_categorised():
+    metadata = parse("[site](https://example.org) [doc](files/a.pdf) [sheet](data.xlsx) ![alt](img/p.png)\n")
+    linked_content = metadata["linked_content"]
+    assert linked_content["urls"] == [{"text": "site", "url": "https://example.org"}]
+    assert linked_content["pdfs"] == [{"text": "doc", "path": "files/a.pdf"}]
+    assert linked_content["files"] == [{"text": "sheet", "path": "data.xlsx"}]
+    assert metadata["images"] == ["img/p.png"]
+
+
+def test_aliases():
+    assert parse_aliases("---\naliases: [First, \"Second One\"]\n---\nText") == ["First", "Second One"]
+    assert parse_aliases("---\naliases:\n  - One\n  - 'Two'\ntags: [x]\n---\n") == ["One", "Two"]
+    assert parse_aliases("No frontmatter\naliases: [Nope]") == []
+
+
+ELEMENTS = [
+    {"id": "t1", "type": "text", "text": "Plan for\n[[Projects/Alpha]]", "originalText": "Plan for [[Projects/Alpha]]"},
+    {"id": "r1", "type": "rectangle", "link": "[[Hub|the hub]]"},
+    {"id": "r2", "type": "ellipse", "link": "https://example.org/page"},
+    {"id": "t2", "type": "text", "text": "Gelöscht [[Gone]]", "isDeleted": True},
+    {"id": "f1", "type": "frame", "name": "Überblick"},
+]
+# compressToBase64 of the reference lzstring package, for a scene holding ELEMENTS, an appState
+# and a 3.3 KB image in "files"
+COMPRESSED_SCENE = (
+    "N4IgLgngDgpiBcIYA8DGBDANgSwCYCd0B3EAGhADcZ8BnbAewDsEAmcm+gV31TkQAswYKDXgB6MQHNsYfpwBGAOlT0AtmIBeNCtlQbs6RmPr"
+    "y6uA4wC0KDDgLFLUTJ2nNyMTDFUxGYGggBtUDwEcABGMnBoPnAUMEiwONCABUxDAAIAM3p8AB1GAIDk/HoAKxhUPzEAQUwofnQAXUbInOxXLAAV"
+    "JMRUjOz8dMLisoqq2vqmloBfUmDcUPwI8khYRbHDSU9InEYAa1DCgAkFAB9ZGHS5eWaQWfnFlgTo0I8cEThyXYOBIRFxMQodCqJwwRQ5SRiKDoSR"
+    "we4gEKIMBPFYvJFJFY9EAAcQ8ADeaKhBEMAtimDBbuRsDQACIeGCJBbwMD4TgweGIkCZZZRNaITKEbyRRjAmIAHfk1HkOFQB2mjXI6CgUAAymB0I"
+    "kEKALkLEDhJIJIjoYEQAELoWWSEqcRi4ADC9EwOVCAGJMu6PXdyJlsJ5/PBgqpJBEAyBVNhvJ00QjVDCYFDGJJIpyI8HIrgNegAKoAJQAMqEM+r4"
+    "BG4wnJABueToGgwABsABZSNgAGqmgDyOaIAAYANLYyT0Vsdrt9gdDtudnv9wfDqdj2eT0czicj6fjufLjdL9eLtcL1fzleb3eHrd7o/b/fHncHk9"
+    "328369Xy8X89n0/3p+vj8P59vz9Hxfd8v2AwD/1/b8QKAgC/x/UDYKg8D4JgyCwLg6CIIQtDEPQpCMOQzCUKw1DsLI0iKJIqjiJooi6MIhiCKY/C"
+    "WLwtjcI4nCuPI6j6OY9juMo2jGNYzieOE/ixKEvjRME3iRIE8SZMU6SFKk+TJLkiTZKUtStOU9TtJUjSdNUzTdPMszTJM4yjMMgz9L0izrLsxzLJ"
+    "s+ynKs2yHOcnyvI8tyXN87zPPc1y/LC4KAoi0Kgv88KQsCyL4qihLosSmKkti5K4pS/K8sK3Lipy0rsvKrLKsy6qMtq9L6rSxrUuagqSoqmqGpao"
+    "qyqquqmruaZpiAA==")
+
+
+def drawing_note(block):
+    """An .excalidraw.md note as the plugin writes it, with the scene in the given code block"""
+    return ("---\nexcalidraw-plugin: parsed\n---\n# Text Elements\nPlan for [[Projects/Alpha]] ^t1\n\n"
+            "# Element Links\nr1: [[Hub]]\n\n%%\n# Drawing\n" + block + "\n%%\n")
+
+
+def json_scene(files):
+    scene = json.dumps({"type": "excalidraw", "version": 2, "elements": ELEMENTS,
+                        "appState": {"theme": "light"}}, ensure_ascii=False)
+    # The files blob comes after the elements and is never decoded
+    return scene[:-1] + ', "files": ' + files + "}"
+
+
+def test_json_scene_stops_after_the_elements():
+    big_files = '{"img1": {"dataURL": "data:image/png;base64,' + "iVBORw0KGgo" * 100000 + '"}}'
+    content = drawing_note("```json\n" + json_scene(big_files) + "\n```")
+    assert extract_excalidraw_elements(content, find_excalidraw_scene(content, "D.excalidraw.md")) == ELEMENTS
+
+    # A truncated blob after the elements does not matter either
+    content = drawing_note("```json\n" + json_scene('{"img1": {"dataURL": "data:ima') + "\n```")
+    assert extract_excalidraw_elements(content, find_excalidraw_scene(content, "D.excalidraw.md")) == ELEMENTS
+
+
+def test_plain_excalidraw_file():
+    content = json_scene("{}")
+    assert find_excalidraw_scene(content, "D.excalidraw") == 0
+    assert extract_excalidraw_elements(content) == ELEMENTS
+    assert extract_excalidraw_elements("no scene here") is None
+
+
+def test_compressed_scene(monkeypatch):
+    wrapped = "\n".join(COMPRESSED_SCENE[start:start + 64] for start in range(0, len(COMPRESSED_SCENE), 64))
+    content = drawing_note("```compressed-json\n" + wrapped + "\n```")
+    scene_start = find_excalidraw_scene(content, "D.excalidraw.md")
+    assert extract_excalidraw_elements(content, scene_start) == ELEMENTS
+
+    # Checked every 256 characters, decompression stops once appState shows up, before the files
+    produced = []
+
+    def counting(payload):
+        for part in lz_string.iter_decompress_from_base64(payload):
+            produced.append(part)
+            yield part
+
+    monkeypatch.setattr(note_parser, "DECOMPRESS_CHECK_INTERVAL", 256)
+    monkeypatch.setattr(note_parser, "iter_decompress_from_base64", counting)
+    assert extract_excalidraw_elements(content, scene_start) == ELEMENTS
+    assert len("".join(produced)) < len(lz_string.decompress_from_base64(COMPRESSED_SCENE)) / 2
+
+
+def test_excalidraw_text():
+    # Deleted elements and shapes without text are left out; originalText is the unwrapped label
+    assert excalidraw_text(ELEMENTS) == "Plan for [[Projects/Alpha]]\nÜberblick"
+    assert excalidraw_text([{"type": "text", "text": "wrapped\nlabel"}]) == "wrapped\nlabel"
+
+
+def test_element_links():
+    metadata = {"links_out": [], "images": [], "tags": [], "linked_content": empty_linked_content()}
+    parse_excalidraw_content(drawing_note("```json\n" + json_scene("{}") + "\n```"), metadata, "D.excalidraw.md")
+    # Links in the markdown part are not counted again; the deleted element's link is dropped
+    assert metadata["links_out"] == ["Projects/Alpha", "Hub"]
+    assert metadata["linked_content"]["urls"] == [{"text": "https://example.org/page", "url": "https://example.org/page"}]
+    assert metadata["word_count"] == len(ELEMENTS)
+
+
+def test_read_note_text_of_a_drawing(tmp_path):
+    path = tmp_path / "D.excalidraw.md"
+    path.write_text(drawing_note("```compressed-json\n" + COMPRESSED_SCENE + "\n```"), encoding="utf-8")
+    assert read_note_text(str(path)) == "Plan for [[Projects/Alpha]]\nÜberblick"
+
+
+def test_keyword_text_of_a_drawing():
+    metadata = {"links_out": [], "images": [], "tags": [], "linked_content": empty_linked_content()}
+    parse_excalidraw_content(drawing_note("```json\n" + json_scene("{}") + "\n```"), metadata, "D.excalidraw.md")
+    # The keyword and AI stages get the drawing's words, not its JSON
+    assert metadata["keyword_text"] == "Plan for [[Projects/Alpha]]\nÜberblick"
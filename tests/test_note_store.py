@@ -0,0 +1,76 @@
+"""Disk-backed mappings of note_store"""
+import os
+
+import pytest
+
+from note_store import DiskStore, new_mapping
+
+
+@pytest.fixture
+def store(tmp_path):
+    # 1 MB cache: a few of the records below fill it, so most live on disk only
+    store = DiskStore(str(tmp_path), memory_limit_mb=1)
+    yield store
+    store.close()
+
+
+def record(number):
+    return {"id": number, "text": "x" * 40000, "links": [f"Note {number}", "Hub"]}
+
+
+def test_mapping_round_trip_beyond_the_cache(store):
+    notes = store.mapping("notes")
+    expected = {}
+    for number in range(50):
+        notes[f"note-{number}"] = expected[f"note-{number}"] = record(number)
+    assert len(notes) == 50
+    assert list(notes) == list(expected)
+    assert {key: notes[key] for key in notes} == expected
+    assert "note-3" in notes and "missing" not in notes
+    with pytest.raises(KeyError):
+        notes["missing"]
+
+
+def test_in_place_changes_survive_eviction(store):
+    notes = store.mapping("notes")
+    for number in range(50):
+        notes[f"note-{number}"] = record(number)
+    notes["note-0"]["links"].append("Added")
+    # Reading the others pushes note-0 out of the cache, writing it back
+    for number in range(1, 50):
+        notes[f"note-{number}"]
+    assert notes["note-0"]["links"] == ["Note 0", "Hub", "Added"]
+
+    notes["note-1"]["links"].clear()
+    store.flush()
+    row = store.connection.execute('SELECT data FROM "notes" WHERE key = ?', ("note-1",)).fetchone()
+    assert b"Hub" not in row[0]
+
+
+def test_reassignment_keeps_position_and_delete(store):
+    notes = store.mapping("notes")
+    for key in ("a", "b", "c"):
+        notes[key] = {"key": key}
+    notes["a"] = {"key": "A"}
+    del notes["b"]
+    assert list(notes) == ["a", "c"]
+    assert notes["a"] == {"key": "A"}
+    with pytest.raises(KeyError):
+        del notes["b"]
+
+    other = store.mapping("other")
+    other["a"] = 1
+    notes.clear()
+    assert len(notes) == 0 and list(notes) == []
+    assert dict(other) == {"a": 1}
+
+
+def test_close_removes_the_file(tmp_path):
+    store = DiskStore(str(tmp_path))
+    assert os.path.exists(store.path)
+    store.close()
+    assert not os.path.exists(store.path)
+
+
+def test_new_mapping_without_store():
+    assert new_mapping(None, "notes") == {}
@@ -0,0 +1,91 @@
+"""Columnar note table of note_table, against the plain dicts it replaces"""
+from datetime import datetime
+
+import pytest
+
+from note_parser import empty_linked_content
+from note_store import DiskStore
+from note_table import FIELDS, NoteTable, decode_linked_content, encode_linked_content
+
+
+def metadata(root, number):
+    linked_content = empty_linked_content()
+    linked_content["notes"] = [{"title": f"Note {number + 1}", "path": f"Folder/Note {number + 1}"}]
+    linked_content["urls"] = [{"url": "https://example.org", "title": "Example"}]
+    return {
+        "path": f"Folder/Note {number}.md", "absolute_path": f"{root}/Folder/Note {number}.md",
+        "type": "excalidraw" if number % 3 == 0 else "markdown", "size": 2 ** 33 + number,
+        "created": datetime(2024, 1, 2, 3, 4, 5, 123456), "modified": datetime(1969, 12, 31, 23, 59, 59, 999999),
+        "links_out": [f"Folder/Note {number + 1}", "Missing"], "links_in": [], "tags": ["project", "x"],
+        "images": ["a.png"], "word_count": number * 10, "content_hash": f"{number:032x}",
+        "linked_content": linked_content if number % 2 else empty_linked_content(),
+        "git_stats": {"commit_count": number}, "commit_count": number, "ai_summary": "", "ai_hashtags": [],
+        "ai_keywords": [], "importance_score": number / 7, "in_degree": 1, "out_degree": 2,
+        "pagerank": 1 / (number + 3), "git_score": 0.5, "keywords": ["alpha"], "auto_hashtags": ["#x"],
+    }
+
+
+@pytest.fixture(params=["memory", "disk"])
+def table(request, tmp_path):
+    if request.param == "memory":
+        yield NoteTable(str(tmp_path))
+        return
+    store = DiskStore(str(tmp_path / "store"), memory_limit_mb=1)
+    yield NoteTable(str(tmp_path), store.mapping("note_objects"))
+    store.close()
+
+
+def test_round_trip_matches_dicts(table, tmp_path):
+    expected = {}
+    for number in range(200):
+        expected[f"Folder/Note {number}"] = metadata(tmp_path, number)
+        table[f"Folder/Note {number}"] = expected[f"Folder/Note {number}"]
+    assert list(table) == list(expected)
+    for note_id, note in expected.items():
+        assert table[note_id].to_dict() == note
+        assert dict(table[note_id]) == note
+    assert list(table["Folder/Note 0"]) == list(FIELDS)
+
+
+def test_deletion_and_compaction_keep_order(table, tmp_path):
+    expected = {}
+    for number in range(200):
+        expected[f"Note {number}"] = metadata(tmp_path, number)
+        table[f"Note {number}"] = expected[f"Note {number}"]
+    # Deleting more than half of the rows compacts the table and renumbers the rest
+    for number in range(0, 200, 3):
+        del table[f"Note {number}"], expected[f"Note {number}"]
+    for number in range(1, 200, 3):
+        del table[f"Note {number}"], expected[f"Note {number}"]
+    table["Note 1"] = expected["Note 1"] = metadata(tmp_path, 1)
+    assert list(table) == list(expected)
+    rows = [table.row_of(note_id) for note_id in table]
+    assert rows == sorted(rows) and rows[-1] < 100
+    assert all(table[note_id].to_dict() == note for note_id, note in expected.items())
+
+
+def test_field_writes_and_partial_assignment(table, tmp_path):
+    table["Note"] = metadata(tmp_path, 1)
+    row = table["Note"]
+    row["tags"] = ["changed"]
+    row["importance_score"] = 2.5
+    row["type"] = "missing"
+    assert table["Note"]["tags"] == ["changed"]
+    assert table["Note"]["importance_score"] == 2.5
+    assert table.type_of(row.row) == "missing"
+    with pytest.raises(KeyError):
+        row["no_such_field"] = 1
+
+    # Like dict assignment, fields that are not given go back to their defaults
+    table["Note"] = {"path": "Note.md", "type": "markdown"}
+    assert table["Note"]["tags"] == [] and table["Note"]["word_count"] == 0
+    assert table["Note"]["linked_content"] == empty_linked_content()
+    assert table["Note"]["absolute_path"] == f"{tmp_path}/Note.md"
+
+
+def test_linked_content_encoding_round_trip():
+    mixed = empty_linked_content()
+    mixed["notes"] = [{"title": "A", "path": "A"}, {"title": "B"}]
+    mixed["files"] = [{"path": "f.pdf", "size": 3}]
+    for value in (empty_linked_content(), mixed, {"custom": []}):
+        assert decode_linked_content(encode_linked_content(value)) == value
@@ -0,0 +1,49 @@
+"""Parse engine of ObsidianAnalyzer: serial, process pool and concurrent reads give the same records"""
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from obsidian_analyzer import ObsidianAnalyzer
+
+
+@pytest.fixture
+def many_notes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / "vault"
+    root.mkdir()
+    for number in range(120):
+        (root / f"Note {number}.md").write_text(f"# Note {number}\nLinks to [[Note {number + 1}]] #tag{number % 5}\n")
+    return root
+
+
+def parse_all(vault, **options):
+    analyzer = ObsidianAnalyzer(str(vault), **options)
+    files = sorted(vault.glob("*.md"))
+    jobs = [analyzer._make_parse_job(path, path.stat()) for path in files]
+    return analyzer, jobs, list(analyzer._parse_files(jobs))
+
+
+def test_pool_and_reader_match_serial_parsing(many_notes):
+    _, _, serial = parse_all(many_notes)
+    assert len(serial) == 120
+    for options in ({"workers": 2}, {"read_concurrency": 4}, {"workers": 2, "read_concurrency": 4}):
+        assert parse_all(many_notes, **options)[2] == serial, options
+
+
+def test_pool_consumes_contents_in_bounded_windows(many_notes):
+    analyzer, jobs, _ = parse_all(many_notes, workers=2)
+    consumed = []
+
+    def contents():
+        for job in jobs:
+            consumed.append(job)
+            yield None
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        records = analyzer._map_in_windows(executor, jobs, contents(), chunksize=4)
+        first = next(records)
+        # workers * 4 chunks of 4 files, not the whole vault
+        assert len(consumed) == 2 * 4 * 4
+        rest = list(records)
+    assert [record["path"] for record in [first] + rest] == [job[1] for job in jobs]
+    assert len(consumed) == len(jobs)
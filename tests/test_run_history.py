@@ -0,0 +1,64 @@
+"""Run manifest and change feed of run_history"""
+import json
+
+import pytest
+
+from analysis_store import AnalysisStore
+from obsidian_analyzer import ObsidianAnalyzer
+from run_history import diff_runs, iter_events, list_runs, record_run
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / "vault"
+    (root / "A").mkdir(parents=True)
+    (root / "X.md").write_text("See [[Foo]]\n")
+    (root / "A" / "Foo.md").write_text("Foo in a folder\n")
+    return root
+
+
+def analyze(vault, store):
+    analyzer = ObsidianAnalyzer(str(vault))
+    stats = analyzer.scan_vault()
+    store.save_analysis(analyzer, stats)
+    return record_run(store, "changes.jsonl")
+
+
+def test_shadowing_note_relinks_unchanged_note(vault):
+    with AnalysisStore("vault_analysis.db") as store:
+        first = analyze(vault, store)
+        assert store.get_lists("links_out")["X"] == ["A/Foo"]
+
+        # X.md keeps its content, but [[Foo]] now means the note closer to the root
+        (vault / "Foo.md").write_text("Foo at the root\n")
+        second = analyze(vault, store)
+        assert store.get_lists("links_out")["X"] == ["Foo"]
+
+        diff = diff_runs(store, first, second)
+        assert [note["note_id"] for note in diff["added"]] == ["Foo"]
+        assert diff["changed"] == []
+        assert diff["relinked"] == [{"note_id": "X", "path": "X.md", "links_added": ["Foo"],
+                                     "links_removed": ["A/Foo"]}]
+        assert list_runs(store)[-1]["relinked"] == 1
+
+        events = [json.loads(line) for line in open("changes.jsonl", encoding="utf-8")]
+        relinked = [event for event in events if event["event"] == "relinked"]
+        assert relinked == [{"run": second, "event": "relinked", "note_id": "X", "path": "X.md",
+                             "links_added": ["Foo"], "links_removed": ["A/Foo"]}]
+
+        # The manifest moved with the links, so an unchanged vault records nothing
+        third = analyze(vault, store)
+        assert [event["event"] for event in iter_events(store, second, third)] == ["run"]
+
+
+def test_content_change_is_reported_once(vault):
+    with AnalysisStore("vault_analysis.db") as store:
+        first = analyze(vault, store)
+        (vault / "X.md").write_text("See [[Foo]] and [[Bar]]\n")
+        second = analyze(vault, store)
+
+        diff = diff_runs(store, first, second)
+        assert diff["relinked"] == []
+        assert diff["changed"] == [{"note_id": "X", "path": "X.md", "links_added": ["Bar"],
+                                    "links_removed": []}]
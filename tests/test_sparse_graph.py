@@ -0,0 +1,65 @@
+"""CSR link graph of sparse_graph, against networkx"""
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from sparse_graph import SparseGraph
+
+
+@pytest.fixture
+def graph():
+    rng = random.Random(7)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f"n{number}" for number in range(300))
+    # Some notes link nowhere, so dangling nodes are covered
+    for number in range(0, 300, 2):
+        for target in rng.sample(range(300), rng.randint(1, 6)):
+            if target != number:
+                graph.add_edge(f"n{number}", f"n{target}")
+    return graph
+
+
+def test_degrees(graph):
+    sparse = SparseGraph.from_networkx(graph)
+    assert sparse.nodes == list(graph)
+    assert sparse.out_degree.tolist() == [graph.out_degree(node) for node in graph]
+    assert sparse.in_degree.tolist() == [graph.in_degree(node) for node in graph]
+
+
+def test_pagerank_matches_networkx(graph):
+    scores, report = SparseGraph.from_networkx(graph).pagerank()
+    expected = nx.pagerank(graph)
+    assert report["converged"] and not report["warm_start"]
+    assert np.allclose(scores, [expected[node] for node in graph], atol=1e-6)
+    assert scores.sum() == pytest.approx(1.0)
+
+
+def test_warm_start_after_an_edit(graph):
+    before = SparseGraph.from_networkx(graph)
+    scores, cold = before.pagerank(tol=1e-10)
+
+    graph.add_edge("n1", "n2")
+    graph.add_edge("new", "n3")
+    after = SparseGraph.from_networkx(graph)
+    start = after.carry_over(before.nodes, scores)
+    assert start[after.index["new"]] == pytest.approx(1 / len(after.nodes))
+
+    warm_scores, warm = after.pagerank(tol=1e-10, start=start)
+    cold_scores, cold_after = after.pagerank(tol=1e-10)
+    assert warm["warm_start"] and warm["iterations"] < cold_after["iterations"]
+    assert np.allclose(warm_scores, cold_scores, atol=1e-8)
+
+
+def test_from_edges_counts_repeated_edges_once():
+    sparse = SparseGraph.from_edges(["a", "b", "c"], [("a", "b"), ("a", "b"), ("b", "c"), ("c", "a")])
+    assert sparse.out_degree.tolist() == [1, 1, 1]
+    assert sparse.matrix.nnz == 3
+    scores, _ = sparse.pagerank()
+    assert np.allclose(scores, 1 / 3)
+
+
+def test_empty_graph():
+    scores, report = SparseGraph([], []).pagerank()
+    assert len(scores) == 0 and report["converged"]
@@ -0,0 +1,23 @@
+"""Store connections of the Streamlit dashboard"""
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_dashboard.py")
+
+
+def test_each_session_opens_its_own_store(sample_store):
+    sessions = [AppTest.from_file(DASHBOARD, default_timeout=60) for _ in range(2)]
+    for session in sessions:
+        session.run()
+        assert not session.exception
+    stores = [session.session_state["store"] for session in sessions]
+    assert stores[0] is not stores[1]
+    assert stores[0].connection is not stores[1].connection
+
+    # A rerun of a session keeps its connection
+    sessions[0].run()
+    assert sessions[0].session_state["store"] is stores[0]
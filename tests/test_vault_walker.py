@@ -0,0 +1,205 @@
+"""File discovery of vault_walker: ignore rules and fingerprinted rescans"""
+import json
+import os
+
+import pytest
+
+import vault_walker
+from vault_walker import VaultWalker
+
+
+def found(files):
+    """Vault-relative paths of the notes a walk returned"""
+    return sorted(str(path) for kind in files for path, _ in files[kind])
+
+
+def set_mtime(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def fingerprinted(sample_vault):
+    """Folder state of a first fingerprinted walk over sample_vault, with fixed folder mtimes"""
+    for folder in ("", "Projects", "Archive"):
+        set_mtime(sample_vault / folder, 1_000_000_000_000_000_000)
+    _, state, changed = VaultWalker(str(sample_vault)).walk_fingerprinted()
+    assert sorted(changed) == ["", "Archive", "Projects"]
+    return state
+
+
+def rewalk(sample_vault, state):
+    files, state, changed = VaultWalker(str(sample_vault)).walk_fingerprinted(state)
+    relative = [os.path.relpath(path, sample_vault) for path in found(files)]
+    return relative, state, sorted(changed)
+
+
+def test_unchanged_vault_reuses_every_listing(fingerprinted, sample_vault, monkeypatch):
+    state = fingerprinted
+    monkeypatch.setattr(vault_walker.os, "scandir", None)
+    relative, _, changed = rewalk(sample_vault, state)
+    assert relative == ["Archive/Old.md", "Hub.md", "Projects/Alpha.md", "Projects/Beta.md"]
+    assert changed == []
+
+
+def test_edit_in_place_changes_the_folder_and_its_parents(fingerprinted, sample_vault, monkeypatch):
+    state = fingerprinted
+    note = sample_vault / "Projects" / "Alpha.md"
+    note.write_text("Rewritten [[Hub]]\n", encoding="utf-8")
+    set_mtime(note, 2_000_000_000_000_000_000)
+    # The folder mtime did not move, so its listing is reused
+    set_mtime(sample_vault / "Projects", 1_000_000_000_000_000_000)
+    monkeypatch.setattr(vault_walker.os, "scandir", None)
+
+    files, _, changed = VaultWalker(str(sample_vault)).walk_fingerprinted(state)
+    assert sorted(changed) == ["", "Projects"]
+    stats = {path.name: file_stat for path, file_stat in files["markdown"]}
+    assert stats["Alpha.md"].st_size == len("Rewritten [[Hub]]\n")
+
+
+def test_added_and_deleted_notes(fingerprinted, sample_vault):
+    state = fingerprinted
+    (sample_vault / "Projects" / "Gamma.md").write_text("new\n", encoding="utf-8")
+    (sample_vault / "Archive" / "Old.md").unlink()
+    relative, _, changed = rewalk(sample_vault, state)
+    assert relative == ["Hub.md", "Projects/Alpha.md", "Projects/Beta.md", "Projects/Gamma.md"]
+    assert changed == ["", "Archive", "Projects"]
+
+
+def test_renamed_folder(fingerprinted, sample_vault):
+    state = fingerprinted
+    os.rename(sample_vault / "Projects", sample_vault / "Work")
+    relative, state, changed = rewalk(sample_vault, state)
+    assert relative == ["Archive/Old.md", "Hub.md", "Work/Alpha.md", "Work/Beta.md"]
+    assert changed == ["", "Work"]
+    assert "Projects" not in state["directories"]
+
+
+def test_rules_file_change_discards_the_listings(fingerprinted, sample_vault):
+    state = fingerprinted
+    (sample_vault / ".gitignore").write_text("Archive/\n", encoding="utf-8")
+    # Without the rules digest, the root listing would be reused and still hold Archive
+    set_mtime(sample_vault, 1_000_000_000_000_000_000)
+    relative, state, changed = rewalk(sample_vault, state)
+    assert relative == ["Hub.md", "Projects/Alpha.md", "Projects/Beta.md"]
+    assert changed == ["", "Projects"]
+    assert "Archive" not in state["directories"]
+
+
+def make_walker(root, gitignore="", filters=()):
+    root.mkdir(exist_ok=True)
+    if gitignore:
+        (root / ".gitignore").write_text(gitignore, encoding="utf-8")
+    if filters:
+        (root / ".obsidian").mkdir(exist_ok=True)
+        (root / ".obsidian" / "app.json").write_text(json.dumps({"userIgnoreFilters": list(filters)}),
+                                                     encoding="utf-8")
+    return VaultWalker(str(root))
+
+
+@pytest.mark.parametrize("pattern, path, is_dir, ignored", [
+    # Unanchored patterns match at any depth
+    ("*.tmp.md", "a.tmp.md", False, True),
+    ("*.tmp.md", "x/y/a.tmp.md", False, True),
+    ("*.tmp.md", "a.md", False, False),
+    ("Drafts", "x/Drafts", True, True),
+    # A leading or inner slash anchors the pattern at the vault root
+    ("/Drafts", "Drafts", True, True),
+    ("/Drafts", "x/Drafts", True, False),
+    ("docs/*.md", "docs/a.md", False, True),
+    ("docs/*.md", "x/docs/a.md", False, False),
+    ("docs/*.md", "docs/sub/a.md", False, False),
+    # ** spans any number of folders
+    ("**/build", "build", True, True),
+    ("**/build", "a/b/build", True, True),
+    ("a/**/z.md", "a/z.md", False, True),
+    ("a/**/z.md", "a/x/y/z.md", False, True),
+    ("a/**/z.md", "b/a/z.md", False, False),
+    # Trailing slash: folders only
+    ("logs/", "logs", True, True),
+    ("logs/", "a/logs", True, True),
+    ("logs/", "logs", False, False),
+    # ? and character classes, including git's [!x]
+    ("?.md", "a.md", False, True),
+    ("?.md", "ab.md", False, False),
+    ("[ab].md", "b.md", False, True),
+    ("[!a]*.md", "b.md", False, True),
+    ("[!a]*.md", "a.md", False, False),
+    # Regex characters in patterns are literal
+    ("a+b.md", "a+b.md", False, True),
+    ("a+b.md", "aab.md", False, False),
+])
+def test_gitignore_patterns(tmp_path, pattern, path, is_dir, ignored):
+    walker = make_walker(tmp_path / "vault", gitignore=pattern + "\n")
+    assert walker.is_ignored(path, is_dir=is_dir) is ignored
+
+
+@pytest.mark.parametrize("gitignore, path, ignored", [
+    # The last matching rule wins
+    ("*.md\n!Keep.md\n", "Keep.md", False),
+    ("*.md\n!Keep.md\n", "Other.md", True),
+    ("!Keep.md\n*.md\n", "Keep.md", True),
+    # Comments and blank lines are skipped
+    ("# Secret.md\n\nPublic.md\n", "Secret.md", False),
+    ("# Secret.md\n\nPublic.md\n", "Public.md", True),
+])
+def test_gitignore_rule_order(tmp_path, gitignore, path, ignored):
+    assert make_walker(tmp_path / "vault", gitignore=gitignore).is_ignored(path) is ignored
+
+
+@pytest.mark.parametrize("entry, path, is_dir, ignored", [
+    # Plain entries are path prefixes, as in Obsidian's excluded files setting
+    ("Templates/", "Templates/Daily.md", False, True),
+    ("Templates/", "Templates", True, True),
+    ("Templates/", "My Templates/Daily.md", False, False),
+    ("Temp", "Templates/Daily.md", False, True),
+    ("/Archive", "Archive/Old.md", False, True),
+    # /.../ entries are regular expressions searched anywhere in the path
+    ("/\\d{4}-\\d{2}-\\d{2}/", "Journal/2024-01-31.md", False, True),
+    ("/\\d{4}-\\d{2}-\\d{2}/", "Journal/Notes.md", False, False),
+    ("/^Inbox//", "Inbox/a.md", False, True),
+    ("/^Inbox//", "Old/Inbox/a.md", False, False),
+])
+def test_obsidian_filters(tmp_path, entry, path, is_dir, ignored):
+    walker = make_walker(tmp_path / "vault", filters=[entry])
+    assert walker.is_ignored(path, is_dir=is_dir) is ignored
+
+
+def test_invalid_filters_are_skipped(tmp_path, capsys):
+    walker = make_walker(tmp_path / "vault", filters=["/[/", "", 3, "Drafts"])
+    assert walker.obsidian_filters == ["Drafts"]
+    assert "invalid exclude filter" in capsys.readouterr().out
+
+
+NOTE_FILES = {
+    "Note.md": True,
+    "Drawing.excalidraw.md": True,
+    "Drawing.excalidraw": True,
+    "image.png": False,
+    "Folder/Sub/Deep.md": True,
+    # Dot-folders and Obsidian's own folders are never walked
+    ".obsidian/plugins/readme.md": False,
+    ".trash/Deleted.md": False,
+    ".hidden/Note.md": False,
+    "Folder/.git/Note.md": False,
+    # Ignored by the rules below, directly or through a folder
+    "Templates/Daily.md": False,
+    "Journal/2024-01-31.md": False,
+    "Journal/Notes.md": True,
+    "build/out.md": False,
+    "Folder/build/out.md": False,
+    "scratch.tmp.md": False,
+    "Keep.tmp.md": True,
+}
+
+
+def test_is_note_file_matches_walk(tmp_path):
+    root = tmp_path / "vault"
+    for path in NOTE_FILES:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("x\n", encoding="utf-8")
+    walker = make_walker(root, gitignore="build/\n*.tmp.md\n!Keep.tmp.md\n",
+                         filters=["Templates/", "/\\d{4}-\\d{2}-\\d{2}/"])
+
+    assert {path: walker.is_note_file(path) for path in NOTE_FILES} == NOTE_FILES
+    walked = {os.path.relpath(path, root).replace(os.sep, "/") for path in found(walker.walk())}
+    assert walked == {path for path, is_note in NOTE_FILES.items() if is_note}
@@ -0,0 +1,49 @@
+"""Watch mode: ObsidianAnalyzer.update_notes and the events VaultWatcher passes on"""
+import json
+
+import pytest
+
+from obsidian_analyzer import ObsidianAnalyzer
+from vault_watcher import VaultWatcher
+
+
+@pytest.fixture
+def analyzer(sample_vault):
+    analyzer = ObsidianAnalyzer(str(sample_vault))
+    analyzer.scan_vault()
+    return analyzer
+
+
+def notes(analyzer):
+    return sorted(note_id for note_id, metadata in analyzer.notes_metadata.items() if metadata["type"] != "missing")
+
+
+def test_gitignore_change_applies_to_existing_notes(analyzer, sample_vault):
+    assert "Archive/Old" in notes(analyzer)
+    (sample_vault / ".gitignore").write_text("Archive/\n")
+    analyzer.update_notes([str(sample_vault / ".gitignore")])
+    assert "Archive/Old" not in notes(analyzer)
+
+    (sample_vault / ".gitignore").unlink()
+    analyzer.update_notes([str(sample_vault / ".gitignore")])
+    assert "Archive/Old" in notes(analyzer)
+
+
+def test_excluded_files_setting_matches_a_fresh_scan(analyzer, sample_vault):
+    (sample_vault / ".obsidian").mkdir()
+    (sample_vault / ".obsidian" / "app.json").write_text(json.dumps({"userIgnoreFilters": ["Projects/"]}))
+    stats = analyzer.update_notes([str(sample_vault / ".obsidian" / "app.json")])
+
+    fresh = ObsidianAnalyzer(str(sample_vault), cache_dir=".cache-fresh")
+    assert stats == fresh.scan_vault()
+    assert notes(analyzer) == notes(fresh) == ["Archive/Old", "Hub"]
+    assert analyzer.notes_metadata["Hub"]["links_out"] == fresh.notes_metadata["Hub"]["links_out"]
+
+
+def test_watcher_passes_rule_files_on(analyzer, sample_vault):
+    watcher = VaultWatcher(analyzer, lambda stats: None)
+    assert watcher._is_relevant(str(sample_vault / ".gitignore"))
+    assert watcher._is_relevant(str(sample_vault / ".obsidian" / "app.json"))
+    assert watcher._is_relevant(str(sample_vault / "Projects" / "Alpha.md"))
+    assert not watcher._is_relevant(str(sample_vault / ".obsidian" / "workspace.json"))
+    assert not watcher._is_relevant(str(sample_vault / ".git" / "index"))
@@ -2,11 +2,16 @@
 """Quick update of dashboard data with AI classifications"""
 
 import json
+import sys
 from pathlib import Path
 
-# Load existing vault analysis
-with open("vault_analysis.json", "r") as f:
-    data = json.load(f)
+from analysis_store import AnalysisStore
+
+# Open existing vault analysis store
+if not Path("vault_analysis.db").exists():
+    print("Error: vault_analysis.db not found. Please run the analyzer first.")
+    sys.exit(1)
+store = AnalysisStore("vault_analysis.db")
 
 # Load AI classifications
 ai_classifications_file = Path("/mnt/c/Users/hess/OneDrive/Dokumente/ai_classifications.json")
@@ -15,58 +20,39 @@ with open(ai_classifications_file, "r") as f:
 
 print(f"Loaded {len(ai_classifications)} AI classifications")
 
-# Update notes metadata with AI data
+# Update the AI row and auto_hashtags of each classified note
+auto_hashtags = store.get_lists("auto_hashtags")
 updated_count = 0
-for note_id, metadata in data["notes_metadata"].items():
-    note_path = metadata.get("path", "")
-    
-    if note_path in ai_classifications:
-        ai_data = ai_classifications[note_path]
-        
-        # Get existing hashtags
-        existing_hashtags = metadata.get("auto_hashtags", [])
-        
-        # Add AI hashtags
-        ai_hashtags = ai_data.get("ai_hashtags", [])
-        combined_hashtags = list(set(existing_hashtags + ai_hashtags))
-        
-        # Update metadata
-        metadata["auto_hashtags"] = combined_hashtags
-        metadata["ai_hashtags"] = ai_hashtags
-        metadata["ai_keywords"] = ai_data.get("ai_keywords", [])
-        metadata["ai_summary"] = ai_data.get("ai_summary", "")
-        
-        updated_count += 1
+for note_path, ai_data in ai_classifications.items():
+    note_id = store.note_id_for_path(note_path)
+    if note_id is None:
+        continue
 
-print(f"Updated {updated_count} notes with AI classifications")
+    # Add AI hashtags to the existing ones
+    ai_hashtags = ai_data.get("ai_hashtags", [])
+    combined_hashtags = list(set(auto_hashtags.get(note_id, []) + ai_hashtags))
 
-# Recalculate hashtag counts
-hashtag_counts = {}
-for note_id, metadata in data["notes_metadata"].items():
-    for hashtag in metadata.get("auto_hashtags", []):
-        hashtag_counts[hashtag] = hashtag_counts.get(hashtag, 0) + 1
+    store.set_tags(note_id, "auto_hashtags", combined_hashtags)
+    store.set_ai(note_id, ai_data.get("ai_summary", ""), ai_hashtags, ai_data.get("ai_keywords", []))
+    updated_count += 1
 
-# Update hashtags data
-data["hashtags"] = [
-    {"hashtag": tag, "count": count}
-    for tag, count in sorted(hashtag_counts.items(), key=lambda x: x[1], reverse=True)
-]
+print(f"Updated {updated_count} notes with AI classifications")
 
-# Save updated data
-with open("vault_analysis.json", "w") as f:
-    json.dump(data, f, default=str, indent=2)
+# Recalculate hashtag counts and make the changes visible to the dashboard
+store.refresh_hashtags()
+store.commit()
 
 print("Dashboard data updated with AI classifications!")
 
 # Show sample
 print("\nSample updated notes:")
 sample_count = 0
-for note_id, metadata in data["notes_metadata"].items():
-    if "ai_summary" in metadata and metadata["ai_summary"]:
+for note_id, metadata in store.iter_notes():
+    if metadata.get("ai_summary"):
         print(f"\n{metadata['path']}:")
         print(f"  AI Hashtags: {', '.join(metadata.get('ai_hashtags', []))}")
         print(f"  Combined Hashtags: {', '.join(metadata.get('auto_hashtags', []))}")
         print(f"  AI Summary: {metadata['ai_summary'][:80]}...")
         sample_count += 1
         if sample_count >= 3:
-            break
\ No newline at end of file
+            break
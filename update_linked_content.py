@@ -2,22 +2,16 @@
 """
 Update existing vault analysis with comprehensive linked content data
 """
-import json
-import re
 from pathlib import Path
 
-print("Loading existing vault analysis...")
-with open('vault_analysis_with_git.json', 'r') as f:
-    data = json.load(f)
+from analysis_store import AnalysisStore
+from note_parser import parse_markdown_content
 
-vault_path = Path("/mnt/c/Users/hess/Lokal/MyVault")
-notes_metadata = data.get('notes_metadata', {})
+print("Opening vault analysis store...")
+store = AnalysisStore('vault_analysis.db')
 
-# Regex patterns for link extraction
-wikilink_pattern = re.compile(r'\[\[([^|\\]]+)(?:\|([^\\]]+))?\]\]')
-image_pattern = re.compile(r'!\[\[([^\]]+)\]\]|!\[([^\]]*)\]\(([^\)]+)\)')
-markdown_link_pattern = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
-pdf_pattern = re.compile(r'!\[\[([^]]+\.pdf)\]\]', re.IGNORECASE)
+vault_path = Path("/mnt/c/Users/hess/Lokal/MyVault")
+notes_metadata = dict(store.iter_notes())
 
 def extract_linked_content(file_path: Path, existing_links_out: list) -> dict:
     """Extract all linked content from a markdown file"""
@@ -44,52 +38,11 @@ def extract_linked_content(file_path: Path, existing_links_out: list) -> dict:
                         "path": link
                     })
         
-        # Extract images
-        images = image_pattern.findall(content)
-        for img in images:
-            img_path = img[0] or img[2]
-            if img_path:
-                linked_content["images"].append({
-                    "path": img_path,
-                    "alt": img[1] if len(img) > 1 and img[1] else ""
-                })
-        
-        # Extract standard markdown links
-        markdown_links = markdown_link_pattern.findall(content)
-        for link_text, link_url in markdown_links:
-            # Categorize the link
-            if link_url.startswith(('http://', 'https://', 'www.')):
-                linked_content["urls"].append({
-                    "text": link_text,
-                    "url": link_url
-                })
-            elif link_url.lower().endswith('.pdf'):
-                linked_content["pdfs"].append({
-                    "text": link_text,
-                    "path": link_url
-                })
-            elif any(link_url.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp']):
-                # Image link not captured by image pattern
-                if link_url not in [img["path"] for img in linked_content["images"]]:
-                    linked_content["images"].append({
-                        "path": link_url,
-                        "alt": link_text
-                    })
-            else:
-                # Other file types
-                linked_content["files"].append({
-                    "text": link_text,
-                    "path": link_url
-                })
-        
-        # Extract embedded PDFs
-        pdfs = pdf_pattern.findall(content)
-        for pdf in pdfs:
-            if pdf not in [p["path"] for p in linked_content["pdfs"]]:
-                linked_content["pdfs"].append({
-                    "text": pdf.split('/')[-1],
-                    "path": pdf
-                })
+        # Images, PDFs, URLs and other files come from the shared single-pass tokenizer
+        parsed = {"links_out": [], "tags": [], "images": []}
+        parse_markdown_content(content, parsed)
+        for key in ("images", "pdfs", "urls", "files"):
+            linked_content[key] = parsed["linked_content"][key]
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
@@ -106,6 +59,7 @@ for note_id, metadata in notes_metadata.items():
         if file_path.exists() and file_path.suffix == '.md':
             linked_content = extract_linked_content(file_path, metadata.get('links_out', []))
             metadata['linked_content'] = linked_content
+            store.patch_note(note_id, linked_content=linked_content)
             updated_count += 1
             
             if updated_count % 100 == 0:
@@ -133,10 +87,10 @@ print(f"  Total linked images: {total_linked_images}")
 print(f"  Total linked PDFs: {total_linked_pdfs}")
 print(f"  Total external URLs: {total_linked_urls}")
 
-# Save updated analysis
+# Save updated analysis; only the linked_content column of each note was rewritten
 print("\nSaving updated analysis...")
-with open('vault_analysis_with_git.json', 'w') as f:
-    json.dump(data, f, indent=2, default=str)
+store.commit()
+store.close()
 
 print("✓ Analysis updated successfully!")
 print("\nTo see the linked content in the dashboard, restart it:")
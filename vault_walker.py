@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Single-pass vault file discovery with Obsidian and git ignore rules"""
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Folders Obsidian never indexes (config, trash, VCS metadata)
+IGNORED_DIRS = {".obsidian", ".trash", ".git"}
+
+# Files whose contents decide what walk() returns
+RULE_FILES = (".obsidian/app.json", ".gitignore")
+
+
+def _gitignore_pattern_to_regex(pattern: str) -> str:
+    """Translate a single .gitignore glob into a regex for relative paths"""
+    anchored = pattern.startswith("/") or "/" in pattern.rstrip("/")
+    pattern = pattern.lstrip("/")
+
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                parts.append(pattern[i:end + 1].replace("[!", "[^"))
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+
+    body = "".join(parts)
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"^{prefix}{body}(?:/.*)?$"
+
+
+def file_kind(name: str) -> Optional[str]:
+    """Kind of note a file name stands for, None for everything else"""
+    if name.endswith(".excalidraw.md") or name.endswith(".excalidraw"):
+        return "excalidraw"
+    if name.endswith(".md"):
+        return "markdown"
+    return None
+
+
+class VaultWalker:
+    """Walks a vault once with os.scandir and sorts files by type"""
+
+    def __init__(self, vault_path: str):
+        self.vault_path = Path(vault_path)
+        self.obsidian_filters = self._load_obsidian_filters()
+        self.gitignore_rules = self._load_gitignore()
+
+    def _load_obsidian_filters(self) -> List:
+        """Load `userIgnoreFilters` (Settings > Files & Links > Excluded files)"""
+        app_file = self.vault_path / ".obsidian" / "app.json"
+        if not app_file.exists():
+            return []
+
+        try:
+            with open(app_file, 'r', encoding='utf-8') as f:
+                filters = json.load(f).get("userIgnoreFilters", []) or []
+        except Exception as e:
+            print(f"Error reading {app_file}: {e}")
+            return []
+
+        compiled = []
+        for entry in filters:
+            if not isinstance(entry, str) or not entry:
+                continue
+            # Obsidian treats /.../ entries as regular expressions, everything else as a path prefix
+            if len(entry) > 2 and entry.startswith("/") and entry.endswith("/"):
+                try:
+                    compiled.append(re.compile(entry[1:-1]))
+                except re.error:
+                    print(f"Ignoring invalid exclude filter: {entry}")
+            else:
+                compiled.append(entry.lstrip("/"))
+        return compiled
+
+    def _load_gitignore(self) -> List[Tuple[re.Pattern, bool, bool]]:
+        """Load the vault root .gitignore as (regex, negated, dir_only) rules"""
+        gitignore_file = self.vault_path / ".gitignore"
+        if not gitignore_file.exists():
+            return []
+
+        rules = []
+        try:
+            with open(gitignore_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except Exception as e:
+            print(f"Error reading {gitignore_file}: {e}")
+            return []
+
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            rules.append((re.compile(_gitignore_pattern_to_regex(line)), negated, dir_only))
+        return rules
+
+    def rules_fingerprint(self) -> str:
+        """Digest of the ignore rule files, so folder listings are not reused after the rules change"""
+        digest = hashlib.md5()
+        for name in RULE_FILES:
+            try:
+                with open(self.vault_path / name, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def is_ignored(self, relative_path: str, is_dir: bool = False) -> bool:
+        """Check a POSIX-style vault-relative path against all ignore rules"""
+        for entry in self.obsidian_filters:
+            if isinstance(entry, str):
+                if relative_path.startswith(entry) or (is_dir and entry.rstrip("/") == relative_path):
+                    return True
+            elif entry.search(relative_path):
+                return True
+
+        # Last matching .gitignore rule wins, as in git
+        ignored = False
+        for regex, negated, dir_only in self.gitignore_rules:
+            if dir_only and not is_dir:
+                # Files below an ignored directory are never reached by walk()
+                continue
+            if regex.match(relative_path):
+                ignored = not negated
+        return ignored
+
+    def is_note_file(self, relative_path: str) -> bool:
+        """Check whether walk() would return the file at a POSIX-style vault-relative path"""
+        parts = relative_path.split("/")
+        if file_kind(parts[-1]) is None:
+            return False
+        for depth, name in enumerate(parts[:-1], 1):
+            if name in IGNORED_DIRS or name.startswith("."):
+                return False
+            if self.is_ignored("/".join(parts[:depth]), is_dir=True):
+                return False
+        return not self.is_ignored(relative_path)
+
+    def _list_directory(self, dir_path: str, rel_dir: str) -> Optional[Tuple[List[os.DirEntry], List[Tuple[os.DirEntry, str]]]]:
+        """List one folder: subfolders to descend into and (entry, kind) for note files"""
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"Error listing {dir_path}: {e}")
+            return None
+
+        subdirs = []
+        notes = []
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}{name}"
+
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name in IGNORED_DIRS or name.startswith("."):
+                        continue
+                    if not self.is_ignored(rel_path, is_dir=True):
+                        subdirs.append(entry)
+                    continue
+            except OSError as e:
+                print(f"Error accessing {entry.path}: {e}")
+                continue
+
+            kind = file_kind(name)
+            if kind is not None and not self.is_ignored(rel_path):
+                notes.append((entry, kind))
+        return subdirs, notes
+
+    def walk(self, start: Optional[Path] = None,
+             known_stats: Optional[Dict] = None) -> Dict[str, List[Tuple[Path, os.stat_result]]]:
+        """Walk the vault (or one folder of it) and return markdown/excalidraw files with their stat results"""
+        # Relative path -> stat data already known to be current (e.g. from the git index)
+        known_stats = known_stats or {}
+        files = {"markdown": [], "excalidraw": []}
+        if start is None or Path(start) == self.vault_path:
+            stack = [(str(self.vault_path), "")]
+        else:
+            stack = [(str(start), Path(start).relative_to(self.vault_path).as_posix() + "/")]
+
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            listing = self._list_directory(dir_path, rel_dir)
+            if listing is None:
+                continue
+            subdirs, notes = listing
+
+            for entry in subdirs:
+                stack.append((entry.path, f"{rel_dir}{entry.name}/"))
+
+            for entry, kind in notes:
+                # DirEntry caches its stat result; on Windows it comes free with the listing
+                file_stat = known_stats.get(f"{rel_dir}{entry.name}")
+                try:
+                    if file_stat is None:
+                        file_stat = entry.stat()
+                except OSError as e:
+                    print(f"Error accessing {entry.path}: {e}")
+                    continue
+                files[kind].append((Path(entry.path), file_stat))
+
+        # Directory listing order is filesystem dependent, keep results reproducible
+        for kind in files:
+            files[kind].sort(key=lambda item: str(item[0]))
+        return files
+
+    def walk_fingerprinted(self, previous: Optional[Dict] = None, known_stats: Optional[Dict] = None
+                           ) -> Tuple[Dict[str, List[Tuple[Path, os.stat_result]]], Dict, List[str]]:
+        """
+        Walk the vault computing a Merkle fingerprint per folder from its mtime, its notes'
+        size and mtime and its subfolders' fingerprints. Folders whose mtime is unchanged reuse
+        the listing stored in `previous` instead of being listed again. Editing a note in place
+        does not bump its folder's mtime, so every folder is still visited and every note not
+        in known_stats is still stat'ed: a rescan saves the scandir calls, not one stat per note.
+        Returns (files as from walk(), folder state to pass as `previous` next time, changed folders)
+        """
+        known_stats = known_stats or {}
+        rules = self.rules_fingerprint()
+        previous_dirs = {}
+        if previous and previous.get("rules") == rules:
+            previous_dirs = previous.get("directories", {})
+
+        files = {"markdown": [], "excalidraw": []}
+        directories = {}
+        changed = []
+        self._fingerprint_directory(str(self.vault_path), "", previous_dirs, known_stats,
+                                    files, directories, changed)
+
+        for kind in files:
+            files[kind].sort(key=lambda item: str(item[0]))
+        return files, {"rules": rules, "directories": directories}, changed
+
+    def _fingerprint_directory(self, dir_path: str, rel_dir: str, previous_dirs: Dict, known_stats: Dict,
+                               files: Dict, directories: Dict, changed: List[str]) -> Optional[str]:
+        """Collect one folder's notes, recurse into its subfolders and return its fingerprint"""
+        # Folder state is keyed by POSIX path without trailing slash, "" for the vault root
+        key = rel_dir.rstrip("/")
+        try:
+            dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError as e:
+            print(f"Error accessing {dir_path}: {e}")
+            return None
+
+        cached = previous_dirs.get(key)
+        if cached is not None and cached[0] == dir_mtime_ns:
+            # Adding, removing or renaming entries bumps the folder mtime, so the listing still holds
+            subdir_names, note_names = cached[1], cached[2]
+        else:
+            listing = self._list_directory(dir_path, rel_dir)
+            if listing is None:
+                return None
+            subdir_names = sorted(entry.name for entry in listing[0])
+            note_names = sorted((entry.name, kind) for entry, kind in listing[1])
+
+        digest = hashlib.md5(str(dir_mtime_ns).encode())
+        for name, kind in note_names:
+            file_path = os.path.join(dir_path, name)
+            # In-place edits do not touch the folder mtime, so every note's own stat data counts
+            file_stat = known_stats.get(f"{rel_dir}{name}")
+            try:
+                if file_stat is None:
+                    file_stat = os.stat(file_path)
+            except OSError as e:
+                print(f"Error accessing {file_path}: {e}")
+                continue
+            digest.update(f"f\0{name}\0{file_stat.st_size}\0{file_stat.st_mtime_ns}\0".encode())
+            files[kind].append((Path(file_path), file_stat))
+
+        for name in subdir_names:
+            fingerprint = self._fingerprint_directory(os.path.join(dir_path, name), f"{rel_dir}{name}/",
+                                                      previous_dirs, known_stats, files, directories, changed)
+            if fingerprint is not None:
+                digest.update(f"d\0{name}\0{fingerprint}\0".encode())
+
+        fingerprint = digest.hexdigest()
+        directories[key] = (dir_mtime_ns, subdir_names, note_names, fingerprint)
+        if cached is None or cached[3] != fingerprint:
+            changed.append(key)
+        return fingerprint
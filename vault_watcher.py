@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Live watch mode: applies filesystem changes to an in-memory analyzer in debounced batches"""
+import os
+import time
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Set
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from vault_walker import RULE_FILES
+
+# Events that can change what a note contains or where it lives
+WATCHED_EVENTS = {"created", "modified", "deleted", "moved"}
+
+
+class VaultWatcher(FileSystemEventHandler):
+    """Collects vault events and hands each quiet batch to ObsidianAnalyzer.update_notes"""
+
+    def __init__(self, analyzer, on_update: Callable[[Dict], None], debounce: float = 2.0):
+        super().__init__()
+        self.analyzer = analyzer
+        self.vault_path = str(analyzer.vault_path)
+        self.on_update = on_update
+        self.debounce = debounce
+
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._last_event = 0.0
+        self._wakeup = threading.Event()
+
+    def on_any_event(self, event) -> None:
+        """Queue the paths of a relevant event and restart the quiet period"""
+        if event.event_type not in WATCHED_EVENTS:
+            return
+
+        paths = [event.src_path]
+        if event.event_type == "moved":
+            paths.append(event.dest_path)
+
+        relevant = [os.fsdecode(path) for path in paths if self._is_relevant(os.fsdecode(path))]
+        if not relevant:
+            return
+
+        with self._lock:
+            self._pending.update(relevant)
+            self._last_event = time.monotonic()
+        self._wakeup.set()
+
+    def _is_relevant(self, path: str) -> bool:
+        """
+        Skip hidden folders like .obsidian and .git, which change all the time, except for the
+        ignore rule files that decide which notes belong to the vault
+        """
+        relative_path = Path(os.path.relpath(path, self.vault_path))
+        if relative_path.as_posix() in RULE_FILES:
+            return True
+        return not any(part.startswith(".") for part in relative_path.parts)
+
+    def _next_batch(self) -> Set[str]:
+        """Block until events arrived and the vault has been quiet for `debounce` seconds"""
+        self._wakeup.wait()
+        while True:
+            with self._lock:
+                remaining = self._last_event + self.debounce - time.monotonic()
+                if remaining <= 0:
+                    batch = self._pending
+                    self._pending = set()
+                    self._wakeup.clear()
+                    return batch
+            time.sleep(remaining)
+
+    def run(self) -> None:
+        """Watch the vault until interrupted with Ctrl+C"""
+        observer = Observer()
+        observer.schedule(self, self.vault_path, recursive=True)
+        observer.start()
+        print(f"Watching {self.vault_path} for changes (Ctrl+C to stop)...")
+
+        try:
+            while True:
+                batch = self._next_batch()
+                if not batch:
+                    continue
+                start = time.perf_counter()
+                try:
+                    stats = self.analyzer.update_notes(sorted(batch))
+                    self.on_update(stats)
+                except Exception as e:
+                    print(f"Error applying changes: {e}")
+                    continue
+                print(f"Applied {len(batch)} changed paths in {time.perf_counter() - start:.2f}s")
+        except KeyboardInterrupt:
+            print("\nStopping watch mode")
+        finally:
+            observer.stop()
+            observer.join()